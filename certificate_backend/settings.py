@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'certificates.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -131,3 +133,166 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Blockchain issuance
+# Issuance requests return as soon as the transaction is submitted; these
+# workers wait for the receipts and mark certificates confirmed or failed.
+
+CERTIFICATE_CONFIRMATION_WORKERS = 4
+
+# How long a receipt is waited for; a transaction not mined by then stays
+# pending until `manage.py confirm_pending` checks it again
+CERTIFICATE_CONFIRMATION_TIMEOUT = 120  # seconds
+
+# 'single' sends one issueCertificate transaction per certificate; 'batch'
+# queues certificates to be anchored as Merkle roots by `manage.py anchor_batches`
+CERTIFICATE_ISSUANCE_MODE = 'single'
+
+# Rows validated, hashed and inserted together by the bulk issuance endpoint
+CERTIFICATE_BULK_CHUNK_SIZE = 500
+
+# Where the contract lives: 'rpc' talks to a node at BLOCKCHAIN_RPC_ENDPOINTS;
+# 'local' talks to an in-process emulator of a node and the contract, held in
+# memory (tests, benchmarks and development without Ganache; the contract's
+# logic is mirrored in Python, its bytecode is not run). A dotted path selects
+# a custom certificates.backends.BlockchainBackend subclass.
+BLOCKCHAIN_BACKEND = 'rpc'
+
+# The deployed CertificateVerification contract and the Truffle artifact
+# holding its ABI (relative paths are resolved from BASE_DIR). The 'rpc'
+# backend refuses to start if either is missing or invalid.
+BLOCKCHAIN_CONTRACT_ADDRESS = '0xEc2262Ed50CB05C3844E1080d88550d403e4556F'
+BLOCKCHAIN_CONTRACT_ABI_PATH = '../certificate-verification-system/build/contracts/CertificateVerification.json'
+
+# JSON-RPC endpoints, in order of preference. Requests go to the first
+# healthy one; an endpoint that errors or times out is skipped for
+# BLOCKCHAIN_RPC_FAILOVER_COOLDOWN seconds (longer if it keeps failing).
+BLOCKCHAIN_RPC_ENDPOINTS = ['http://127.0.0.1:8545']
+
+BLOCKCHAIN_RPC_TIMEOUT = 10  # seconds per request
+
+# Keep-alive connections kept open per endpoint, shared by all threads
+BLOCKCHAIN_RPC_POOL_SIZE = 20
+
+BLOCKCHAIN_RPC_FAILOVER_COOLDOWN = 30  # seconds
+
+# Accounts that sign issuance and revocation transactions, used round-robin.
+# Leave empty to use the node's first account. Each account has its own
+# nonce sequence, so adding accounts raises write throughput.
+BLOCKCHAIN_SIGNER_ACCOUNTS = []
+
+# Private keys (comma-separated in the environment) for accounts whose
+# transactions are signed here and sent with eth_sendRawTransaction. When
+# set they replace BLOCKCHAIN_SIGNER_ACCOUNTS and any node can be used, not
+# just one holding unlocked accounts.
+BLOCKCHAIN_SIGNER_KEYS = [key for key in os.environ.get('BLOCKCHAIN_SIGNER_KEYS', '').split(',') if key]
+
+# Locally signed transactions reuse the gas price for this long
+BLOCKCHAIN_GAS_PRICE_TTL = 30  # seconds
+
+# Unconfirmed transactions allowed per account before it is skipped
+BLOCKCHAIN_SIGNER_MAX_IN_FLIGHT = 16
+
+# Accounts below this balance (wei) are skipped until topped up
+BLOCKCHAIN_SIGNER_MIN_BALANCE = 10 ** 16  # 0.01 ETH
+
+BLOCKCHAIN_SIGNER_BALANCE_CHECK_INTERVAL = 60  # seconds
+
+# How long a transaction waits for a free signer before failing
+BLOCKCHAIN_SIGNER_ACQUIRE_TIMEOUT = 30  # seconds
+
+# How often the shared confirmation watcher checks for new blocks
+BLOCKCHAIN_POLL_INTERVAL = 1.0  # seconds
+
+# The blockchain client connects on first use in each process (or when
+# certificates.blockchain.warm_up() is called from a worker start-up hook);
+# after a failed attempt it waits this long before trying again.
+BLOCKCHAIN_RECONNECT_INTERVAL = 5  # seconds
+
+# 'chain' always calls the contract. 'index' answers verification from the
+# mirror kept by `manage.py index_chain` (falling back to the contract for
+# certificates whose issue event it hasn't seen), so only use it with the
+# indexer running. Either endpoint accepts strict=true to force a live
+# contract call.
+CERTIFICATE_VERIFICATION_SOURCE = 'chain'
+
+# Contract events followed by the indexer; the first bytes32 argument of
+# each is taken as the certificate hash
+BLOCKCHAIN_INDEX_EVENTS = {
+    'issued': 'CertificateIssued',
+    'revoked': 'CertificateRevoked',
+}
+
+# Block the indexer starts from on its first run
+BLOCKCHAIN_INDEX_START_BLOCK = 0
+
+# Blocks newer than this many below the head are not indexed yet. Ganache
+# mines a block per transaction, so 0 is fine locally; raise it on chains
+# that can reorganise.
+BLOCKCHAIN_INDEX_CONFIRMATIONS = 0
+
+# Revoked hashes are held in memory by each worker; this often it checks
+# whether another process revoked something and reloads the set
+CERTIFICATE_REVOCATION_REFRESH_INTERVAL = 5  # seconds
+
+# Bloom filter over stored certificate hashes. Hashes it rules out get a 404
+# from the verify endpoints without a database query or chain call. New rows
+# from other processes are picked up every REFRESH_INTERVAL seconds, and the
+# filter is rebuilt every REBUILD_INTERVAL seconds (or once it fills up).
+# While a lower id than the newest one seen hasn't committed yet the filter
+# rules nothing out; after PENDING_ID_TIMEOUT seconds the id is taken to be
+# a rolled-back insert.
+CERTIFICATE_BLOOM_FILTER = {
+    'ENABLED': True,
+    'FALSE_POSITIVE_RATE': 0.001,
+    'REFRESH_INTERVAL': 1,  # seconds
+    'REBUILD_INTERVAL': 3600,  # seconds
+    'PENDING_ID_TIMEOUT': 60,  # seconds
+}
+
+# Largest list accepted by POST /api/certificates/verify/batch/
+CERTIFICATE_VERIFY_BATCH_MAX_SIZE = 100
+
+# Certificates per page from GET /api/certificates/, unless the request asks
+# for another page_size (up to MAX_PAGE_SIZE)
+CERTIFICATE_LIST_PAGE_SIZE = 50
+CERTIFICATE_LIST_MAX_PAGE_SIZE = 500
+
+# Verification results are cached per certificate hash. Set BACKEND to a
+# CACHES alias to share the cache (and its invalidations) between workers.
+CERTIFICATE_VERIFICATION_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 300,  # seconds
+    'BACKEND': None,
+}
+
+# Client addresses (or networks) allowed to scrape /metrics; staff users
+# always may. REMOTE_ADDR is checked, so scrape the workers directly rather
+# than through a proxy. Comma-separated in the environment.
+METRICS_ALLOWED_IPS = [
+    ip for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip
+]
+
+# Logging for the certificates app. Each verify/issue request logs one
+# summary record on 'certificates.requests' at INFO with its status, total
+# duration and per-stage timings (db, hashing, rpc, serialization); set
+# CERTIFICATE_LOG_LEVEL=WARNING to turn them off, or DEBUG for per-call
+# details. Records are written as JSON lines so the extra fields survive.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'certificates.instrumentation.JsonFormatter'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+    },
+    'loggers': {
+        'certificates': {
+            'handlers': ['console'],
+            'level': os.environ.get('CERTIFICATE_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
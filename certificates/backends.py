@@ -0,0 +1,136 @@
+# certificates/backends.py
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from web3 import AsyncWeb3, Web3
+
+from .localchain import AsyncLocalChainProvider, LocalChain, LocalChainProvider
+
+
+class BlockchainBackend:
+    """Where the certificate contract lives.
+
+    ``certificates.blockchain`` issues, verifies and revokes certificates
+    and waits for receipts through ``issue()``, ``verify()``, ``revoke()``
+    and ``receipt()``. They are implemented here on the Web3 contract API,
+    using this process's connection (so signing, failover and the shared
+    confirmation watcher apply whatever the backend), and a subclass
+    need only provide ``connect()`` unless it reaches the contract some
+    other way.
+
+    ``connect()`` returns the (web3, contract) pair; it raises
+    BlockchainConnectionError or SmartContractError when the chain can't be
+    reached right now (the caller retries later), and ImproperlyConfigured
+    when it never will be. ``connect_async()`` returns the AsyncWeb3
+    equivalent for the async views without making any requests.
+    """
+
+    name = None
+
+    def connect(self):
+        raise NotImplementedError
+
+    def connect_async(self):
+        raise NotImplementedError
+
+    def _contract(self):
+        # Imported here: certificates.blockchain builds on this module
+        from .blockchain import BlockchainConnectionError, get_client
+        contract = get_client()[1]
+        if contract is None:
+            raise BlockchainConnectionError("Blockchain connection not available")
+        return contract
+
+    def issue(self, student_name, course, institution, issue_date):
+        """Submit issueCertificate and return the transaction hash"""
+        from .blockchain import send_transaction
+        return send_transaction(
+            self._contract().functions.issueCertificate(student_name, course, institution, issue_date)
+        )
+
+    def verify(self, cert_hash):
+        """The contract's verifyCertificate record for a 32-byte hash"""
+        return self._contract().functions.verifyCertificate(cert_hash).call()
+
+    def revoke(self, cert_hash):
+        """Submit revokeCertificate for a 32-byte hash and return the transaction hash"""
+        from .blockchain import send_transaction
+        return send_transaction(self._contract().functions.revokeCertificate(cert_hash))
+
+    def receipt(self, tx_hash, timeout=120):
+        """Block until a transaction is mined and return its receipt"""
+        from .blockchain import get_watcher
+        return get_watcher().wait(tx_hash, timeout=timeout)
+
+
+class RPCBackend(BlockchainBackend):
+    """A node reached over JSON-RPC, configured by the BLOCKCHAIN_RPC_* and
+    BLOCKCHAIN_CONTRACT_* settings"""
+
+    name = 'rpc'
+
+    def connect(self):
+        # Imported here: certificates.blockchain builds on this module
+        from .blockchain import get_contract, get_web3
+        web3_instance = get_web3()
+        return web3_instance, get_contract(web3_instance)
+
+    def connect_async(self):
+        from .blockchain import get_async_provider, load_contract_interface
+        web3_instance = AsyncWeb3(get_async_provider())
+        abi, address = load_contract_interface()
+        return web3_instance, web3_instance.eth.contract(address=address, abi=abi)
+
+
+class LocalChainBackend(BlockchainBackend):
+    """An in-process emulator of a node running the contract; no node, no sockets.
+
+    The contract's logic is re-implemented in Python (see LocalChain), not
+    run from its bytecode. Transactions may be signed by the emulated node
+    or locally with BLOCKCHAIN_SIGNER_KEYS, as against a real node. State
+    lives in this process's memory and starts empty, so this is for tests,
+    benchmarks and local development, not for a multi-worker server.
+    """
+
+    name = 'local'
+
+    def __init__(self):
+        self.chain = LocalChain()
+
+    def connect(self):
+        web3_instance = Web3(LocalChainProvider(self.chain))
+        contract = web3_instance.eth.contract(address=self.chain.contract_address, abi=self.chain.abi)
+        return web3_instance, contract
+
+    def connect_async(self):
+        web3_instance = AsyncWeb3(AsyncLocalChainProvider(self.chain))
+        contract = web3_instance.eth.contract(address=self.chain.contract_address, abi=self.chain.abi)
+        return web3_instance, contract
+
+
+BACKENDS = {backend.name: backend for backend in (RPCBackend, LocalChainBackend)}
+
+_backend = None  # (BLOCKCHAIN_BACKEND value, backend)
+
+def get_backend():
+    """Return the backend selected by BLOCKCHAIN_BACKEND, creating it on first use"""
+    global _backend
+    configured = getattr(settings, 'BLOCKCHAIN_BACKEND', 'rpc')
+    if _backend is None or _backend[0] != configured:
+        backend_class = BACKENDS.get(configured)
+        if backend_class is None:
+            try:
+                backend_class = import_string(configured)
+            except ImportError:
+                raise ImproperlyConfigured(
+                    f"BLOCKCHAIN_BACKEND must be one of {', '.join(BACKENDS)} or the dotted path "
+                    f"of a BlockchainBackend subclass, not {configured!r}"
+                )
+        _backend = (configured, backend_class())
+    return _backend[1]
+
+def reset_backend():
+    """Discard the backend (and with it any local chain's state)"""
+    global _backend
+    _backend = None
@@ -0,0 +1,121 @@
+# certificates/batching.py
+
+import time
+
+from django.db import transaction
+
+from . import merkle
+from .blockchain import (
+    BlockchainConnectionError, anchor_batch_root, batch_anchor_fields, verify_certificate_on_chain,
+)
+from .cache import LRUCache
+from .confirmations import schedule_batch_confirmation
+from .fields import hash_to_bytes
+from .indexer import indexed_results, use_index
+from .models import Certificate, CertificateBatch
+
+# Roots whose anchor has been seen valid on chain. Anchors are immutable once
+# mined, so a batch costs one contract call per process while it stays among
+# the most recently checked ones.
+ANCHORED_ROOTS_MAX_SIZE = 10000
+_anchored_roots = LRUCache(max_size=ANCHORED_ROOTS_MAX_SIZE, ttl=float('inf'))
+
+def queued_certificates():
+    """Certificates waiting to be included in a Merkle batch"""
+    return Certificate.objects.filter(
+        status=Certificate.STATUS_PENDING,
+        batch__isnull=True,
+        transaction_hash__isnull=True,
+    )
+
+def create_batch(max_size=1000):
+    """Group queued certificates under a new Merkle root.
+
+    Returns the new CertificateBatch, or None if nothing is queued. Each
+    certificate gets its batch and inclusion proof; the root still has to be
+    anchored with ``anchor_batch``.
+    """
+    with transaction.atomic():
+        # Concurrent runs lock disjoint sets of rows instead of batching the
+        # same certificates twice (ignored on SQLite, which locks the database)
+        certificates = list(
+            queued_certificates().select_for_update(skip_locked=True).order_by('id')[:max_size]
+        )
+        if not certificates:
+            return None
+
+        levels = merkle.build_tree([cert.cert_hash for cert in certificates])
+        batch = CertificateBatch.objects.create(
+            merkle_root='0x' + merkle.merkle_root(levels).hex(),
+            size=len(certificates),
+            anchored_at=int(time.time()),
+        )
+        for index, cert in enumerate(certificates):
+            cert.batch = batch
+            cert.merkle_proof = ['0x' + node.hex() for node in merkle.merkle_proof(levels, index)]
+        Certificate.objects.bulk_update(certificates, ['batch', 'merkle_proof'])
+    return batch
+
+def anchor_batch(batch, schedule=True):
+    """Submit the batch root to the blockchain.
+
+    With ``schedule=True`` the confirmation is tracked in the background;
+    short-lived callers such as management commands should pass False and
+    confirm the batch themselves.
+
+    If the root can't be submitted the batch is marked failed, its
+    certificates are released for the next batch and the error is raised.
+    """
+    try:
+        result = anchor_batch_root(batch.pk, batch.merkle_root, batch.anchored_at, wait=False)
+        if not result['transaction_hash']:
+            # Nothing was sent (the chain is unavailable, or test mode)
+            raise BlockchainConnectionError("Batch root was not submitted to the blockchain")
+    except Exception as e:
+        # Release the certificates so they are picked up by the next batch
+        with transaction.atomic():
+            Certificate.objects.filter(batch=batch).update(batch=None, merkle_proof=None)
+            CertificateBatch.objects.filter(pk=batch.pk).update(
+                status=Certificate.STATUS_FAILED, failure_reason=str(e)
+            )
+        raise
+
+    batch.anchor_hash = result['anchor_hash']
+    batch.transaction_hash = result['transaction_hash']
+    batch.save(update_fields=['anchor_hash', 'transaction_hash'])
+    if schedule:
+        schedule_batch_confirmation(batch.pk, result['transaction_hash'])
+    return batch
+
+def verify_batch_membership(certificate, strict=False):
+    """Check a batched certificate against its anchored Merkle root.
+
+    Returns (is_valid, error). The inclusion proof is checked locally; the
+    anchored root is looked up in the event index, or needs a single
+    contract call per batch per process. ``strict`` always calls the contract.
+    """
+    batch = certificate.batch
+    if not merkle.verify_proof(certificate.cert_hash, certificate.merkle_proof or [], batch.merkle_root):
+        return False, "Merkle proof does not match the batch root"
+
+    if _anchored_roots.get(batch.merkle_root) and not strict:
+        return True, None
+    if not batch.anchor_hash:
+        return False, "Batch root has not been anchored on blockchain yet"
+
+    anchor_hash = hash_to_bytes(batch.anchor_hash)
+    indexed = indexed_results([anchor_hash]).get(anchor_hash) if not strict and use_index() else None
+    if indexed is not None:
+        result = indexed[0]
+    else:
+        try:
+            result = verify_certificate_on_chain(batch.anchor_hash)
+        except Exception as e:
+            return False, str(e)
+
+    expected = batch_anchor_fields(batch.pk, batch.merkle_root, batch.anchored_at)
+    if not result or not result[0] or tuple(result[1:5]) != expected:
+        return False, "Batch root is not anchored on blockchain"
+
+    _anchored_roots.set(batch.merkle_root, True)
+    return True, None
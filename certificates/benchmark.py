@@ -0,0 +1,170 @@
+# certificates/benchmark.py
+
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import requests
+from web3 import Web3
+
+from .hashing import certificate_hash, certificate_hashes
+
+WORKLOADS = ('issue', 'verify', 'verify_batch', 'revoke')
+
+API_PREFIX = '/api/certificates'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(latencies, statuses, duration):
+    """Throughput and latency figures (in milliseconds) for one workload.
+
+    ``statuses`` counts responses by status code ('error' for requests that
+    got no response at all).
+    """
+    latencies = sorted(latencies)
+
+    def ms(seconds):
+        return round(seconds * 1000, 3) if seconds is not None else None
+
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if not str(status).startswith('2')),
+        'status_codes': dict(sorted(statuses.items())),
+        'duration_seconds': round(duration, 3),
+        'requests_per_second': round(len(latencies) / duration, 2) if duration else None,
+        'latency_ms': {
+            'p50': ms(percentile(latencies, 0.50)),
+            'p95': ms(percentile(latencies, 0.95)),
+            'p99': ms(percentile(latencies, 0.99)),
+            'mean': ms(sum(latencies) / len(latencies)) if latencies else None,
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(app):
+    """Serve a WSGI app from a background thread; returns (server, base URL)"""
+    server = make_server('127.0.0.1', 0, app, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+    threading.Thread(target=server.serve_forever, name='benchmark-server', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def run_workload(base_url, make_requests, concurrency):
+    """Send every (method, path, json) request from ``make_requests`` and time them.
+
+    Requests are spread over ``concurrency`` threads, each with its own
+    keep-alive session. A request counts as an error unless it gets a 2xx
+    response.
+    """
+    calls = list(make_requests)
+    sessions = threading.local()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def send(call):
+        method, path, body = call
+        session = getattr(sessions, 'session', None)
+        if session is None:
+            session = sessions.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=60)
+            outcome = str(response.status_code)
+        except requests.RequestException:
+            outcome = 'error'
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[outcome] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, calls))
+    return summarize(latencies, statuses, time.perf_counter() - start)
+
+
+def workload_requests(workload, cert_hashes, count, batch_size=50, seed=0):
+    """The requests a workload sends, generated deterministically from ``seed``.
+
+    ``cert_hashes`` are the hex hashes of the seeded certificates. Revokes
+    take distinct certificates from the end of the list, so run them after
+    the read workloads.
+    """
+    rng = random.Random(f'{seed}-{workload}')
+    if workload == 'issue':
+        return [
+            ('POST', f'{API_PREFIX}/issue/', {
+                'student_name': f'Benchmark Student {seed}-{i}',
+                'course': 'Load Testing',
+                'institution': 'Benchmark University',
+                'issue_date': str(1700000000 + i),
+            })
+            for i in range(count)
+        ]
+    if workload == 'verify':
+        return [('GET', f'{API_PREFIX}/verify/{rng.choice(cert_hashes)}/', None) for _ in range(count)]
+    if workload == 'verify_batch':
+        size = min(batch_size, len(cert_hashes))
+        return [
+            ('POST', f'{API_PREFIX}/verify/batch/', {'cert_hashes': rng.sample(cert_hashes, size)})
+            for _ in range(count)
+        ]
+    if workload == 'revoke':
+        return [('POST', f'{API_PREFIX}/revoke/{cert_hash}/', None) for cert_hash in cert_hashes[-count:]]
+    raise ValueError(f"Unknown workload: {workload}")
+
+
+def hashing_benchmark(count, seed=0):
+    """Hashes per second for ``count`` generated certificates: Web3.solidity_keccak
+    against certificate_hash one at a time and certificate_hashes in one batch"""
+    rng = random.Random(f'{seed}-hashing')
+    records = [
+        (f'Benchmark Student {rng.getrandbits(32)}', 'Load Testing', 'Benchmark University', 1700000000 + i)
+        for i in range(count)
+    ]
+    timings = {}
+
+    def timed(name, hash_records):
+        start = time.perf_counter()
+        digests = hash_records()
+        timings[name] = time.perf_counter() - start
+        return digests
+
+    reference = timed('solidity_keccak', lambda: [
+        bytes(Web3.solidity_keccak(['string', 'string', 'string', 'uint256'], list(record))) for record in records
+    ])
+    single = timed('certificate_hash', lambda: [certificate_hash(*record) for record in records])
+    batch = timed('certificate_hashes', lambda: certificate_hashes(records))
+
+    return {
+        'records': count,
+        'identical': reference == single == batch,
+        'hashes_per_second': {name: round(count / elapsed, 1) for name, elapsed in timings.items()},
+        'speedup': {
+            name: round(timings['solidity_keccak'] / timings[name], 1)
+            for name in ('certificate_hash', 'certificate_hashes')
+        },
+    }
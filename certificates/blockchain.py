@@ -1,15 +1,34 @@
 # certificates/blockchain.py
 
 import json
+import logging
 import os
 import sys
+import threading
 import time
+from eth_account import Account
+from eth_utils import get_abi_output_types
 from web3 import Web3
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files.base import ContentFile
 from django.conf import settings
 
+from .backends import get_backend
+from .fields import hash_to_bytes, hash_to_hex
+from .hashing import certificate_hash
+from .instrumentation import stage
+from .metrics import CallbackMetric, time_contract_call
+from .signers import SignerPool
+from .signing import TransactionFactory
+from .transport import AsyncFailoverHTTPProvider, FailoverHTTPProvider
+from .watcher import ConfirmationWatcher
+
+logger = logging.getLogger(__name__)
+
 # Web3 setup
 GANACHE_URL = 'http://127.0.0.1:8545'
+DEFAULT_ABI_PATH = '../certificate-verification-system/build/contracts/CertificateVerification.json'
+DEFAULT_CONTRACT_ADDRESS = '0xEc2262Ed50CB05C3844E1080d88550d403e4556F'
 
 class BlockchainConnectionError(Exception):
     """Raised when blockchain connection fails"""
@@ -19,11 +38,28 @@ class SmartContractError(Exception):
     """Raised when smart contract interaction fails"""
     pass
 
+def _provider_options():
+    return {
+        'endpoints': getattr(settings, 'BLOCKCHAIN_RPC_ENDPOINTS', None) or [GANACHE_URL],
+        'timeout': getattr(settings, 'BLOCKCHAIN_RPC_TIMEOUT', 10),
+        'pool_size': getattr(settings, 'BLOCKCHAIN_RPC_POOL_SIZE', 20),
+        'cooldown': getattr(settings, 'BLOCKCHAIN_RPC_FAILOVER_COOLDOWN', 30),
+    }
+
+def get_provider():
+    """Build the JSON-RPC provider from the BLOCKCHAIN_RPC_* settings"""
+    return FailoverHTTPProvider(**_provider_options())
+
+def get_async_provider():
+    """Build the AsyncWeb3 JSON-RPC provider from the same settings"""
+    return AsyncFailoverHTTPProvider(**_provider_options())
+
 def get_web3():
     """Get Web3 instance with error handling"""
     try:
-        print(f"Attempting to connect to Ganache at {GANACHE_URL}")
-        web3_instance = Web3(Web3.HTTPProvider(GANACHE_URL))
+        provider = get_provider()
+        logger.debug("Connecting to blockchain at %s", provider.endpoint_uri)
+        web3_instance = Web3(provider)
         
         # Test the connection
         if not web3_instance.is_connected():
@@ -31,33 +67,45 @@ def get_web3():
             
         # Get the current block number to verify chain sync
         block_number = web3_instance.eth.block_number
-        print(f"Connected to blockchain. Current block number: {block_number}")
+        logger.info("Connected to blockchain at block %s", block_number)
         
         return web3_instance
     except Exception as e:
-        print(f"Web3 connection error: {str(e)}")
         raise BlockchainConnectionError(f"Web3 initialization failed: {str(e)}")
 
-def get_contract(web3_instance):
-    """Get contract instance with error handling"""
-    try:
-        # Contract setup
-        ABI_PATH = '../certificate-verification-system/build/contracts/CertificateVerification.json'
+def load_contract_interface():
+    """Return the configured contract's (ABI, address).
+
+    A missing or unreadable ABI, or an invalid address, can't fix itself and
+    raises ImproperlyConfigured instead of leaving the client unconnected.
+    """
+    # Relative ABI paths are taken from the project root
+    ABI_PATH = os.path.join(
+        settings.BASE_DIR, getattr(settings, 'BLOCKCHAIN_CONTRACT_ABI_PATH', DEFAULT_ABI_PATH)
+    )
+    
+    if not os.path.exists(ABI_PATH):
+        raise ImproperlyConfigured(f"Contract ABI file not found at {ABI_PATH}")
         
-        if not os.path.exists(ABI_PATH):
-            raise SmartContractError(f"Contract ABI file not found at {ABI_PATH}")
-            
-        print(f"Loading contract ABI from {ABI_PATH}")
+    logger.debug("Loading contract ABI from %s", ABI_PATH)
+    try:
         with open(ABI_PATH, 'r') as abi_file:
-            artifact = json.load(abi_file)
-            
-        contract_abi = artifact["abi"]
-        CONTRACT_ADDRESS = '0xEc2262Ed50CB05C3844E1080d88550d403e4556F'  # Updated contract address
+            contract_abi = json.load(abi_file)["abi"]
+    except (OSError, ValueError, KeyError) as e:
+        raise ImproperlyConfigured(f"Could not read a contract ABI from {ABI_PATH}: {str(e)}")
         
-        if not Web3.is_address(CONTRACT_ADDRESS):
-            raise SmartContractError(f"Invalid contract address: {CONTRACT_ADDRESS}")
+    CONTRACT_ADDRESS = getattr(settings, 'BLOCKCHAIN_CONTRACT_ADDRESS', DEFAULT_CONTRACT_ADDRESS)
+    
+    if not Web3.is_address(CONTRACT_ADDRESS):
+        raise ImproperlyConfigured(f"Invalid contract address: {CONTRACT_ADDRESS}")
+    return contract_abi, CONTRACT_ADDRESS
+
+def get_contract(web3_instance):
+    """Get contract instance with error handling"""
+    try:
+        contract_abi, CONTRACT_ADDRESS = load_contract_interface()
             
-        print(f"Initializing contract at address: {CONTRACT_ADDRESS}")
+        logger.debug("Initializing contract at %s", CONTRACT_ADDRESS)
         contract = web3_instance.eth.contract(address=CONTRACT_ADDRESS, abi=contract_abi)
         
         # Test contract connection by checking if we can access the contract
@@ -65,34 +113,150 @@ def get_contract(web3_instance):
             # Create a test hash and try to access the certificates mapping
             test_hash = Web3.keccak(text="test")
             contract.functions.certificates(test_hash).call()
-            print("Contract connection test successful")
         except Exception as e:
-            print(f"Contract connection test failed: {str(e)}")
+            logger.debug("Contract connection test failed: %s", e)
             raise SmartContractError("Contract is not properly deployed or initialized")
             
         return contract
     except Exception as e:
-        if isinstance(e, SmartContractError):
+        if isinstance(e, (SmartContractError, ImproperlyConfigured)):
             raise e
         raise SmartContractError(f"Contract initialization failed: {str(e)}")
 
-# Initialize Web3 and contract
-try:
-    print("Initializing blockchain connection...")
-    web3 = get_web3()
-    contract = get_contract(web3)
-    print("Blockchain connection initialized successfully")
-except (BlockchainConnectionError, SmartContractError) as e:
-    print(f"Warning: {str(e)}")
-    web3 = None
-    contract = None
+# The Web3 client is created lazily, once per process. Nothing touches the
+# network at import time, and a worker forked from a parent that already
+# connected builds its own client (and confirmation watcher) on first use.
+_client = None  # (pid, web3, contract)
+_client_lock = threading.Lock()
+_last_connect_attempt = None
+
+def get_client():
+    """Return this process's (web3, contract) pair, connecting on first use.
+
+    The pair comes from the BLOCKCHAIN_BACKEND backend. Returns (None, None)
+    if the blockchain is unavailable; failed connection attempts are retried
+    at most every BLOCKCHAIN_RECONNECT_INTERVAL seconds. Configuration
+    errors raise ImproperlyConfigured.
+    """
+    global _client, _last_connect_attempt
+    client = _client
+    if client is not None and client[0] == os.getpid():
+        return client[1], client[2]
+
+    with _client_lock:
+        if _client is not None and _client[0] == os.getpid():
+            return _client[1], _client[2]
+
+        retry_after = getattr(settings, 'BLOCKCHAIN_RECONNECT_INTERVAL', 5)
+        now = time.monotonic()
+        if _last_connect_attempt is not None and now - _last_connect_attempt < retry_after:
+            return None, None
+        _last_connect_attempt = now
+
+        try:
+            web3_instance, contract_instance = get_backend().connect()
+        except (BlockchainConnectionError, SmartContractError) as e:
+            logger.warning("Blockchain unavailable: %s", e)
+            return None, None
+        except ImproperlyConfigured:
+            # Not worth throttling: every caller should see the real error
+            _last_connect_attempt = None
+            raise
+
+        _client = (os.getpid(), web3_instance, contract_instance)
+        _last_connect_attempt = None
+        return web3_instance, contract_instance
+
+_async_client = None  # (pid, AsyncWeb3, contract)
+
+def get_async_client():
+    """Return this process's (AsyncWeb3, contract) pair for the async views.
+
+    It is built from the BLOCKCHAIN_BACKEND backend on first use without
+    contacting the node, so an unreachable node shows up as errors from the
+    calls themselves. Configuration errors raise ImproperlyConfigured.
+    """
+    global _async_client
+    client = _async_client
+    if client is None or client[0] != os.getpid():
+        with _client_lock:
+            if _async_client is None or _async_client[0] != os.getpid():
+                _async_client = (os.getpid(), *get_backend().connect_async())
+            client = _async_client
+    return client[1], client[2]
+
+def warm_up():
+    """Connect now instead of on the first request.
+
+    Meant for server start-up hooks that run in each worker process, such as
+    gunicorn's ``post_fork``. Transactions left pending by a previous run
+    are not picked up here, as every worker would track them all; run
+    ``manage.py confirm_pending`` once instead. Returns True if the
+    blockchain is reachable.
+    """
+    global _last_connect_attempt
+    _last_connect_attempt = None
+    web3_instance, contract_instance = get_client()
+    return web3_instance is not None and contract_instance is not None
+
+def health_check():
+    """Report whether this process can reach the node and the contract"""
+    health = {
+        'pid': os.getpid(),
+        'backend': getattr(settings, 'BLOCKCHAIN_BACKEND', 'rpc'),
+        'connected': False,
+        'contract_loaded': False,
+        'block_number': None,
+    }
+    try:
+        web3_instance, contract_instance = get_client()
+    except ImproperlyConfigured as e:
+        health['error'] = str(e)
+        return health
+    health['contract_loaded'] = contract_instance is not None
+    if web3_instance is None:
+        health['error'] = "Blockchain connection not available"
+        return health
+    try:
+        health['block_number'] = web3_instance.eth.block_number
+        health['connected'] = True
+    except Exception as e:
+        health['error'] = str(e)
+    if hasattr(web3_instance.provider, 'endpoint_status'):
+        health['endpoints'] = web3_instance.provider.endpoint_status()
+    if _signer_pool is not None:
+        health['signers'] = _signer_pool.stats()
+    return health
+
+def reset_client():
+    """Drop this process's client, watcher and signer pool; the next call reconnects"""
+    global _client, _client_lock, _last_connect_attempt, _watcher, _signer_pool, _signer_pool_lock
+    global _async_client
+    _client = None
+    _async_client = None
+    _client_lock = threading.Lock()
+    _last_connect_attempt = None
+    _watcher = None
+    _signer_pool = None
+    _signer_pool_lock = threading.Lock()
+
+# Sockets and the watcher thread must not be shared with a forked child
+os.register_at_fork(after_in_child=reset_client)
+
+def __getattr__(name):
+    # Backwards compatibility for `from certificates.blockchain import web3, contract`
+    if name == 'web3':
+        return get_client()[0]
+    if name == 'contract':
+        return get_client()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def is_test_mode():
     """Check if we're running in test mode"""
     return 'test' in sys.argv
 
-def issue_certificate(student_name, course, institution, issue_date):
-    """Issue a certificate and store its hash on the blockchain"""
+def validate_certificate_data(student_name, course, institution, issue_date):
+    """Validate certificate fields and return issue_date as an integer timestamp"""
     if not all([student_name, course, institution, issue_date]):
         raise ValueError("All certificate fields are required")
 
@@ -110,52 +274,51 @@ def issue_certificate(student_name, course, institution, issue_date):
     if issue_date < 946684800:  # Jan 1, 2000
         raise ValueError("Issue date seems too old (before year 2000)")
 
-    # Generate the hash in the same way as the blockchain smart contract
-    # This matches keccak256(abi.encodePacked(student_name, course, institution, issue_date)) in Solidity
-    cert_hash = '0x' + Web3.solidity_keccak(
-        ['string', 'string', 'string', 'uint256'],
-        [student_name, course, institution, issue_date]
-    ).hex()
-    
-    print(f"Generated certificate hash: {cert_hash}")
-    
+    return issue_date
+
+def generate_certificate_hash(student_name, course, institution, issue_date):
+    """Generate the hash in the same way as the blockchain smart contract.
+
+    This matches keccak256(abi.encodePacked(student_name, course, institution, issue_date)) in Solidity.
+    Returns the raw 32-byte digest.
+    """
+    return certificate_hash(student_name, course, institution, issue_date)
+
+def issue_certificate(student_name, course, institution, issue_date, wait=True):
+    """Issue a certificate and store its hash on the blockchain.
+
+    With ``wait=False`` the transaction is only submitted; the caller gets the
+    transaction hash back straight away and is responsible for confirming it
+    later (see ``certificates.confirmations``).
+    """
+    issue_date = validate_certificate_data(student_name, course, institution, issue_date)
+    with stage('hashing'):
+        cert_hash = generate_certificate_hash(student_name, course, institution, issue_date)
+
     # If we're not in test mode and blockchain is available, store on chain
-    if not is_test_mode() and web3 and contract:
+    web3, contract = (None, None) if is_test_mode() else get_client()
+    if web3 and contract:
         try:
-            print(f"Attempting to issue certificate for {student_name}, course: {course}")
-            
-            # Get the first account to use as sender
-            account = web3.eth.accounts[0]
-            if not account:
-                raise SmartContractError("No blockchain account available")
-            
-            print(f"Using account {account} to issue certificate")
-            
             # Store certificate on blockchain with correct parameter order
-            tx_hash = contract.functions.issueCertificate(
-                student_name,  # string _studentName
-                course,        # string _course
-                institution,   # string _institution
-                issue_date    # uint256 _issueDate
-            ).transact({'from': account})
+            with stage('rpc'):
+                tx_hash = get_backend().issue(
+                    student_name,  # string _studentName
+                    course,        # string _course
+                    institution,   # string _institution
+                    issue_date    # uint256 _issueDate
+                )
             
-            print(f"Transaction sent with hash: {tx_hash.hex()}")
-            
-            # Wait for transaction to be mined
-            print("Waiting for transaction to be mined...")
-            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            if tx_receipt.status != 1:
-                raise SmartContractError(f"Transaction failed. Receipt status: {tx_receipt.status}")
-            
-            # Log successful transaction
-            print(f"Certificate issued successfully. Transaction hash: {tx_hash.hex()}")
-            print(f"Block number: {tx_receipt.blockNumber}")
-            print(f"Gas used: {tx_receipt.gasUsed}")
+            if wait:
+                # Wait for transaction to be mined
+                tx_receipt = wait_for_transaction(tx_hash)
+                logger.info(
+                    "Certificate issued in transaction %s (block %s, gas used %s)",
+                    Web3.to_hex(tx_hash), tx_receipt.blockNumber, tx_receipt.gasUsed
+                )
                 
         except Exception as e:
             error_msg = str(e)
-            print(f"Warning: Blockchain storage failed: {error_msg}")
+            logger.warning("Blockchain storage failed: %s", error_msg)
             
             if "already exists" in error_msg.lower():
                 raise SmartContractError("Certificate with this data already exists on the blockchain")
@@ -165,81 +328,302 @@ def issue_certificate(student_name, course, institution, issue_date):
                 raise SmartContractError(f"Failed to store certificate on blockchain: {error_msg}")
     
     return {
-        'cert_hash': cert_hash,
+        'cert_hash': hash_to_hex(cert_hash),
         'ipfs_hash': None,  # IPFS storage is currently disabled
-        'transaction_hash': tx_hash.hex() if 'tx_hash' in locals() else None
+        'transaction_hash': Web3.to_hex(tx_hash) if 'tx_hash' in locals() else None
     }
 
+# Merkle batch roots are committed through the regular issueCertificate call,
+# so the root ends up in contract storage without needing a new contract method.
+BATCH_ANCHOR_NAME = 'Merkle batch'
+
+def batch_anchor_fields(batch_id, merkle_root, anchored_at):
+    """Return the (student_name, course, institution, issue_date) used to anchor a batch root"""
+    return (BATCH_ANCHOR_NAME, f'batch-{batch_id}', merkle_root, anchored_at)
+
+def anchor_batch_root(batch_id, merkle_root, anchored_at, wait=True):
+    """Commit a Merkle root to the blockchain and return its anchor hash and transaction hash"""
+    result = issue_certificate(*batch_anchor_fields(batch_id, merkle_root, anchored_at), wait=wait)
+    return {
+        'anchor_hash': result['cert_hash'],
+        'transaction_hash': result['transaction_hash']
+    }
+
+_watcher = None
+
+def get_watcher():
+    """Return the process-wide confirmation watcher"""
+    global _watcher
+    web3, _ = get_client()
+    if not web3:
+        raise BlockchainConnectionError("Web3 connection not available")
+    if _watcher is None:
+        _watcher = ConfirmationWatcher(
+            web3, poll_interval=getattr(settings, 'BLOCKCHAIN_POLL_INTERVAL', 1.0)
+        )
+    return _watcher
+
+_signer_pool = None
+_signer_pool_lock = threading.Lock()
+
+def get_signer_pool():
+    """Return this process's pool of sending accounts.
+
+    Accounts from BLOCKCHAIN_SIGNER_KEYS sign transactions locally;
+    otherwise BLOCKCHAIN_SIGNER_ACCOUNTS, or the node's first account
+    (assumed to be the admin account), sign on the node.
+    """
+    global _signer_pool
+    web3, _ = get_client()
+    if not web3:
+        raise BlockchainConnectionError("Web3 connection not available")
+    with _signer_pool_lock:
+        # Two pools for the same accounts would hand out the same nonces
+        if _signer_pool is None:
+            keys = getattr(settings, 'BLOCKCHAIN_SIGNER_KEYS', None)
+            if keys:
+                # Sign locally; the node never needs to hold these accounts
+                accounts = [Account.from_key(key) for key in keys]
+            else:
+                addresses = getattr(settings, 'BLOCKCHAIN_SIGNER_ACCOUNTS', None) or web3.eth.accounts[:1]
+                accounts = [Web3.to_checksum_address(address) for address in addresses]
+            if not accounts:
+                raise SmartContractError("No blockchain account available")
+            _signer_pool = SignerPool(
+                web3,
+                accounts,
+                max_in_flight=getattr(settings, 'BLOCKCHAIN_SIGNER_MAX_IN_FLIGHT', 16),
+                min_balance=getattr(settings, 'BLOCKCHAIN_SIGNER_MIN_BALANCE', 0),
+                balance_check_interval=getattr(settings, 'BLOCKCHAIN_SIGNER_BALANCE_CHECK_INTERVAL', 60),
+                factory=TransactionFactory(
+                    web3,
+                    gas_price_ttl=getattr(settings, 'BLOCKCHAIN_GAS_PRICE_TTL', 30),
+                ),
+            )
+        return _signer_pool
+
+def send_transaction(function_call):
+    """Submit a contract call from the next available signer and return its hash.
+
+    The signer's in-flight slot is freed once the confirmation watcher sees
+    the transaction mined (or gives up on it).
+    """
+    pool = get_signer_pool()
+    with time_contract_call(getattr(function_call, 'fn_name', 'unknown'), 'transaction'):
+        signer, tx_hash = pool.send(
+            function_call, timeout=getattr(settings, 'BLOCKCHAIN_SIGNER_ACQUIRE_TIMEOUT', 30)
+        )
+    logger.info("Transaction %s sent from %s", Web3.to_hex(tx_hash), signer.address)
+    future = get_watcher().track(
+        tx_hash, timeout=getattr(settings, 'CERTIFICATE_CONFIRMATION_TIMEOUT', 120)
+    )
+    future.add_done_callback(
+        lambda f: pool.release(signer, succeeded=f.exception() is None and f.result().status == 1)
+    )
+    return tx_hash
+
+def _signer_in_flight():
+    # Read only what exists; scraping metrics never opens a connection
+    pool = _signer_pool
+    if pool is None:
+        return []
+    # Labelled by position in the configured accounts, not by address
+    return [({'signer': index}, signer['in_flight']) for index, signer in enumerate(pool.stats())]
+
+def _awaiting_receipt():
+    watcher = _watcher
+    return [({}, watcher.pending_count())] if watcher is not None else []
+
+CallbackMetric(
+    'certificate_signer_in_flight_transactions',
+    'Transactions submitted by each signer account (by its position in the settings) and not yet mined.',
+    _signer_in_flight,
+)
+CallbackMetric(
+    'certificate_transactions_awaiting_receipt',
+    'Transactions the confirmation watcher is waiting on.',
+    _awaiting_receipt,
+)
+
+def check_receipt(tx_receipt):
+    """Raise SmartContractError if a mined transaction reverted"""
+    if tx_receipt.status != 1:
+        raise SmartContractError(f"Transaction failed. Receipt status: {tx_receipt.status}")
+    return tx_receipt
+
+def wait_for_transaction(tx_hash, timeout=120):
+    """Block until a transaction is mined and return its receipt.
+
+    Waiting goes through the shared confirmation watcher, so concurrent
+    callers don't each poll the node for their own receipt.
+    Raises SmartContractError if the transaction was mined but reverted.
+    """
+    return check_receipt(get_backend().receipt(tx_hash, timeout=timeout))
+
 def verify_certificate_on_chain(cert_hash):
     """Verify a certificate on the blockchain"""
+    web3, contract = get_client()
     if not web3:
-        print("Error: Web3 connection not available")
         raise BlockchainConnectionError("Web3 connection not available")
     if not contract:
-        print("Error: Smart contract not initialized")
         raise BlockchainConnectionError("Smart contract not initialized")
         
     try:
-        print(f"Attempting to verify certificate hash: {cert_hash}")
-        
-        # Convert the hash to bytes32 format
-        if cert_hash.startswith('0x'):
-            cert_hash = cert_hash[2:]  # Remove '0x' prefix if present
-        
-        print(f"Formatted hash for verification: {cert_hash}")
-            
-        # Convert hex string to bytes32
+        # Callers normally pass the stored 32-byte digest; hex strings are
+        # still accepted for scripts and batch anchors
         try:
-            cert_hash_bytes = Web3.to_bytes(hexstr=cert_hash)
-            print(f"Converted hash to bytes: {cert_hash_bytes.hex()}")
+            cert_hash_bytes = hash_to_bytes(cert_hash)
         except Exception as e:
-            print(f"Error converting hash to bytes: {str(e)}")
             raise SmartContractError(f"Invalid certificate hash format: {str(e)}")
         
         # Call the contract with the properly formatted hash
         try:
-            print(f"Calling contract.verifyCertificate with hash: {cert_hash_bytes.hex()}")
-            result = contract.functions.verifyCertificate(cert_hash_bytes).call()
-            print(f"Blockchain verification result: {result}")
+            with stage('rpc'), time_contract_call('verifyCertificate', 'call'):
+                result = get_backend().verify(cert_hash_bytes)
+            logger.debug("verifyCertificate(0x%s) returned %s", cert_hash_bytes.hex(), result)
             return result
         except Exception as contract_error:
             error_msg = str(contract_error)
-            print(f"Contract call error: {error_msg}")
-            
-            if "revert Certificate not found" in error_msg:
-                raise SmartContractError("Certificate not found on blockchain")
-            elif "revert" in error_msg:
-                raise SmartContractError(f"Contract reverted: {error_msg}")
-            else:
-                raise SmartContractError(f"Contract call failed: {error_msg}")
+            logger.debug("verifyCertificate(0x%s) failed: %s", cert_hash_bytes.hex(), error_msg)
+            raise _contract_call_error(error_msg)
     except Exception as e:
         if isinstance(e, (BlockchainConnectionError, SmartContractError)):
             raise e
             
         error_msg = str(e)
-        print(f"Error during blockchain verification: {error_msg}")
         if "connection" in error_msg.lower():
             raise BlockchainConnectionError("Failed to connect to blockchain")
         
         raise SmartContractError(f"Blockchain verification failed: {error_msg}")
 
+def _contract_call_error(error_msg):
+    if "revert Certificate not found" in error_msg:
+        return SmartContractError("Certificate not found on blockchain")
+    if "revert" in error_msg:
+        return SmartContractError(f"Contract reverted: {error_msg}")
+    return SmartContractError(f"Contract call failed: {error_msg}")
+
+def verify_certificates_on_chain(cert_hashes):
+    """Verify several certificates with a single JSON-RPC batch request.
+
+    Each hash becomes one ``verifyCertificate`` eth_call in the batch.
+    Returns a list in the same order as ``cert_hashes`` holding either the
+    contract's result or the SmartContractError raised for that hash.
+    """
+    web3, contract = get_client()
+    if not web3 or not contract:
+        raise BlockchainConnectionError("Blockchain connection not available")
+    if not cert_hashes:
+        return []
+
+    calls = _batch_calls(contract, 'verifyCertificate', cert_hashes)
+    logger.debug("Verifying %d certificates in one batch request", len(calls))
+    try:
+        with stage('rpc'), time_contract_call('verifyCertificate', 'batch'):
+            responses = web3.provider.make_batch_request(calls)
+    except Exception as e:
+        raise BlockchainConnectionError(f"Batch verification request failed: {str(e)}")
+    return _batch_results(web3, contract, 'verifyCertificate', responses)
+
+def _batch_calls(contract, function_name, cert_hashes):
+    """One eth_call of a contract function taking a certificate hash per hash,
+    for a JSON-RPC batch"""
+    return [
+        ('eth_call', [{
+            'to': contract.address,
+            'data': contract.encode_abi(function_name, args=[hash_to_bytes(cert_hash)]),
+        }, 'latest'])
+        for cert_hash in cert_hashes
+    ]
+
+def _batch_results(web3, contract, function_name, responses):
+    """Decode the batch responses to _batch_calls, in order"""
+    output_types = get_abi_output_types(contract.get_function_by_name(function_name).abi)
+    if not isinstance(responses, list):
+        # The node rejected the whole batch
+        raise SmartContractError(f"Batch {function_name} call failed: {responses.get('error')}")
+
+    results = []
+    for response in responses:
+        if response.get('error'):
+            results.append(_contract_call_error(str(response['error'].get('message', response['error']))))
+            continue
+        try:
+            results.append(list(web3.codec.decode(output_types, Web3.to_bytes(hexstr=response['result']))))
+        except Exception as e:
+            results.append(SmartContractError(f"Could not decode contract result: {str(e)}"))
+    return results
+
+def read_certificates_on_chain(cert_hashes):
+    """Read the contract's stored record for several hashes in one JSON-RPC batch.
+
+    Returns a list in the same order as ``cert_hashes`` holding either
+    [student_name, course, institution, issue_date, is_valid] from the
+    ``certificates`` getter or the SmartContractError for that hash. Unlike
+    verifyCertificate the getter doesn't revert for unknown hashes; they come
+    back with an issue_date of 0.
+    """
+    web3, contract = get_client()
+    if not web3 or not contract:
+        raise BlockchainConnectionError("Blockchain connection not available")
+    if not cert_hashes:
+        return []
+
+    calls = _batch_calls(contract, 'certificates', cert_hashes)
+    logger.debug("Reading %d certificates in one batch request", len(calls))
+    try:
+        with time_contract_call('certificates', 'batch'):
+            responses = web3.provider.make_batch_request(calls)
+    except Exception as e:
+        raise BlockchainConnectionError(f"Batch certificate read failed: {str(e)}")
+    return _batch_results(web3, contract, 'certificates', responses)
+
+async def verify_certificate_on_chain_async(cert_hash):
+    """verify_certificate_on_chain for the async views, over AsyncWeb3"""
+    web3, contract = get_async_client()
+    try:
+        cert_hash_bytes = hash_to_bytes(cert_hash)
+    except Exception as e:
+        raise SmartContractError(f"Invalid certificate hash format: {str(e)}")
+
+    try:
+        with stage('rpc'), time_contract_call('verifyCertificate', 'call'):
+            result = await contract.functions.verifyCertificate(cert_hash_bytes).call()
+    except (OSError, TimeoutError) as e:
+        raise BlockchainConnectionError(f"Failed to connect to blockchain: {str(e)}")
+    except Exception as e:
+        logger.debug("verifyCertificate(0x%s) failed: %s", cert_hash_bytes.hex(), e)
+        raise _contract_call_error(str(e))
+    logger.debug("verifyCertificate(0x%s) returned %s", cert_hash_bytes.hex(), result)
+    return result
+
+async def verify_certificates_on_chain_async(cert_hashes):
+    """verify_certificates_on_chain for the async views: one batch over AsyncWeb3"""
+    web3, contract = get_async_client()
+    if not cert_hashes:
+        return []
+
+    calls = _batch_calls(contract, 'verifyCertificate', cert_hashes)
+    logger.debug("Verifying %d certificates in one batch request", len(calls))
+    try:
+        with stage('rpc'), time_contract_call('verifyCertificate', 'batch'):
+            responses = await web3.provider.make_batch_request(calls)
+    except Exception as e:
+        raise BlockchainConnectionError(f"Batch verification request failed: {str(e)}")
+    return _batch_results(web3, contract, 'verifyCertificate', responses)
+
 def revoke_certificate(cert_hash):
     """Revoke a certificate on the blockchain"""
+    web3, contract = get_client()
     if not web3 or not contract:
         raise BlockchainConnectionError("Blockchain connection not available")
         
     try:
-        # Get the first account to use as sender (assuming it's an admin account)
-        account = web3.eth.accounts[0]
-        
         # Call the smart contract's revokeCertificate function
-        tx_hash = contract.functions.revokeCertificate(cert_hash).transact({'from': account})
+        tx_hash = get_backend().revoke(hash_to_bytes(cert_hash))
         
         # Wait for transaction to be mined
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
-        
-        if tx_receipt.status != 1:
-            raise SmartContractError("Revocation transaction failed")
+        wait_for_transaction(tx_hash)
             
         return True
     except Exception as e:
@@ -0,0 +1,281 @@
+# certificates/bloom.py
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Q
+
+from .fields import hash_to_bytes
+from .models import FUZZY_MATCH_PREFIX_BYTES, Certificate, SyncCheckpoint
+
+# Only this many of the most recent ids are watched for rows committing out
+# of order; a gap further down is a deleted or rolled-back row
+MAX_PENDING_IDS = 500
+
+# SyncCheckpoint row counting bulk hash rewrites; its value is the filter's version stamp
+VERSION_NAME = 'certificate-hashes'
+
+
+def record_hash_change():
+    """Bump the version stamp after rewriting existing hashes without save().
+
+    Bulk updates send no post_save and keep their ids, so other processes
+    would never see the new hashes; a changed stamp makes each of them
+    rebuild its filter on its next refresh. Call it in the transaction that
+    rewrote the rows.
+    """
+    with transaction.atomic():
+        _, created = SyncCheckpoint.objects.get_or_create(name=VERSION_NAME, defaults={'block_number': 1})
+        if not created:
+            SyncCheckpoint.objects.filter(name=VERSION_NAME).update(block_number=F('block_number') + 1)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over byte strings.
+
+    Sized for ``capacity`` items at ``error_rate`` false positives; bit
+    positions come from one blake2b digest split into two 64-bit halves
+    (Kirsch-Mitzenmacher double hashing).
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class HashShield:
+    """Answers "might this certificate exist?" without querying the database.
+
+    Holds a Bloom filter over every stored cert_hash and over its first
+    FUZZY_MATCH_PREFIX_BYTES bytes, so both the exact lookup and the prefix
+    fallback of the verify endpoint can be skipped for hashes that are
+    definitely unknown. Rows saved in this process are added immediately;
+    rows inserted by other processes are picked up every
+    ``refresh_interval`` seconds with one query for ids above the last one
+    seen. The filter is rebuilt from scratch every ``rebuild_interval``
+    seconds, sooner once it fills past its capacity, and on the next
+    refresh after hashes were rewritten in bulk (``record_hash_change``).
+
+    Ids are handed out before a row commits, so on PostgreSQL or MySQL a
+    lower id can become visible after a higher one. Ids missing below the
+    last one seen are re-read on every refresh until they turn up or
+    ``pending_timeout`` seconds pass (the insert was rolled back), and while
+    any are outstanding the filter isn't known to be current: it rules
+    nothing out and the lookup falls through to the database.
+    """
+
+    def __init__(self, error_rate=0.001, refresh_interval=1, rebuild_interval=3600, pending_timeout=60):
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.pending_timeout = pending_timeout
+        self._lock = threading.Lock()
+        self._filter = None
+        self._high_water = 0
+        self._pending = {}  # missing id -> when it was first missed
+        self._built_at = None
+        self._refreshed_at = None
+        self.version = 0
+        self.checks = 0
+        self.rejections = 0
+        self.false_positives = 0
+
+    @staticmethod
+    def _keys(cert_hash):
+        return cert_hash, cert_hash[:FUZZY_MATCH_PREFIX_BYTES]
+
+    def _update_pending(self, seen, low, high):
+        """Track the ids between ``low`` and ``high`` that weren't ``seen``;
+        called with the lock held"""
+        now = time.monotonic()
+        pending = {
+            pk: missed_at for pk, missed_at in self._pending.items()
+            if pk not in seen and now - missed_at < self.pending_timeout
+        }
+        for pk in range(max(low, high - MAX_PENDING_IDS) + 1, high):
+            if pk not in seen:
+                pending.setdefault(pk, now)
+        self._pending = pending
+
+    @staticmethod
+    def _stored_version():
+        return SyncCheckpoint.objects.filter(name=VERSION_NAME).values_list('block_number', flat=True).first() or 0
+
+    def rebuild(self):
+        """Build a new filter from every certificate in the database"""
+        # Read the stamp first, so every rewrite it counts is in the rows read after it
+        version = self._stored_version()
+        capacity = 2 * max(Certificate.objects.count(), 1000)
+        bloom = BloomFilter(capacity * 2, self.error_rate)  # two keys per certificate
+        top = Certificate.objects.aggregate(top=Max('id'))['top'] or 0
+        watched = max(self._high_water, top - MAX_PENDING_IDS)
+        high_water, low, seen = 0, None, set()
+        for pk, cert_hash in Certificate.objects.values_list('id', 'cert_hash').iterator(chunk_size=10000):
+            for key in self._keys(bytes(cert_hash)):
+                bloom.add(key)
+            high_water = max(high_water, pk)
+            if pk > watched or pk in self._pending:
+                seen.add(pk)
+            if pk > watched and low is None:
+                low = pk
+        if self._filter is None and low is not None:
+            # On a first build nothing below the first id seen counts as missing
+            watched = low
+        with self._lock:
+            self._update_pending(seen, watched, high_water)
+            # Readers check _filter without the lock, so it is assigned last
+            self._high_water = high_water
+            self.version = version
+            self._built_at = self._refreshed_at = time.monotonic()
+            self._filter = bloom
+
+    def refresh_due(self):
+        """Whether the next check queries the database before answering"""
+        bloom = self._filter
+        if bloom is None:
+            return True
+        now = time.monotonic()
+        return (now - self._built_at >= self.rebuild_interval or bloom.count >= bloom.capacity
+                or now - self._refreshed_at >= self.refresh_interval)
+
+    def _refresh(self):
+        now = time.monotonic()
+        if (self._filter is None or now - self._built_at >= self.rebuild_interval
+                or self._filter.count >= self._filter.capacity):
+            self.rebuild()
+            return
+        if now - self._refreshed_at < self.refresh_interval:
+            return
+        self._refreshed_at = now
+        if self._stored_version() != self.version:
+            self.rebuild()
+            return
+        with self._lock:
+            high_water, pending = self._high_water, list(self._pending)
+        rows = list(Certificate.objects.filter(
+            Q(id__gt=high_water) | Q(id__in=pending)
+        ).values_list('id', 'cert_hash'))
+        with self._lock:
+            for pk, cert_hash in rows:
+                for key in self._keys(bytes(cert_hash)):
+                    self._filter.add(key)
+            seen = {pk for pk, _ in rows}
+            self._update_pending(seen, high_water, max(seen, default=high_water))
+            self._high_water = max(self._high_water, max(seen, default=0))
+
+    def add(self, cert_hash):
+        """Record a certificate stored by this process"""
+        if self._filter is None:
+            return  # picked up by the first build
+        with self._lock:
+            for key in self._keys(hash_to_bytes(cert_hash)):
+                self._filter.add(key)
+
+    def _check(self, *keys):
+        """Whether each key might be present; one check for the stats,
+        rejected only if none of the keys might be"""
+        self._refresh()
+        pending = bool(self._pending)
+        found = [pending or key in self._filter for key in keys]
+        with self._lock:
+            self.checks += 1
+            if not any(found):
+                self.rejections += 1
+        return found
+
+    def might_exist(self, cert_hash):
+        """False only if no certificate has exactly this hash"""
+        return self._check(hash_to_bytes(cert_hash))[0]
+
+    def might_match_prefix(self, cert_hash):
+        """False only if no certificate shares this hash's fuzzy-match prefix"""
+        return self._check(hash_to_bytes(cert_hash)[:FUZZY_MATCH_PREFIX_BYTES])[0]
+
+    def lookup(self, cert_hash):
+        """(might_exist, might_match_prefix) for one verification, counted as a single check"""
+        return tuple(self._check(*self._keys(hash_to_bytes(cert_hash))))
+
+    def record_false_positive(self):
+        with self._lock:
+            self.false_positives += 1
+
+    def stats(self):
+        with self._lock:
+            bloom = self._filter
+            return {
+                'checks': self.checks,
+                'rejections': self.rejections,
+                'rejection_rate': self.rejections / self.checks if self.checks else None,
+                'false_positives': self.false_positives,
+                'pending_ids': len(self._pending),
+                'entries': bloom.count if bloom else 0,
+                'capacity': bloom.capacity if bloom else None,
+                'size_bytes': len(bloom.bits) if bloom else 0,
+                'hash_count': bloom.hash_count if bloom else None,
+                'target_error_rate': self.error_rate,
+            }
+
+
+class _DisabledShield:
+    """Stand-in used when the filter is turned off: everything might exist"""
+
+    def might_exist(self, cert_hash):
+        return True
+
+    def might_match_prefix(self, cert_hash):
+        return True
+
+    def lookup(self, cert_hash):
+        return True, True
+
+    def add(self, cert_hash):
+        pass
+
+    def refresh_due(self):
+        return False
+
+    def record_false_positive(self):
+        pass
+
+    def stats(self):
+        return {'enabled': False}
+
+
+_shield = None
+
+def get_hash_shield():
+    """Return the process-wide hash shield configured in settings"""
+    global _shield
+    if _shield is None:
+        config = getattr(settings, 'CERTIFICATE_BLOOM_FILTER', {})
+        if not config.get('ENABLED', True):
+            _shield = _DisabledShield()
+        else:
+            _shield = HashShield(
+                error_rate=config.get('FALSE_POSITIVE_RATE', 0.001),
+                refresh_interval=config.get('REFRESH_INTERVAL', 1),
+                rebuild_interval=config.get('REBUILD_INTERVAL', 3600),
+                pending_timeout=config.get('PENDING_ID_TIMEOUT', 60),
+            )
+    return _shield
@@ -0,0 +1,151 @@
+# certificates/bulk.py
+
+import csv
+import json
+from datetime import datetime, timezone
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .blockchain import issue_certificate, validate_certificate_data
+from .bloom import get_hash_shield
+from .confirmations import schedule_confirmation
+from .fields import hash_to_hex
+from .hashing import certificate_hashes
+from .models import Certificate
+
+REQUIRED_FIELDS = ['student_name', 'course', 'institution', 'issue_date']
+
+def _decode_lines(lines):
+    for line in lines:
+        yield line.decode('utf-8') if isinstance(line, bytes) else line
+
+def parse_csv_rows(lines):
+    """Yield one dict per CSV record; the first line is the header"""
+    yield from csv.DictReader(_decode_lines(lines))
+
+def parse_ndjson_rows(lines):
+    """Yield one dict per non-empty line; malformed lines yield the error instead"""
+    for line in _decode_lines(lines):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {str(e)}")
+            continue
+        if not isinstance(row, dict):
+            yield ValueError("Each line must be a JSON object")
+            continue
+        yield row
+
+def _prepare_row(row):
+    """Validate a row with the single-issuance rules; returns the fields the contract hashes"""
+    if isinstance(row, Exception):
+        raise row
+    for field in REQUIRED_FIELDS:
+        if not row.get(field):
+            raise ValueError(f"Missing required field: {field}")
+    # JSON rows can carry any type; the chunk is hashed in one call, which
+    # only takes strings
+    for field in ('student_name', 'course', 'institution'):
+        if not isinstance(row[field], str):
+            raise ValueError(f"{field} must be a string")
+    try:
+        timestamp = int(row['issue_date'])
+    except (ValueError, TypeError):
+        raise ValueError("issue_date must be a valid integer timestamp")
+
+    timestamp = validate_certificate_data(row['student_name'], row['course'], row['institution'], timestamp)
+    return row['student_name'], row['course'], row['institution'], timestamp
+
+def issue_rows(rows, chunk_size=500):
+    """Validate, hash and store rows in chunks, yielding one result per row.
+
+    Only one chunk is held in memory at a time. Certificates are issued the
+    way CERTIFICATE_ISSUANCE_MODE says: in 'batch' mode they are stored and
+    queued for Merkle batch anchoring (see ``manage.py anchor_batches``); in
+    'single' mode each one's issueCertificate transaction is submitted before
+    it is stored, and confirmed in the background.
+    """
+    batch_mode = getattr(settings, 'CERTIFICATE_ISSUANCE_MODE', 'single') == 'batch'
+    rows = enumerate(rows, start=1)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from _issue_chunk(chunk, batch_mode)
+
+def _issue_chunk(chunk, batch_mode):
+    results = {}
+    valid = []
+    for row_number, row in chunk:
+        try:
+            valid.append((row_number, _prepare_row(row)))
+        except Exception as e:
+            results[row_number] = {'row': row_number, 'error': str(e)}
+
+    # The whole chunk is hashed in one call
+    prepared = {}
+    for (row_number, fields), cert_hash in zip(valid, certificate_hashes([fields for _, fields in valid])):
+        if cert_hash in prepared:
+            results[row_number] = {'row': row_number, 'cert_hash': hash_to_hex(cert_hash),
+                                   'error': 'Duplicate certificate in upload'}
+            continue
+        student_name, course, institution, timestamp = fields
+        prepared[cert_hash] = (row_number, Certificate(
+            student_name=student_name,
+            course=course,
+            institution=institution,
+            issue_date=datetime.fromtimestamp(timestamp, tz=timezone.utc),
+            cert_hash=cert_hash,
+            status=Certificate.STATUS_PENDING,
+        ))
+
+    existing = set(
+        Certificate.objects.filter(cert_hash__in=list(prepared)).values_list('cert_hash', flat=True)
+    )
+    new = {cert_hash: entry for cert_hash, entry in prepared.items() if cert_hash not in existing}
+    if not batch_mode:
+        for cert_hash, (row_number, cert) in list(new.items()):
+            try:
+                cert.transaction_hash = _submit(cert)
+            except Exception as e:
+                results[row_number] = {'row': row_number, 'cert_hash': hash_to_hex(cert_hash), 'error': str(e)}
+                del new[cert_hash]
+
+    # ignore_conflicts covers a concurrent upload inserting the same hash
+    # between the lookup above and this insert
+    created = Certificate.objects.bulk_create([cert for _, cert in new.values()], ignore_conflicts=True)
+    # bulk_create sends no post_save signals
+    shield = get_hash_shield()
+    for cert in created:
+        shield.add(cert.cert_hash)
+    if not batch_mode and new:
+        # bulk_create doesn't return ids when ignoring conflicts; rows a
+        # concurrent upload inserted carry their own transaction hash
+        submitted = {cert.transaction_hash for _, cert in new.values()}
+        for pk, tx_hash in Certificate.objects.filter(cert_hash__in=list(new)).values_list('pk', 'transaction_hash'):
+            if tx_hash in submitted:
+                transaction.on_commit(lambda pk=pk, tx_hash=tx_hash: schedule_confirmation(pk, tx_hash))
+
+    for cert_hash, (row_number, cert) in prepared.items():
+        if cert_hash in existing:
+            results[row_number] = {'row': row_number, 'cert_hash': hash_to_hex(cert_hash),
+                                   'error': 'Certificate already exists'}
+        elif cert_hash in new:
+            results[row_number] = {'row': row_number, 'cert_hash': hash_to_hex(cert_hash),
+                                   'status': Certificate.STATUS_PENDING,
+                                   'transaction_hash': cert.transaction_hash}
+    for row_number, _ in chunk:
+        yield results[row_number]
+
+def _submit(cert):
+    """Send a certificate's issueCertificate transaction; returns its hash"""
+    result = issue_certificate(
+        cert.student_name, cert.course, cert.institution, int(cert.issue_date.timestamp()), wait=False
+    )
+    if not result.get('transaction_hash'):
+        raise ValueError("Failed to issue certificate on blockchain")
+    return result['transaction_hash']
@@ -0,0 +1,175 @@
+# certificates/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .fields import hash_to_bytes
+from .metrics import CallbackMetric
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded in-process LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class VerificationCache:
+    """Cache of verification lookups keyed by the 32-byte certificate hash.
+
+    Entries live in separate namespaces ('certificate' for the serialized
+    database record, 'chain' for the on-chain result). By default they are
+    kept in an in-process LRU; if a Django cache alias is configured it is
+    used instead, so invalidations are shared between worker processes.
+    """
+
+    NAMESPACES = ('certificate', 'chain')
+
+    def __init__(self, max_size=10000, ttl=300, backend=None):
+        self.ttl = ttl
+        self.backend = caches[backend] if backend else None
+        self.local = None if backend else LRUCache(max_size=max_size, ttl=ttl)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._hits = dict.fromkeys(self.NAMESPACES, 0)
+        self._misses = dict.fromkeys(self.NAMESPACES, 0)
+
+    def _key(self, namespace, cert_hash):
+        cert_hash = hash_to_bytes(cert_hash)
+        if self.backend is not None:
+            return f'verify:{namespace}:{cert_hash.hex()}'
+        return (namespace, cert_hash)
+
+    def get(self, namespace, cert_hash):
+        key = self._key(namespace, cert_hash)
+        if self.backend is not None:
+            value = self.backend.get(key)
+        else:
+            value = self.local.get(key)
+        with self._lock:
+            if value is None:
+                self._misses[namespace] += 1
+            else:
+                self._hits[namespace] += 1
+        return value
+
+    def set(self, namespace, cert_hash, value):
+        key = self._key(namespace, cert_hash)
+        if self.backend is not None:
+            self.backend.set(key, value, timeout=self.ttl)
+        else:
+            self.local.set(key, value)
+
+    def invalidate(self, cert_hash):
+        """Drop every cached entry for a certificate"""
+        keys = [self._key(namespace, cert_hash) for namespace in self.NAMESPACES]
+        if self.backend is not None:
+            self.backend.delete_many(keys)
+        else:
+            for key in keys:
+                self.local.delete(key)
+
+    def clear(self):
+        if self.local is not None:
+            self.local.clear()
+        with self._lock:
+            self._hits = dict.fromkeys(self.NAMESPACES, 0)
+            self._misses = dict.fromkeys(self.NAMESPACES, 0)
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                namespace: {
+                    'hits': self._hits[namespace],
+                    'misses': self._misses[namespace],
+                    'hit_ratio': (
+                        self._hits[namespace] / (self._hits[namespace] + self._misses[namespace])
+                        if self._hits[namespace] + self._misses[namespace] else None
+                    ),
+                }
+                for namespace in self.NAMESPACES
+            }
+        stats['backend'] = 'django' if self.backend is not None else 'local'
+        stats['size'] = len(self.local) if self.local is not None else None
+        stats['max_size'] = self.max_size
+        stats['ttl'] = self.ttl
+        return stats
+
+
+_verification_cache = None
+
+def get_verification_cache():
+    """Return the process-wide verification cache configured in settings"""
+    global _verification_cache
+    if _verification_cache is None:
+        config = getattr(settings, 'CERTIFICATE_VERIFICATION_CACHE', {})
+        _verification_cache = VerificationCache(
+            max_size=config.get('MAX_SIZE', 10000),
+            ttl=config.get('TTL', 300),
+            backend=config.get('BACKEND'),
+        )
+    return _verification_cache
+
+def _cache_requests():
+    if _verification_cache is None:
+        return []
+    stats = _verification_cache.stats()
+    return [
+        ({'namespace': namespace, 'result': result}, stats[namespace][result])
+        for namespace in VerificationCache.NAMESPACES for result in ('hits', 'misses')
+    ]
+
+def _cache_hit_ratios():
+    if _verification_cache is None:
+        return []
+    stats = _verification_cache.stats()
+    return [({'namespace': namespace}, stats[namespace]['hit_ratio']) for namespace in VerificationCache.NAMESPACES]
+
+CallbackMetric(
+    'certificate_verification_cache_requests',
+    'Verification cache lookups in this process, by namespace and hit or miss.',
+    _cache_requests, type='counter',
+)
+CallbackMetric(
+    'certificate_verification_cache_hit_ratio',
+    'Share of verification cache lookups in this process that were hits.',
+    _cache_hit_ratios,
+)
@@ -0,0 +1,116 @@
+# certificates/confirmations.py
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+from web3.exceptions import TimeExhausted
+
+from .blockchain import check_receipt, get_watcher, wait_for_transaction
+from .models import Certificate, CertificateBatch
+
+logger = logging.getLogger(__name__)
+
+# The shared confirmation watcher resolves receipts; these workers only write
+# the outcome to the database so the watcher thread never blocks on the DB.
+def _create_executor():
+    return ThreadPoolExecutor(
+        max_workers=getattr(settings, 'CERTIFICATE_CONFIRMATION_WORKERS', 4),
+        thread_name_prefix='cert-confirm',
+    )
+
+_executor = _create_executor()
+
+def _reset_executor():
+    global _executor
+    _executor = _create_executor()
+
+# Worker threads don't survive a fork; give each child process its own pool
+os.register_at_fork(after_in_child=_reset_executor)
+
+def schedule_confirmation(certificate_id, tx_hash):
+    """Confirm a pending certificate in the background"""
+    return _schedule(record_confirmation, certificate_id, tx_hash)
+
+def schedule_batch_confirmation(batch_id, tx_hash):
+    """Confirm a pending Merkle batch and its certificates in the background"""
+    return _schedule(record_batch_confirmation, batch_id, tx_hash)
+
+def pending_transactions():
+    """(certificate id, tx hash) and (batch id, tx hash) pairs still awaiting confirmation"""
+    certificates = Certificate.objects.filter(
+        status=Certificate.STATUS_PENDING, transaction_hash__isnull=False, batch__isnull=True
+    ).values_list('pk', 'transaction_hash')
+    batches = CertificateBatch.objects.filter(
+        status=Certificate.STATUS_PENDING, transaction_hash__isnull=False
+    ).values_list('pk', 'transaction_hash')
+    return list(certificates), list(batches)
+
+def _schedule(record, object_id, tx_hash):
+    timeout = getattr(settings, 'CERTIFICATE_CONFIRMATION_TIMEOUT', 120)
+    future = get_watcher().track(tx_hash, timeout=timeout)
+    future.add_done_callback(
+        lambda f: _executor.submit(_record_in_worker, record, object_id, f)
+    )
+    return future
+
+def _record_in_worker(record, object_id, future):
+    try:
+        return record(object_id, lambda: check_receipt(future.result()))
+    finally:
+        # Worker threads get their own DB connection; don't leak it
+        connection.close()
+
+def confirm_certificate(certificate_id, tx_hash):
+    """Wait for an issuance transaction and record the outcome on the certificate"""
+    timeout = getattr(settings, 'CERTIFICATE_CONFIRMATION_TIMEOUT', 120)
+    return record_confirmation(
+        certificate_id, lambda: wait_for_transaction(tx_hash, timeout=timeout)
+    )
+
+def confirm_batch(batch_id, tx_hash):
+    """Wait for a batch anchor transaction and record the outcome on the batch"""
+    timeout = getattr(settings, 'CERTIFICATE_CONFIRMATION_TIMEOUT', 120)
+    return record_batch_confirmation(
+        batch_id, lambda: wait_for_transaction(tx_hash, timeout=timeout)
+    )
+
+def record_confirmation(certificate_id, get_receipt):
+    """Store the result of ``get_receipt()`` as the certificate's status"""
+    return _record_outcome(
+        f"Certificate {certificate_id}",
+        [Certificate.objects.filter(pk=certificate_id)],
+        get_receipt,
+    )
+
+def record_batch_confirmation(batch_id, get_receipt):
+    """Store the result of ``get_receipt()`` on a batch and all of its certificates"""
+    return _record_outcome(
+        f"Batch {batch_id}",
+        [CertificateBatch.objects.filter(pk=batch_id), Certificate.objects.filter(batch_id=batch_id)],
+        get_receipt,
+    )
+
+def _record_outcome(label, querysets, get_receipt):
+    try:
+        tx_receipt = get_receipt()
+    except TimeExhausted as e:
+        # Not mined yet isn't failed: the transaction may still be in the
+        # mempool, so the rows stay pending for `manage.py confirm_pending`
+        logger.warning("%s not confirmed yet: %s", label, e)
+        return Certificate.STATUS_PENDING
+    except Exception as e:
+        logger.warning("%s failed to confirm: %s", label, e)
+        for queryset in querysets:
+            queryset.update(status=Certificate.STATUS_FAILED, failure_reason=str(e))
+        return Certificate.STATUS_FAILED
+
+    for queryset in querysets:
+        queryset.update(
+            status=Certificate.STATUS_CONFIRMED,
+            block_number=tx_receipt.blockNumber,
+            failure_reason=None,
+        )
+    return Certificate.STATUS_CONFIRMED
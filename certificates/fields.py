@@ -0,0 +1,109 @@
+# certificates/fields.py
+
+from django.core import exceptions
+from django.db import models
+from rest_framework import serializers
+
+HASH_LENGTH = 32
+
+def hash_to_bytes(value):
+    """Convert a certificate hash (0x hex string, bytes or memoryview) to bytes.
+
+    Lenient about length; use ``parse_cert_hash`` for input coming from
+    outside the application.
+    """
+    if value is None or isinstance(value, bytes):
+        return value
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    value = value.strip()
+    if value[:2].lower() == '0x':
+        value = value[2:]
+    if len(value) % 2:
+        value = '0' + value
+    return bytes.fromhex(value)
+
+def hash_to_hex(value):
+    """Format a certificate hash as a lowercase 0x-prefixed hex string"""
+    if value is None:
+        return None
+    return '0x' + hash_to_bytes(value).hex()
+
+def parse_cert_hash(value):
+    """Parse a certificate hash received from a client.
+
+    Raises ValueError unless ``value`` is exactly 32 bytes of hex, with or
+    without the 0x prefix.
+    """
+    if not isinstance(value, str):
+        raise ValueError("Certificate hash must be a hex string")
+    hex_value = value[2:] if value[:2].lower() == '0x' else value
+    if len(hex_value) != HASH_LENGTH * 2:
+        raise ValueError(f"Certificate hash must be {HASH_LENGTH} bytes ({HASH_LENGTH * 2} hex characters)")
+    try:
+        return bytes.fromhex(hex_value)
+    except ValueError:
+        raise ValueError("Certificate hash must be hexadecimal")
+
+
+class Bytes32Field(models.BinaryField):
+    """Fixed-size binary column holding a 32-byte keccak digest.
+
+    Hex strings are accepted when saving and filtering, so existing callers
+    keep working; values always come back from the database as bytes.
+    Anything that isn't exactly 32 bytes is rejected with a ValueError
+    (ValidationError from ``full_clean``).
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs['max_length'] = HASH_LENGTH
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['max_length']
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == 'mysql':
+            return f'binary({HASH_LENGTH})'
+        if connection.vendor == 'oracle':
+            return f'RAW({HASH_LENGTH})'
+        return super().db_type(connection)
+
+    @staticmethod
+    def _digest(value):
+        # Only MySQL and Oracle enforce the column size, and a digest of any
+        # other length would never match an exact or prefix-range lookup
+        value = hash_to_bytes(value)
+        if value is not None and len(value) != HASH_LENGTH:
+            raise ValueError(f"Certificate hash must be {HASH_LENGTH} bytes, not {len(value)}")
+        return value
+
+    def from_db_value(self, value, expression, connection):
+        return hash_to_bytes(value)
+
+    def to_python(self, value):
+        try:
+            return self._digest(value)
+        except ValueError as e:
+            raise exceptions.ValidationError(str(e), code='invalid')
+
+    def get_prep_value(self, value):
+        return self._digest(super().get_prep_value(value))
+
+    def value_to_string(self, obj):
+        return hash_to_hex(self.value_from_object(obj))
+
+
+class HexHashField(serializers.Field):
+    """Serializes a Bytes32Field as a 0x-prefixed hex string"""
+
+    def to_representation(self, value):
+        return hash_to_hex(value)
+
+    def to_internal_value(self, data):
+        try:
+            return parse_cert_hash(data)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
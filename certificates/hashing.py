@@ -0,0 +1,30 @@
+# certificates/hashing.py
+
+from eth_hash.auto import keccak
+
+# The contract hashes keccak256(abi.encodePacked(studentName, course,
+# institution, issueDate)): the three strings' UTF-8 bytes back to back, then
+# the uint256 as 32 big-endian bytes. Packing that here directly is many
+# times faster than Web3.solidity_keccak, which parses the type list and
+# validates and ABI-encodes each value on every call.
+
+def _pack(student_name, course, institution, issue_date):
+    try:
+        packed_date = issue_date.to_bytes(32, 'big')
+    except (AttributeError, OverflowError):
+        raise ValueError(f"issue_date must be an integer between 0 and 2**256 - 1, not {issue_date!r}")
+    return b''.join((
+        student_name.encode('utf-8'), course.encode('utf-8'), institution.encode('utf-8'), packed_date,
+    ))
+
+def certificate_hash(student_name, course, institution, issue_date):
+    """The contract's 32-byte hash of a certificate; ``issue_date`` is a Unix timestamp"""
+    return keccak(_pack(student_name, course, institution, issue_date))
+
+def certificate_hashes(rows):
+    """certificate_hash for each (student_name, course, institution, issue_date) tuple.
+
+    For bulk issuance and re-hashing. Free of Django imports, so it can be
+    run in a process pool.
+    """
+    return [keccak(_pack(*row)) for row in rows]
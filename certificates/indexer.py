@@ -0,0 +1,158 @@
+# certificates/indexer.py
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Subquery
+from web3 import Web3
+
+from .blockchain import (
+    BlockchainConnectionError, SmartContractError, get_client, verify_certificates_on_chain
+)
+from .cache import get_verification_cache
+from .instrumentation import stage
+from .models import ChainCertificate, SyncCheckpoint
+from .revocations import get_revocation_set, record_revocation
+
+DEFAULT_EVENTS = {'issued': 'CertificateIssued', 'revoked': 'CertificateRevoked'}
+
+# Issued certificates have their details read back with batched eth_calls
+# of at most this many hashes
+DETAILS_BATCH_SIZE = 100
+
+def checkpoint_name(contract):
+    return f'certificate-events:{contract.address.lower()}'
+
+def _event_names():
+    return dict(DEFAULT_EVENTS, **getattr(settings, 'BLOCKCHAIN_INDEX_EVENTS', {}))
+
+def _get_logs(contract, event_name, from_block, to_block):
+    try:
+        event = contract.events[event_name]
+    except Exception:
+        raise SmartContractError(f"Contract ABI has no {event_name} event")
+    return event.get_logs(from_block=from_block, to_block=to_block)
+
+def _event_hash(log):
+    """The certificate hash carried by an event: its first bytes32 argument"""
+    for value in log['args'].values():
+        if isinstance(value, (bytes, bytearray)) and len(value) == 32:
+            return bytes(value)
+    return None
+
+def _fetch_details(cert_hashes):
+    """The contract's record of every issued hash.
+
+    Raises if any can't be read: a row indexed as issued without its
+    details would be served as a valid certificate with empty fields, so
+    the range is left unindexed and retried by the next run instead.
+    """
+    details = {}
+    for start in range(0, len(cert_hashes), DETAILS_BATCH_SIZE):
+        chunk = cert_hashes[start:start + DETAILS_BATCH_SIZE]
+        results = verify_certificates_on_chain(chunk)
+        if len(results) != len(chunk):
+            raise SmartContractError(f"Expected {len(chunk)} certificate records, got {len(results)}")
+        for cert_hash, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                error = BlockchainConnectionError if isinstance(result, BlockchainConnectionError) else SmartContractError
+                raise error(f"Could not read certificate 0x{cert_hash.hex()}: {str(result)}")
+            details[cert_hash] = result
+    return details
+
+def sync(max_blocks=2000):
+    """Index the next range of blocks after the checkpoint.
+
+    Issue and revoke events are applied to the ChainCertificate mirror and
+    the checkpoint advanced in one transaction, so an interrupted run
+    resumes where it left off. Blocks younger than
+    BLOCKCHAIN_INDEX_CONFIRMATIONS are left for a later run. Returns
+    (from_block, to_block, events applied), or None if already up to date.
+    """
+    web3, contract = get_client()
+    if not web3 or not contract:
+        raise BlockchainConnectionError("Blockchain connection not available")
+
+    name = checkpoint_name(contract)
+    checkpoint = SyncCheckpoint.objects.filter(name=name).first()
+    from_block = (
+        checkpoint.block_number + 1 if checkpoint
+        else getattr(settings, 'BLOCKCHAIN_INDEX_START_BLOCK', 0)
+    )
+    head = web3.eth.block_number - getattr(settings, 'BLOCKCHAIN_INDEX_CONFIRMATIONS', 0)
+    if from_block > head:
+        return None
+    to_block = min(head, from_block + max_blocks - 1)
+
+    events = _event_names()
+    issued = {}
+    for log in _get_logs(contract, events['issued'], from_block, to_block):
+        cert_hash = _event_hash(log)
+        if cert_hash is not None:
+            issued[cert_hash] = log
+    revoked = {}
+    for log in _get_logs(contract, events['revoked'], from_block, to_block):
+        cert_hash = _event_hash(log)
+        if cert_hash is not None:
+            revoked[cert_hash] = log
+    details = _fetch_details(list(issued))
+
+    with transaction.atomic():
+        rows = {
+            row.cert_hash: row
+            for row in ChainCertificate.objects.filter(cert_hash__in=list(issued) + list(revoked))
+        }
+        new_rows = {}
+        for cert_hash, log in issued.items():
+            row = rows.get(cert_hash) or new_rows.setdefault(cert_hash, ChainCertificate(cert_hash=cert_hash))
+            row.issued_block = log['blockNumber']
+            row.issued_transaction = Web3.to_hex(log['transactionHash'])
+            _, row.student_name, row.course, row.institution, row.issue_date = details[cert_hash]
+        for cert_hash, log in revoked.items():
+            # A revoke for a certificate issued before the start block still
+            # gets a row, so it can't be reported as valid from the index
+            row = rows.get(cert_hash) or new_rows.setdefault(cert_hash, ChainCertificate(cert_hash=cert_hash))
+            row.is_revoked = True
+            row.revoked_block = log['blockNumber']
+
+        ChainCertificate.objects.bulk_create(new_rows.values())
+        if rows:
+            ChainCertificate.objects.bulk_update(rows.values(), [
+                'student_name', 'course', 'institution', 'issue_date', 'issued_block',
+                'issued_transaction', 'is_revoked', 'revoked_block',
+            ])
+        if revoked:
+            record_revocation()
+        SyncCheckpoint.objects.update_or_create(name=name, defaults={'block_number': to_block})
+
+    cache = get_verification_cache()
+    revocations = get_revocation_set()
+    for cert_hash in revoked:
+        cache.invalidate(cert_hash)
+        revocations.add(cert_hash)
+    return from_block, to_block, len(issued) + len(revoked)
+
+def use_index():
+    """Whether verification should be answered from the mirror when possible"""
+    return getattr(settings, 'CERTIFICATE_VERIFICATION_SOURCE', 'chain') == 'index'
+
+def indexed_results(cert_hashes):
+    """Look certificates up in the mirror with a single query.
+
+    Returns {cert_hash: (verifyCertificate-style result, indexed block)} for
+    the hashes whose issue event the indexer has seen; the block is the
+    checkpoint height the answer is valid at. Rows known only from a revoke
+    event (issued before the indexer's start block) have no details to give,
+    so they are left to the contract.
+    """
+    # Only one contract is indexed at a time; matching on the prefix avoids
+    # needing a live connection just to build the checkpoint name
+    checkpoint = SyncCheckpoint.objects.filter(
+        name__startswith='certificate-events:'
+    ).order_by('-block_number').values('block_number')[:1]
+    with stage('db'):
+        rows = list(ChainCertificate.objects.filter(
+            cert_hash__in=list(cert_hashes), issued_block__isnull=False
+        ).annotate(
+            indexed_block=Subquery(checkpoint)
+        ))
+    return {row.cert_hash: (row.as_chain_result(), row.indexed_block) for row in rows}
@@ -0,0 +1,130 @@
+# certificates/instrumentation.py
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+request_logger = logging.getLogger('certificates.requests')
+
+_current_timer = contextvars.ContextVar('certificates_stage_timer', default=None)
+
+
+class StageTimer:
+    """Adds up the time one request spends in each stage.
+
+    Stages are named ('db', 'hashing', 'rpc', 'serialization', ...) and may
+    be entered several times; their durations accumulate. Code further down
+    the call stack records into the timer of the request it runs for through
+    the module-level ``stage()``, without the timer being passed around.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.fields = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def activate(self):
+        """Make this the timer ``stage()`` records into"""
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+
+    def log(self, status_code, **fields):
+        """Emit one summary record for the request at INFO level"""
+        if not request_logger.isEnabledFor(logging.INFO):
+            return
+        total_ms = (time.perf_counter() - self.started) * 1000
+        stages_ms = {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+        request_logger.info(
+            '%s status=%s total=%.1fms %s',
+            self.endpoint, status_code, total_ms,
+            ' '.join(f'{name}={ms:.1f}ms' for name, ms in stages_ms.items()),
+            extra={
+                'endpoint': self.endpoint,
+                'status_code': status_code,
+                'duration_ms': round(total_ms, 3),
+                'stages_ms': stages_ms,
+                **self.fields,
+                **fields,
+            },
+        )
+
+
+@contextmanager
+def stage(name):
+    """Time a block against the current request's timer, if there is one"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+def annotate(**fields):
+    """Add fields to the current request's summary record"""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.fields.update(fields)
+
+def timed(endpoint):
+    """Decorate a view so each call logs one summary record with its stage timings"""
+    def decorator(view):
+        if inspect.iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                # Tasks the view starts copy the context, so they record
+                # into this timer too
+                timer = StageTimer(endpoint)
+                with timer.activate():
+                    response = await view(request, *args, **kwargs)
+                timer.log(response.status_code)
+                return response
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timer = StageTimer(endpoint)
+            with timer.activate():
+                response = view(request, *args, **kwargs)
+            timer.log(response.status_code)
+            return response
+        return wrapper
+    return decorator
+
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
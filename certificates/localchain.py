@@ -0,0 +1,420 @@
+# certificates/localchain.py
+
+import itertools
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_account._utils.legacy_transactions import Transaction
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from web3 import Web3
+from web3.providers import JSONBaseProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+from .hashing import certificate_hash
+
+# ABI of the CertificateVerification interface this app calls, shipped so
+# the emulator (and benchmarks) don't need the Truffle project checked out
+ABI_PATH = os.path.join(os.path.dirname(__file__), 'contracts', 'CertificateVerification.json')
+
+NOT_FOUND = 'VM Exception while processing transaction: revert Certificate not found'
+
+
+class RPCError(Exception):
+    def __init__(self, message, code=-32000):
+        super().__init__(message)
+        self.code = code
+
+
+def _types(params):
+    return [param['type'] for param in params]
+
+def _quantity(value):
+    return hex(value)
+
+def _data(value):
+    return Web3.to_hex(value)
+
+def _decode_raw_transaction(raw):
+    """The sender and fields of a signed legacy or typed transaction"""
+    sender = Account.recover_transaction(raw)
+    if raw[0] >= 0xc0:
+        fields = Transaction.from_bytes(raw).as_dict()
+        # EIP-155 folds the chain id into v; unprotected transactions have none
+        fields['chainId'] = (fields['v'] - 35) // 2 if fields['v'] >= 35 else None
+    else:
+        fields = TypedTransaction.from_bytes(raw).as_dict()
+    return sender, fields
+
+
+class LocalChain:
+    """In-process emulator of a Ganache node running the certificate contract.
+
+    No EVM runs here: the contract's functions (issueCertificate,
+    revokeCertificate, verifyCertificate and certificates) are re-implemented
+    in Python against in-memory state, with the same ABI encoding, events
+    and revert messages, so anything that talks to the contract through web3
+    can't tell the difference. Serves JSON-RPC (including batches) over HTTP
+    on localhost. The contract is "deployed" from the first account on
+    creation, at ``contract_address``; ``eth_getCode`` returns a placeholder
+    there, as there is no bytecode. Every transaction is mined into its own
+    block straight away, as Ganache does. Transactions are either signed by
+    the node from ``accounts`` (eth_sendTransaction) or signed by the caller
+    with any key (eth_sendRawTransaction); nonces above the next expected one
+    are held until the gap is filled. Gas estimates run the call, so one
+    that would revert fails its estimate as on a real node.
+
+    Use ``start()`` to reach it over HTTP, or ``LocalChainProvider`` to skip
+    the network entirely.
+    """
+
+    def __init__(self, accounts=1, chain_id=1337, gas_price=10 ** 9):
+        with open(ABI_PATH) as abi_file:
+            self.abi = json.load(abi_file)['abi']
+        self.functions = {
+            function_abi_to_4byte_selector(item): item for item in self.abi if item['type'] == 'function'
+        }
+        self.events = {item['name']: item for item in self.abi if item['type'] == 'event'}
+        self.accounts = [
+            Web3.to_checksum_address(Web3.keccak(text=f'local-chain-account-{i}')[-20:])
+            for i in range(accounts)
+        ]
+        self.chain_id = chain_id
+        self.gas_price = gas_price
+        self.certificates = {}  # cert hash -> [student, course, institution, issue date, valid]
+        self.blocks = [self._block(0, [])]
+        self.receipts = {}
+        self.logs = []
+        self.nonces = {account.lower(): 0 for account in self.accounts}
+        self._queued = {}  # sender -> {nonce: transaction}
+        self._tx_ids = itertools.count()
+        self._lock = threading.RLock()
+        self.server = None
+        self.url = None
+        self.contract_address = None
+        self._deploy()
+
+    # Contract state
+
+    def _deploy(self):
+        deployer = self.accounts[0].lower()
+        self.contract_address = Web3.to_checksum_address(
+            Web3.keccak(text=f'{deployer}-{self.nonces[deployer]}')[-20:]
+        )
+        self._execute({'hash': self._next_tx_hash(), 'from': deployer, 'to': None})
+        self.nonces[deployer] += 1
+
+    def _is_contract(self, address):
+        return bool(address) and address.lower() == self.contract_address.lower()
+
+    def seed(self, student_name, course, institution, issue_date):
+        """Store a certificate directly, without a transaction; returns its hash"""
+        cert_hash = certificate_hash(student_name, course, institution, issue_date)
+        with self._lock:
+            self.certificates[cert_hash] = [student_name, course, institution, issue_date, True]
+        return cert_hash
+
+    def _call(self, data):
+        data = Web3.to_bytes(hexstr=data)
+        function = self.functions.get(data[:4])
+        if function is None:
+            raise RPCError('VM Exception while processing transaction: revert')
+        args = decode(_types(function['inputs']), data[4:])
+        return function, args
+
+    def _read(self, function, args):
+        certificate = self.certificates.get(bytes(args[0]))
+        if function['name'] == 'verifyCertificate':
+            if certificate is None:
+                raise RPCError(NOT_FOUND)
+            student_name, course, institution, issue_date, valid = certificate
+            values = [valid, student_name, course, institution, issue_date]
+        elif function['name'] == 'certificates':
+            values = certificate if certificate is not None else ['', '', '', 0, False]
+        else:
+            values = []
+        return encode(_types(function['outputs']), values)
+
+    def _write(self, function, args, apply=True):
+        """Apply a transaction; returns its logs or raises RPCError to revert.
+
+        With ``apply=False`` the state is left alone, for gas estimates.
+        """
+        if function['name'] == 'issueCertificate':
+            cert_hash = certificate_hash(*args)
+            if cert_hash in self.certificates:
+                raise RPCError('VM Exception while processing transaction: revert Certificate already exists')
+            if apply:
+                self.certificates[cert_hash] = list(args) + [True]
+            return [self._log('CertificateIssued', cert_hash, [args[0], args[3]])]
+        if function['name'] == 'revokeCertificate':
+            cert_hash = bytes(args[0])
+            if cert_hash not in self.certificates:
+                raise RPCError(NOT_FOUND)
+            if apply:
+                self.certificates[cert_hash][4] = False
+            return [self._log('CertificateRevoked', cert_hash, [])]
+        raise RPCError('VM Exception while processing transaction: revert')
+
+    def _log(self, name, cert_hash, values):
+        event = self.events[name]
+        data = encode([param['type'] for param in event['inputs'] if not param['indexed']], values)
+        return {'topics': [_data(event_abi_to_log_topic(event)), _data(cert_hash)], 'data': _data(data)}
+
+    # Blocks and transactions
+
+    def _block(self, number, transactions):
+        return {
+            'number': _quantity(number),
+            'hash': _data(Web3.keccak(text=f'block-{number}')),
+            'parentHash': _data(Web3.keccak(text=f'block-{number - 1}')) if number else '0x' + '00' * 32,
+            'timestamp': _quantity(1700000000 + number),
+            'gasLimit': _quantity(30000000),
+            'gasUsed': _quantity(0),
+            'baseFeePerGas': _quantity(self.gas_price),
+            'miner': '0x' + '00' * 20,
+            'transactions': transactions,
+        }
+
+    def _execute(self, transaction):
+        # Called with the lock held
+        tx_hash = transaction['hash']
+        number = len(self.blocks)
+        status = 1
+        logs = []
+        if self._is_contract(transaction['to']):
+            try:
+                function, args = self._call(transaction.get('data', '0x'))
+                logs = self._write(function, args)
+            except RPCError:
+                status = 0
+        block = self._block(number, [tx_hash])
+        self.blocks.append(block)
+        for index, log in enumerate(logs):
+            log.update({
+                'address': transaction['to'], 'blockNumber': block['number'], 'blockHash': block['hash'],
+                'transactionHash': tx_hash, 'transactionIndex': '0x0', 'logIndex': _quantity(index),
+                'removed': False,
+            })
+            self.logs.append(log)
+        self.receipts[tx_hash] = {
+            'transactionHash': tx_hash, 'transactionIndex': '0x0',
+            'blockHash': block['hash'], 'blockNumber': block['number'],
+            'from': transaction['from'], 'to': transaction['to'],
+            'gasUsed': _quantity(50000), 'cumulativeGasUsed': _quantity(50000),
+            'effectiveGasPrice': _quantity(self.gas_price),
+            'contractAddress': self.contract_address if transaction['to'] is None else None,
+            'logs': logs, 'logsBloom': '0x' + '00' * 256, 'status': _quantity(status), 'type': '0x2',
+        }
+
+    def _send(self, transaction):
+        """eth_sendTransaction: signed by the node from one of ``accounts``"""
+        sender = transaction.get('from', '').lower()
+        if sender not in self.nonces:
+            raise RPCError(f'sender account not recognized: {sender}')
+        nonce = int(transaction['nonce'], 16) if 'nonce' in transaction else None
+        return self._submit(sender, nonce, transaction.get('to'), transaction.get('data', '0x'), self._next_tx_hash())
+
+    def _send_raw(self, raw):
+        """eth_sendRawTransaction: signed by the caller, from any account"""
+        raw = Web3.to_bytes(hexstr=raw)
+        try:
+            sender, fields = _decode_raw_transaction(raw)
+        except Exception as e:
+            raise RPCError(f'invalid raw transaction: {e}')
+        if fields['chainId'] not in (None, self.chain_id):
+            raise RPCError(f"invalid chain id {fields['chainId']}")
+        to = Web3.to_checksum_address(fields['to']) if fields['to'] else None
+        return self._submit(sender.lower(), fields['nonce'], to, _data(fields['data']), _data(Web3.keccak(raw)))
+
+    def _submit(self, sender, nonce, to, data, tx_hash):
+        with self._lock:
+            if self._is_contract(to):
+                # Reverts are reported when the transaction is sent, as Ganache does
+                function, args = self._call(data)
+                if function['stateMutability'] in ('view', 'pure'):
+                    raise RPCError('VM Exception while processing transaction: revert')
+            expected = self.nonces.setdefault(sender, 0)
+            nonce = expected if nonce is None else nonce
+            if nonce < expected:
+                raise RPCError('nonce too low')
+            if tx_hash in self.receipts:
+                raise RPCError('known transaction')
+            transaction = {'hash': tx_hash, 'from': sender, 'to': to, 'data': data}
+            self._queued.setdefault(sender, {})[nonce] = transaction
+            queued = self._queued[sender]
+            while self.nonces[sender] in queued:
+                self._execute(queued.pop(self.nonces[sender]))
+                self.nonces[sender] += 1
+            return tx_hash
+
+    def _estimate_gas(self, transaction):
+        if self._is_contract(transaction.get('to')):
+            function, args = self._call(transaction.get('data') or transaction.get('input') or '0x')
+            if function['stateMutability'] not in ('view', 'pure'):
+                with self._lock:
+                    self._write(function, args, apply=False)
+        return _quantity(50000)
+
+    def _next_tx_hash(self):
+        return _data(Web3.keccak(text=f'tx-{next(self._tx_ids)}'))
+
+    def _get_logs(self, log_filter):
+        start = int(log_filter.get('fromBlock', '0x0'), 16)
+        end = log_filter.get('toBlock', 'latest')
+        end = len(self.blocks) - 1 if end == 'latest' else int(end, 16)
+        topics = log_filter.get('topics') or []
+        with self._lock:
+            logs = list(self.logs)
+        return [
+            log for log in logs
+            if start <= int(log['blockNumber'], 16) <= end
+            and all(topic is None or log['topics'][i] in (topic if isinstance(topic, list) else [topic])
+                    for i, topic in enumerate(topics))
+        ]
+
+    def _block_number(self, tag):
+        if tag in ('latest', 'pending', 'safe', 'finalized'):
+            return len(self.blocks) - 1
+        return 0 if tag == 'earliest' else int(tag, 16)
+
+    # JSON-RPC
+
+    def handle(self, method, params):
+        """Answer one JSON-RPC call"""
+        if method == 'eth_chainId':
+            return _quantity(self.chain_id)
+        if method == 'net_version':
+            return str(self.chain_id)
+        if method == 'web3_clientVersion':
+            return 'LocalChain/certificates'
+        if method == 'eth_blockNumber':
+            return _quantity(len(self.blocks) - 1)
+        if method == 'eth_accounts':
+            return list(self.accounts)
+        if method == 'eth_getBalance':
+            return _quantity(10 ** 21)
+        if method == 'eth_gasPrice':
+            return _quantity(self.gas_price)
+        if method == 'eth_maxPriorityFeePerGas':
+            return _quantity(self.gas_price)
+        if method == 'eth_estimateGas':
+            return self._estimate_gas(params[0])
+        if method == 'eth_getTransactionCount':
+            with self._lock:
+                sender = params[0].lower()
+                nonce = self.nonces.get(sender, 0)
+                if params[1] == 'pending':
+                    while nonce in self._queued.get(sender, {}):
+                        nonce += 1
+                return _quantity(nonce)
+        if method == 'eth_getCode':
+            # A placeholder: the contract is emulated, so it has no bytecode
+            return '0x6080' if self._is_contract(params[0]) else '0x'
+        if method == 'eth_call':
+            if not self._is_contract(params[0].get('to')):
+                return '0x'
+            function, args = self._call(params[0].get('data') or params[0].get('input'))
+            with self._lock:
+                return _data(self._read(function, args))
+        if method == 'eth_sendTransaction':
+            return self._send(params[0])
+        if method == 'eth_sendRawTransaction':
+            return self._send_raw(params[0])
+        if method == 'eth_getTransactionReceipt':
+            return self.receipts.get(params[0])
+        if method == 'eth_getBlockByNumber':
+            number = self._block_number(params[0])
+            return self.blocks[number] if number < len(self.blocks) else None
+        if method == 'eth_getLogs':
+            return self._get_logs(params[0])
+        raise RPCError(f'Method {method} not supported', code=-32601)
+
+    def start(self):
+        """Serve JSON-RPC on a free localhost port and return its URL"""
+        chain = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                calls = body if isinstance(body, list) else [body]
+                responses = []
+                for call in calls:
+                    response = {'jsonrpc': '2.0', 'id': call.get('id')}
+                    try:
+                        response['result'] = chain.handle(call['method'], call.get('params', []))
+                    except RPCError as e:
+                        response['error'] = {'code': e.code, 'message': str(e)}
+                    responses.append(response)
+                payload = json.dumps(responses if isinstance(body, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, name='local-chain', daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class _LocalChainResponder:
+    def __init__(self, chain):
+        super().__init__()
+        self.chain = chain
+        self._ids = itertools.count()
+
+    def _respond(self, method, params):
+        # Encode and decode as if over the wire, so callers never share
+        # objects with the chain's own state
+        request = json.loads(self.encode_rpc_request(method, params))
+        response = {'jsonrpc': '2.0', 'id': next(self._ids)}
+        try:
+            response['result'] = json.loads(json.dumps(self.chain.handle(method, request['params'])))
+        except RPCError as e:
+            response['error'] = {'code': e.code, 'message': str(e)}
+        return response
+
+
+class LocalChainProvider(_LocalChainResponder, JSONBaseProvider):
+    """Web3 provider answering from a LocalChain emulator in this process, without HTTP"""
+
+    def make_request(self, method, params):
+        return self._respond(method, params)
+
+    def make_batch_request(self, requests_info):
+        return [self._respond(method, params) for method, params in requests_info]
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+class AsyncLocalChainProvider(_LocalChainResponder, AsyncJSONBaseProvider):
+    """AsyncWeb3 provider answering from a LocalChain emulator in this process"""
+
+    async def make_request(self, method, params):
+        return self._respond(method, params)
+
+    async def make_batch_request(self, requests_info):
+        return [self._respond(method, params) for method, params in requests_info]
+
+    async def is_connected(self, show_traceback=False):
+        return True
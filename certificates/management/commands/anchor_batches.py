@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates.batching import anchor_batch, create_batch, queued_certificates
+from certificates.confirmations import confirm_batch
+
+
+class Command(BaseCommand):
+    help = "Group queued certificates into Merkle batches and anchor each root on the blockchain"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-size', type=int, default=1000,
+                            help="Maximum number of certificates per batch")
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help="Stop after anchoring this many batches")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{queued_certificates().count()} certificates queued for batching")
+
+        # Submit every anchor first so they are mined together, then confirm
+        submitted = []
+        while options['max_batches'] is None or len(submitted) < options['max_batches']:
+            batch = create_batch(max_size=options['max_size'])
+            if batch is None:
+                break
+            try:
+                anchor_batch(batch, schedule=False)
+            except Exception as e:
+                raise CommandError(f"Failed to anchor batch {batch.pk}: {str(e)}")
+            submitted.append(batch)
+            self.stdout.write(
+                f"Batch {batch.pk}: {batch.size} certificates, root {batch.merkle_root}, "
+                f"transaction {batch.transaction_hash}"
+            )
+
+        for batch in submitted:
+            outcome = confirm_batch(batch.pk, batch.transaction_hash)
+            self.stdout.write(f"Batch {batch.pk} {outcome}")
+
+        self.stdout.write(self.style.SUCCESS(f"Anchored {len(submitted)} batches"))
@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import override_settings
+
+from certificates import bloom, cache, revocations
+from certificates.backends import get_backend, reset_backend
+from certificates.benchmark import WORKLOADS, hashing_benchmark, run_workload, serve, workload_requests
+from certificates.blockchain import reset_client, warm_up
+from certificates.localchain import ABI_PATH, LocalChain
+from certificates.models import Certificate
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed certificates, serve the app against a local chain stand-in and "
+        "report latency percentiles and throughput per workload, plus a hashing "
+        "microbenchmark, as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--certificates', type=int, default=1000,
+                            help="Certificates seeded in the database and on the chain")
+        parser.add_argument('--requests', type=int, default=500,
+                            help="Requests sent per workload")
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help="Requests in flight at once")
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help="Hashes per verify_batch request")
+        parser.add_argument('--workloads', default=','.join(WORKLOADS),
+                            help=f"Comma-separated workloads to run, in order ({', '.join(WORKLOADS)})")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Seed for the generated requests, so runs are comparable")
+        parser.add_argument('--chain', choices=('http', 'in-process'), default='http',
+                            help="Reach the stand-in chain over JSON-RPC on localhost (the 'rpc' "
+                                 "backend) or call it directly (the 'local' backend)")
+        parser.add_argument('--hash-records', type=int, default=20000,
+                            help="Certificates hashed by the hashing microbenchmark (0 to skip it)")
+        parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+
+    def handle(self, *args, **options):
+        workloads = [name.strip() for name in options['workloads'].split(',') if name.strip()]
+        unknown = set(workloads) - set(WORKLOADS)
+        if unknown:
+            raise CommandError(f"Unknown workloads: {', '.join(sorted(unknown))}")
+        if options['certificates'] < 1 or options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--certificates, --requests and --concurrency must be positive")
+
+        app = get_wsgi_application()
+        # One summary line per request would drown the report
+        if options['verbosity'] < 2:
+            logging.getLogger('certificates').setLevel(logging.WARNING)
+
+        # Run against a throwaway test database, never the configured one.
+        # SQLite's shared in-memory test database locks whole tables between
+        # threads, so concurrent writes get a temporary file instead.
+        temp_dir = None
+        if connection.vendor == 'sqlite':
+            temp_dir = tempfile.TemporaryDirectory()
+            connection.settings_dict['TEST']['NAME'] = os.path.join(temp_dir.name, 'benchmark.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        chain = None
+        try:
+            if options['chain'] == 'http':
+                chain = LocalChain()
+                chain_settings = {
+                    'BLOCKCHAIN_BACKEND': 'rpc',
+                    'BLOCKCHAIN_RPC_ENDPOINTS': [chain.start()],
+                    'BLOCKCHAIN_CONTRACT_ABI_PATH': ABI_PATH,
+                    'BLOCKCHAIN_CONTRACT_ADDRESS': chain.contract_address,
+                }
+            else:
+                chain_settings = {'BLOCKCHAIN_BACKEND': 'local'}
+            with override_settings(
+                BLOCKCHAIN_SIGNER_KEYS=[],
+                BLOCKCHAIN_SIGNER_ACCOUNTS=[],
+                CERTIFICATE_ISSUANCE_MODE='single',
+                **chain_settings,
+            ):
+                reset_backend()
+                if chain is None:
+                    chain = get_backend().chain
+                report = self._run(app, chain, workloads, options)
+        finally:
+            if chain is not None:
+                chain.stop()
+            reset_client()
+            reset_backend()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if temp_dir is not None:
+                temp_dir.cleanup()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def _run(self, app, chain, workloads, options):
+        reset_client()
+        cache._verification_cache = None
+        revocations._revocation_set = None
+        bloom._shield = None
+
+        self.stderr.write(f"Seeding {options['certificates']} certificates")
+        certificates = []
+        for i in range(options['certificates']):
+            fields = (f'Seeded Student {i}', 'Benchmarking', 'Benchmark University', 1600000000 + i)
+            certificates.append(Certificate(
+                student_name=fields[0], course=fields[1], institution=fields[2],
+                issue_date=datetime.fromtimestamp(fields[3], tz=timezone.utc),
+                cert_hash=chain.seed(*fields),
+                status=Certificate.STATUS_CONFIRMED,
+            ))
+        Certificate.objects.bulk_create(certificates, batch_size=500)
+        cert_hashes = ['0x' + bytes(certificate.cert_hash).hex() for certificate in certificates]
+
+        if not warm_up():
+            raise CommandError("Could not connect to the local chain")
+        server, base_url = serve(app)
+        results = {}
+        try:
+            for workload in workloads:
+                self.stderr.write(f"Running {workload}")
+                results[workload] = run_workload(
+                    base_url,
+                    workload_requests(
+                        workload, cert_hashes, options['requests'],
+                        batch_size=options['batch_size'], seed=options['seed'],
+                    ),
+                    options['concurrency'],
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        hashing = None
+        if options['hash_records'] > 0:
+            self.stderr.write("Running hashing microbenchmark")
+            hashing = hashing_benchmark(options['hash_records'], seed=options['seed'])
+
+        return {
+            'config': {
+                'certificates': options['certificates'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'batch_size': options['batch_size'],
+                'seed': options['seed'],
+                'chain': options['chain'],
+                'workloads': workloads,
+                'hash_records': options['hash_records'],
+            },
+            'environment': {
+                'git_commit': _git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'results': results,
+            'hashing': hashing,
+        }
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates.blockchain import BlockchainConnectionError, check_receipt, get_watcher
+from certificates.confirmations import pending_transactions, record_batch_confirmation, record_confirmation
+
+
+class Command(BaseCommand):
+    help = (
+        "Wait for every issuance and batch anchor transaction still pending in the "
+        "database and record whether it was mined or failed"
+    )
+
+    def handle(self, *args, **options):
+        certificates, batches = pending_transactions()
+        self.stdout.write(f"{len(certificates)} certificates and {len(batches)} batches pending")
+        if not certificates and not batches:
+            return
+
+        # Track everything first so the transactions are waited for together
+        timeout = getattr(settings, 'CERTIFICATE_CONFIRMATION_TIMEOUT', 120)
+        try:
+            watcher = get_watcher()
+        except BlockchainConnectionError as e:
+            raise CommandError(str(e))
+        tracked = [
+            (record, object_id, watcher.track(tx_hash, timeout=timeout))
+            for record, pending in ((record_confirmation, certificates), (record_batch_confirmation, batches))
+            for object_id, tx_hash in pending
+        ]
+        outcomes = {}
+        for record, object_id, future in tracked:
+            outcome = record(object_id, lambda: check_receipt(future.result()))
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+        ))
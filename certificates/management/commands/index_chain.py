@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates.blockchain import BlockchainConnectionError, SmartContractError
+from certificates.indexer import sync
+
+
+class Command(BaseCommand):
+    help = "Index the certificate contract's issue and revoke events into the local mirror"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--follow', action='store_true',
+                            help="Keep running and index new blocks as they arrive")
+        parser.add_argument('--max-blocks', type=int, default=2000,
+                            help="Blocks fetched per get_logs range")
+        parser.add_argument('--interval', type=float,
+                            default=getattr(settings, 'BLOCKCHAIN_POLL_INTERVAL', 1.0),
+                            help="Seconds to wait for new blocks when following")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                result = sync(max_blocks=options['max_blocks'])
+            except (BlockchainConnectionError, SmartContractError) as e:
+                if not options['follow']:
+                    raise CommandError(str(e))
+                self.stderr.write(f"Indexing failed, retrying: {str(e)}")
+                time.sleep(options['interval'])
+                continue
+
+            if result is not None:
+                from_block, to_block, count = result
+                self.stdout.write(f"Blocks {from_block}-{to_block}: {count} events")
+                continue
+            if not options['follow']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS("Chain index is up to date"))
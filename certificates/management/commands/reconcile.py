@@ -0,0 +1,67 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates.blockchain import BlockchainConnectionError, SmartContractError
+from certificates.reconciliation import FIELD_MISMATCH, MISSING_ON_CHAIN, REVOKED_MISMATCH, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Check every confirmed certificate against its record on chain and write the "
+        "missing, revoked-mismatch and field-mismatch rows to a JSON lines report"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report', default='reconcile-report.jsonl',
+                            help="Discrepancy report, appended to when resuming an interrupted run")
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Rows read from the database and checkpointed together")
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help="Certificates read per JSON-RPC batch request")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Batch requests in flight at once")
+        parser.add_argument('--rate', type=float, default=None,
+                            help="Most contract calls per second (default: unlimited)")
+        parser.add_argument('--restart', action='store_true',
+                            help="Ignore the checkpoint left by an interrupted run and start a new report")
+
+    def handle(self, *args, **options):
+        for option in ('chunk_size', 'batch_size', 'workers'):
+            if options[option] < 1:
+                raise CommandError("--chunk-size, --batch-size and --workers must be positive")
+        if options['rate'] is not None and options['rate'] <= 0:
+            raise CommandError("--rate must be positive")
+
+        checked = 0
+        found = Counter()
+        start = time.monotonic()
+        chunks = reconcile(
+            options['report'], chunk_size=options['chunk_size'], batch_size=options['batch_size'],
+            workers=options['workers'], rate=options['rate'], restart=options['restart'],
+        )
+        try:
+            for first_id, last_id, chunk_checked, counts in chunks:
+                checked += chunk_checked
+                found.update(counts)
+                rate = checked / max(time.monotonic() - start, 1e-9)
+                self.stdout.write(
+                    f"Rows {first_id}-{last_id}: {chunk_checked} checked, {sum(counts.values())} discrepancies "
+                    f"({checked} so far, {rate:,.0f} rows/s)"
+                )
+        except (BlockchainConnectionError, SmartContractError) as e:
+            raise CommandError(
+                f"Could not read the chain, stopping after {checked} rows: {str(e)}. "
+                "Run the command again to resume."
+            )
+
+        summary = (
+            f"{checked} certificates checked in {time.monotonic() - start:.1f}s: "
+            f"{found[MISSING_ON_CHAIN]} missing on chain, {found[REVOKED_MISMATCH]} revoked mismatches, "
+            f"{found[FIELD_MISMATCH]} field mismatches"
+        )
+        if found:
+            self.stdout.write(self.style.WARNING(f"{summary}. Details in {options['report']}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from certificates.rehashing import rehash
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every certificate hash the way the contract does, in committed "
+        "chunks that a later run resumes from if this one is interrupted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Rows read, hashed and written per transaction")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Hashing processes (default: one per CPU)")
+        parser.add_argument('--restart', action='store_true',
+                            help="Ignore the checkpoint left by an interrupted run and start from the first row")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Report how many hashes would change without writing anything")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1 or (options['workers'] is not None and options['workers'] < 1):
+            raise CommandError("--chunk-size and --workers must be positive")
+
+        scanned = changed = skipped = 0
+        start = time.monotonic()
+        chunks = rehash(
+            chunk_size=options['chunk_size'], workers=options['workers'],
+            restart=options['restart'], dry_run=options['dry_run'],
+        )
+        try:
+            for first_id, last_id, chunk_scanned, chunk_changed, chunk_skipped in chunks:
+                scanned += chunk_scanned
+                changed += chunk_changed
+                skipped += chunk_skipped
+                rate = scanned / max(time.monotonic() - start, 1e-9)
+                self.stdout.write(
+                    f"Rows {first_id}-{last_id}: {chunk_scanned} scanned, {chunk_changed} changed "
+                    f"({scanned} so far, {rate:,.0f} rows/s)"
+                )
+        except IntegrityError as e:
+            raise CommandError(
+                f"Two certificates would share a hash, stopping after {scanned} rows: {str(e)}. "
+                "Fix the duplicate and run the command again to resume."
+            )
+
+        elapsed = time.monotonic() - start
+        verb = "would change" if options['dry_run'] else "changed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{scanned} certificates scanned, {changed} hashes {verb} in {elapsed:.1f}s "
+            f"({scanned / max(elapsed, 1e-9):,.0f} rows/s)"
+        ))
+        if changed and not options['dry_run']:
+            self.stdout.write(
+                "Running servers rebuild their Bloom filters on their next refresh "
+                "(CERTIFICATE_BLOOM_FILTER['REFRESH_INTERVAL']); no restart is needed."
+            )
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f"{skipped} certificates anchored in Merkle batches have stale hashes but were "
+                "left unchanged: their proofs and the batch roots on chain commit to the old "
+                "hashes. Issue them again to give them new ones."
+            ))
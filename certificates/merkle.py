@@ -0,0 +1,53 @@
+# certificates/merkle.py
+
+from web3 import Web3
+
+
+def _to_bytes32(value):
+    if isinstance(value, str):
+        return Web3.to_bytes(hexstr=value)
+    return bytes(value)
+
+def hash_pair(a, b):
+    """Hash two nodes in sorted order, as OpenZeppelin's MerkleProof does"""
+    if a > b:
+        a, b = b, a
+    return Web3.keccak(a + b)
+
+def build_tree(leaves):
+    """Build a Merkle tree over bytes32 leaves.
+
+    Returns the list of levels, leaves first and the root last. An odd node
+    at the end of a level is carried up unchanged.
+    """
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    levels = [[_to_bytes32(leaf) for leaf in leaves]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+def merkle_root(levels):
+    return levels[-1][0]
+
+def merkle_proof(levels, index):
+    """Return the sibling hashes needed to prove the leaf at ``index``"""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+def verify_proof(leaf, proof, root):
+    """Check that ``leaf`` is included in the tree with the given ``root``"""
+    node = _to_bytes32(leaf)
+    for sibling in proof:
+        node = hash_pair(node, _to_bytes32(sibling))
+    return node == _to_bytes32(root)
@@ -0,0 +1,319 @@
+# certificates/metrics.py
+
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+# Upper bounds (seconds) shared by every latency histogram: sub-millisecond
+# cache hits up to RPC calls waiting out their timeout
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120,
+)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Yield (suffix, label pairs, value) for every series"""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        for suffix, labels, value in self.samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, one series per label combination"""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield '_total', list(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}  # label values -> [bucket counts, sum]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the block takes, whether or not it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in series:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield '_bucket', labels + [('le', _format_value(float(bound)))], cumulative
+            yield '_sum', labels, total
+            yield '_count', labels, cumulative
+
+
+class CallbackMetric(_Metric):
+    """Values read from elsewhere (caches, signer pool) each time metrics are scraped.
+
+    ``callback()`` returns a list of (labels dict, value) pairs.
+    """
+
+    def __init__(self, name, documentation, callback, type='gauge'):
+        super().__init__(name, documentation)
+        self.type = type
+        self.callback = callback
+
+    def samples(self):
+        suffix = '_total' if self.type == 'counter' else ''
+        for labels, value in self.callback():
+            if value is not None:
+                yield suffix, sorted(labels.items()), value
+
+
+def render():
+    """Every registered metric in the Prometheus text exposition format"""
+    with _registry_lock:
+        metrics = list(_registry)
+    return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REQUEST_DURATION = Histogram(
+    'certificate_http_request_duration_seconds',
+    'Time to handle a request, by URL name and method.',
+    ('view', 'method'),
+)
+REQUESTS = Counter(
+    'certificate_http_requests',
+    'Requests handled, by URL name, method and response status.',
+    ('view', 'method', 'status'),
+)
+DB_QUERY_DURATION = Histogram(
+    'certificate_db_query_duration_seconds',
+    'Time per database query made while handling a request, by URL name.',
+    ('view',),
+)
+CONTRACT_CALL_DURATION = Histogram(
+    'certificate_contract_call_duration_seconds',
+    'Time per contract call: eth_call reads, batched reads and transaction submissions.',
+    ('function', 'kind'),
+)
+CONTRACT_CALL_ERRORS = Counter(
+    'certificate_contract_call_errors',
+    'Contract calls that raised, by function and kind.',
+    ('function', 'kind'),
+)
+RECEIPT_WAIT_DURATION = Histogram(
+    'certificate_receipt_wait_duration_seconds',
+    'Time from submitting a transaction until its receipt was seen (or the wait timed out).',
+    ('outcome',),
+)
+
+
+@contextmanager
+def time_contract_call(function, kind):
+    """Time one contract call and count it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        CONTRACT_CALL_ERRORS.inc(function=function, kind=kind)
+        raise
+    finally:
+        CONTRACT_CALL_DURATION.observe(time.perf_counter() - start, function=function, kind=kind)
+
+
+# Durations of the queries made for the request being handled. A context
+# variable rather than a per-request execute_wrapper, because async views
+# run their queries on other threads (asgiref copies the context there).
+_query_durations = contextvars.ContextVar('certificates_query_durations', default=None)
+
+def _time_query(execute, sql, params, many, context):
+    durations = _query_durations.get()
+    if durations is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        durations.append(time.perf_counter() - start)
+
+def _install_query_timer(sender, connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+connection_created.connect(_install_query_timer)
+
+
+class MetricsMiddleware:
+    """Record request latency, status and database queries per URL name"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            # Keeps async views off the sync thread Django would otherwise
+            # run this middleware (and so every request) on
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self._acall(request)
+        # Connections opened before this module was imported
+        _install_query_timer(None, connection)
+        query_durations = []
+        token = _query_durations.set(query_durations)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_durations.reset(token)
+        self._record(request, response, time.perf_counter() - start, query_durations)
+        return response
+
+    async def _acall(self, request):
+        query_durations = []
+        token = _query_durations.set(query_durations)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_durations.reset(token)
+        self._record(request, response, time.perf_counter() - start, query_durations)
+        return response
+
+    def _record(self, request, response, duration, query_durations):
+        match = getattr(request, 'resolver_match', None)
+        view = match.url_name if match is not None and match.url_name else 'unmatched'
+        REQUEST_DURATION.observe(duration, view=view, method=request.method)
+        REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        if getattr(response, 'streaming', False):
+            # A streamed body is generated after this middleware returns;
+            # its queries are counted once it has been sent
+            if response.is_async:
+                response.streaming_content = _atimed_stream(response.streaming_content, query_durations, view)
+            else:
+                response.streaming_content = _timed_stream(response.streaming_content, query_durations, view)
+            return
+        _observe_queries(query_durations, view)
+
+
+def _observe_queries(query_durations, view):
+    for query_duration in query_durations:
+        DB_QUERY_DURATION.observe(query_duration, view=view)
+
+def _timed_stream(content, query_durations, view):
+    # The variable is only set while the next chunk is produced, since the
+    # server may do other work in this context between chunks
+    iterator = iter(content)
+    try:
+        while True:
+            token = _query_durations.set(query_durations)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _query_durations.reset(token)
+            yield chunk
+    finally:
+        _observe_queries(query_durations, view)
+
+async def _atimed_stream(content, query_durations, view):
+    iterator = aiter(content)
+    try:
+        while True:
+            token = _query_durations.set(query_durations)
+            try:
+                chunk = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            finally:
+                _query_durations.reset(token)
+            yield chunk
+    finally:
+        _observe_queries(query_durations, view)
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0003_certificate_is_revoked'),
+    ]
+
+    operations = [
+        # Certificates issued before this migration were mined synchronously,
+        # so existing rows are backfilled as confirmed.
+        migrations.AddField(
+            model_name='certificate',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], default='confirmed', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='certificate',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], default='pending', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='transaction_hash',
+            field=models.CharField(blank=True, max_length=66, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='block_number',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='failure_reason',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
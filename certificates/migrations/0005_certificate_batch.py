@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0004_certificate_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('merkle_root', models.CharField(max_length=66, unique=True)),
+                ('size', models.PositiveIntegerField()),
+                ('anchored_at', models.BigIntegerField()),
+                ('anchor_hash', models.CharField(blank=True, max_length=66, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('transaction_hash', models.CharField(blank=True, max_length=66, null=True)),
+                ('block_number', models.BigIntegerField(blank=True, null=True)),
+                ('failure_reason', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='merkle_proof',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='certificates', to='certificates.certificatebatch'),
+        ),
+    ]
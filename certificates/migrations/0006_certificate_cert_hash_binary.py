@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:10
+
+import certificates.fields
+from django.db import migrations, models
+
+
+def hex_to_binary(apps, schema_editor):
+    Certificate = apps.get_model('certificates', 'Certificate')
+    batch = []
+    for certificate in Certificate.objects.only('id', 'cert_hash').iterator(chunk_size=2000):
+        certificate.cert_hash_bin = certificates.fields.hash_to_bytes(certificate.cert_hash)
+        batch.append(certificate)
+        if len(batch) == 2000:
+            Certificate.objects.bulk_update(batch, ['cert_hash_bin'])
+            batch = []
+    Certificate.objects.bulk_update(batch, ['cert_hash_bin'])
+
+
+def binary_to_hex(apps, schema_editor):
+    Certificate = apps.get_model('certificates', 'Certificate')
+    batch = []
+    for certificate in Certificate.objects.only('id', 'cert_hash_bin').iterator(chunk_size=2000):
+        certificate.cert_hash = certificates.fields.hash_to_hex(certificate.cert_hash_bin)
+        batch.append(certificate)
+        if len(batch) == 2000:
+            Certificate.objects.bulk_update(batch, ['cert_hash'])
+            batch = []
+    Certificate.objects.bulk_update(batch, ['cert_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0005_certificate_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='cert_hash_bin',
+            field=certificates.fields.Bytes32Field(null=True),
+        ),
+        # Nullable while both columns exist, so the migration can be reversed
+        migrations.AlterField(
+            model_name='certificate',
+            name='cert_hash',
+            field=models.CharField(max_length=66, null=True, unique=True),
+        ),
+        migrations.RunPython(hex_to_binary, binary_to_hex),
+        migrations.RemoveField(
+            model_name='certificate',
+            name='cert_hash',
+        ),
+        migrations.RenameField(
+            model_name='certificate',
+            old_name='cert_hash_bin',
+            new_name='cert_hash',
+        ),
+        migrations.AlterField(
+            model_name='certificate',
+            name='cert_hash',
+            field=certificates.fields.Bytes32Field(unique=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:20
+
+import certificates.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0006_certificate_cert_hash_binary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChainCertificate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cert_hash', certificates.fields.Bytes32Field(unique=True)),
+                ('student_name', models.CharField(blank=True, default='', max_length=200)),
+                ('course', models.CharField(blank=True, default='', max_length=200)),
+                ('institution', models.CharField(blank=True, default='', max_length=200)),
+                ('issue_date', models.BigIntegerField(blank=True, null=True)),
+                ('issued_block', models.BigIntegerField(blank=True, null=True)),
+                ('issued_transaction', models.CharField(blank=True, max_length=66, null=True)),
+                ('is_revoked', models.BooleanField(default=False)),
+                ('revoked_block', models.BigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SyncCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('block_number', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
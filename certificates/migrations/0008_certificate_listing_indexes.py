@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0007_chain_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['issue_date', 'id'], name='cert_issue_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['institution', 'issue_date', 'id'], name='cert_institution_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['course', 'issue_date', 'id'], name='cert_course_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['is_revoked', 'issue_date', 'id'], name='cert_revoked_date_idx'),
+        ),
+    ]
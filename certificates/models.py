@@ -1,14 +1,128 @@
 from django.db import models
 
+from .fields import Bytes32Field, hash_to_hex
+
+# Leading hash bytes matched when a verification hash has no exact match
+FUZZY_MATCH_PREFIX_BYTES = 9
+
+class CertificateQuerySet(models.QuerySet):
+    def with_hash_prefix(self, prefix):
+        """Certificates whose hash starts with the hex digits in ``prefix``.
+
+        Expressed as a range on cert_hash so the lookup is served by the
+        unique index instead of a table scan: every 32-byte hash with the
+        prefix lies between the prefix padded with 0s and padded with fs.
+        """
+        digits = prefix[2:] if prefix[:2].lower() == '0x' else prefix
+        digits = digits.lower()
+        if len(digits) > 64 or any(c not in '0123456789abcdef' for c in digits):
+            return self.none()
+        return self.filter(
+            cert_hash__gte=bytes.fromhex(digits.ljust(64, '0')),
+            cert_hash__lte=bytes.fromhex(digits.ljust(64, 'f')),
+        )
+
 class Certificate(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_CONFIRMED = 'confirmed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_CONFIRMED, 'Confirmed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     student_name = models.CharField(max_length=200)
     course = models.CharField(max_length=200)
     institution = models.CharField(max_length=200)
     issue_date = models.DateTimeField()
-    cert_hash = models.CharField(max_length=66, unique=True)
+    # Raw 32-byte keccak digest; API input and output use 0x hex
+    cert_hash = Bytes32Field(unique=True)
     ipfs_hash = models.CharField(max_length=64, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_revoked = models.BooleanField(default=False)
+    # On-chain issuance state, filled in by the background confirmation worker
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    transaction_hash = models.CharField(max_length=66, null=True, blank=True)
+    block_number = models.BigIntegerField(null=True, blank=True)
+    failure_reason = models.TextField(null=True, blank=True)
+    # Set when the certificate was anchored as part of a Merkle batch
+    batch = models.ForeignKey('CertificateBatch', null=True, blank=True, on_delete=models.PROTECT, related_name='certificates')
+    merkle_proof = models.JSONField(null=True, blank=True)
+
+    objects = CertificateQuerySet.as_manager()
+
+    class Meta:
+        # Keyset pagination for GET /api/certificates/ walks (issue_date, id);
+        # each filter the listing accepts leads one of these so a page is a
+        # single index range scan however deep it is
+        indexes = [
+            models.Index(fields=['issue_date', 'id'], name='cert_issue_date_idx'),
+            models.Index(fields=['institution', 'issue_date', 'id'], name='cert_institution_date_idx'),
+            models.Index(fields=['course', 'issue_date', 'id'], name='cert_course_date_idx'),
+            models.Index(fields=['is_revoked', 'issue_date', 'id'], name='cert_revoked_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_name} - {self.course} ({hash_to_hex(self.cert_hash)})"
+
+class CertificateBatch(models.Model):
+    """A group of certificates committed on chain as a single Merkle root"""
+    merkle_root = models.CharField(max_length=66, unique=True)
+    size = models.PositiveIntegerField()
+    anchored_at = models.BigIntegerField()
+    anchor_hash = models.CharField(max_length=66, null=True, blank=True)
+    status = models.CharField(max_length=16, choices=Certificate.STATUS_CHOICES, default=Certificate.STATUS_PENDING)
+    transaction_hash = models.CharField(max_length=66, null=True, blank=True)
+    block_number = models.BigIntegerField(null=True, blank=True)
+    failure_reason = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Batch {self.pk} ({self.size} certificates, root {self.merkle_root})"
+
+class ChainCertificate(models.Model):
+    """Local mirror of a certificate as recorded by the contract's events.
+
+    Kept up to date by ``manage.py index_chain``; lets verification be
+    answered without a live contract call.
+    """
+    cert_hash = Bytes32Field(unique=True)
+    student_name = models.CharField(max_length=200, blank=True, default='')
+    course = models.CharField(max_length=200, blank=True, default='')
+    institution = models.CharField(max_length=200, blank=True, default='')
+    issue_date = models.BigIntegerField(null=True, blank=True)
+    issued_block = models.BigIntegerField(null=True, blank=True)
+    issued_transaction = models.CharField(max_length=66, null=True, blank=True)
+    is_revoked = models.BooleanField(default=False)
+    revoked_block = models.BigIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def as_chain_result(self):
+        """The row in the shape returned by the contract's verifyCertificate.
+
+        Only complete once the issue event has been indexed.
+        """
+        return [
+            self.issued_block is not None and not self.is_revoked,
+            self.student_name,
+            self.course,
+            self.institution,
+            self.issue_date or 0,
+        ]
+
+    def __str__(self):
+        return f"{hash_to_hex(self.cert_hash)} (block {self.issued_block})"
+
+class SyncCheckpoint(models.Model):
+    """Progress of a resumable background job: the last block processed by a
+    chain follower, or the last certificate id handled by rehash_certificates
+    or reconcile. The 'revocations' and 'certificate-hashes' rows are
+    counters instead, bumped on every revocation and every bulk rewrite of
+    stored hashes."""
+    name = models.CharField(max_length=100, unique=True)
+    block_number = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.student_name} - {self.course} ({self.cert_hash})"
+        return f"{self.name} @ {self.block_number}"
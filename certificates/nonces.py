@@ -0,0 +1,92 @@
+# certificates/nonces.py
+
+import os
+import threading
+
+# Node error messages meaning the nonce we sent is already taken, either by
+# one of our own transactions or by one sent from elsewhere with this account
+NONCE_ERRORS = (
+    'nonce too low',
+    'already known',
+    'known transaction',
+    'nonce has already been used',
+    'replacement transaction underpriced',
+    "the tx doesn't have the correct nonce",
+)
+
+def is_nonce_error(error):
+    """Return True if a send failed because its nonce was already used"""
+    message = str(error).lower()
+    return any(text in message for text in NONCE_ERRORS)
+
+
+class NonceManager:
+    """Assigns transaction nonces for one sender locally.
+
+    Nonces come from a counter seeded from the node's pending transaction
+    count, so concurrent submissions no longer wait on each other or race
+    for the same nonce. A nonce whose send failed is handed out again before
+    new ones, closing the gap it would otherwise leave. When the node reports
+    a nonce as taken (another process or a replacement used it) the counter
+    is re-read from the node. A forked child re-reads it on first use.
+    """
+
+    def __init__(self, web3_instance, address):
+        self.web3 = web3_instance
+        self.address = address
+        self._lock = threading.Lock()
+        self._pid = None
+        self._next = None
+        self._released = set()
+
+    def _sync(self):
+        self._next = self.web3.eth.get_transaction_count(self.address, 'pending')
+        self._released.clear()
+        self._pid = os.getpid()
+
+    def allocate(self):
+        """Reserve the next nonce to use"""
+        with self._lock:
+            if self._next is None or self._pid != os.getpid():
+                self._sync()
+            if self._released:
+                nonce = min(self._released)
+                self._released.discard(nonce)
+                return nonce
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def release(self, nonce):
+        """Return a nonce whose transaction was never accepted by the node"""
+        with self._lock:
+            if self._next is None or self._pid != os.getpid():
+                return
+            if nonce == self._next - 1:
+                self._next -= 1
+            elif nonce < self._next:
+                self._released.add(nonce)
+
+    def resync(self):
+        """Discard local state and re-read the pending nonce from the node"""
+        with self._lock:
+            self._sync()
+
+    def send(self, submit):
+        """Submit a transaction with a locally assigned nonce.
+
+        ``submit(nonce)`` sends the transaction and returns its hash. It is
+        retried once with a fresh nonce if the node says ours was taken.
+        """
+        for attempt in range(2):
+            nonce = self.allocate()
+            try:
+                return submit(nonce)
+            except Exception as e:
+                if is_nonce_error(e):
+                    self.resync()
+                    if attempt == 0:
+                        continue
+                else:
+                    self.release(nonce)
+                raise
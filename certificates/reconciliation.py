@@ -0,0 +1,135 @@
+# certificates/reconciliation.py
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .blockchain import read_certificates_on_chain
+from .fields import hash_to_hex
+from .models import Certificate, SyncCheckpoint
+
+# SyncCheckpoint row holding the id of the last certificate reconciled
+CHECKPOINT_NAME = 'reconcile-certificates'
+
+MISSING_ON_CHAIN = 'missing_on_chain'
+REVOKED_MISMATCH = 'revoked_mismatch'
+FIELD_MISMATCH = 'field_mismatch'
+
+FIELDS = ('student_name', 'course', 'institution', 'issue_date')
+
+
+class RateLimiter:
+    """Spaces out contract calls so no more than ``rate`` start per second,
+    across all threads. A rate of None doesn't limit anything."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, calls=1):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + calls * self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def reconciled_certificates():
+    """Certificates that should each have their own record on chain.
+
+    Batched certificates are anchored as a Merkle root rather than one by
+    one, and pending or failed ones aren't on chain yet.
+    """
+    return Certificate.objects.filter(status=Certificate.STATUS_CONFIRMED, batch__isnull=True)
+
+def _read_chunk(after_id, chunk_size):
+    """The next ``chunk_size`` certificates after ``after_id``, in id order (keyset pagination)"""
+    return list(
+        reconciled_certificates().filter(id__gt=after_id).order_by('id').values_list(
+            'id', 'student_name', 'course', 'institution', 'issue_date', 'is_revoked', 'cert_hash'
+        )[:chunk_size]
+    )
+
+def compare(row, on_chain):
+    """The discrepancies between a database row and the contract's record (a list, empty if none)"""
+    pk, student_name, course, institution, issue_date, is_revoked, cert_hash = row
+    found = {'id': pk, 'cert_hash': hash_to_hex(cert_hash)}
+    chain_name, chain_course, chain_institution, chain_issue_date, is_valid = on_chain
+    # The contract returns an all-zero record for a hash it doesn't hold; an
+    # issue date of 0 on its own is a valid timestamp
+    if not any(on_chain):
+        return [{**found, 'issue': MISSING_ON_CHAIN}]
+
+    stored = (student_name, course, institution, int(issue_date.timestamp()))
+    mismatched = {
+        field: [db_value, chain_value]
+        for field, db_value, chain_value in zip(
+            FIELDS, stored, (chain_name, chain_course, chain_institution, chain_issue_date)
+        )
+        if db_value != chain_value
+    }
+    discrepancies = []
+    if mismatched:
+        discrepancies.append({**found, 'issue': FIELD_MISMATCH, 'fields': mismatched})
+    if is_revoked == is_valid:
+        discrepancies.append({**found, 'issue': REVOKED_MISMATCH, 'db_revoked': is_revoked, 'chain_valid': is_valid})
+    return discrepancies
+
+def _read_batch(limiter, cert_hashes):
+    limiter.acquire(len(cert_hashes))
+    results = read_certificates_on_chain(cert_hashes)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+def reconcile(report_path, chunk_size=1000, batch_size=50, workers=4, rate=None, restart=False):
+    """Check every confirmed certificate against the contract's record.
+
+    Rows are read in id order, ``chunk_size`` at a time; each chunk is read
+    from the chain as JSON-RPC batches of ``batch_size`` hashes on
+    ``workers`` threads, at no more than ``rate`` contract calls per second.
+    Discrepancies are written to ``report_path`` as JSON lines, one per
+    discrepancy (a row can have two), and the checkpoint advanced once they are flushed, so an interrupted run
+    resumes after the last finished chunk and appends to the same report;
+    ``restart`` starts over with a new report. Yields (first id, last id,
+    rows checked, {issue: count}) per chunk.
+
+    Raises BlockchainConnectionError or SmartContractError if the chain
+    can't be read; the checkpoint is left where it was.
+    """
+    checkpoint = SyncCheckpoint.objects.filter(name=CHECKPOINT_NAME).first()
+    if checkpoint is not None and restart:
+        checkpoint.delete()
+        checkpoint = None
+    last_id = checkpoint.block_number if checkpoint is not None else 0
+
+    limiter = RateLimiter(rate)
+    with open(report_path, 'a' if checkpoint is not None else 'w') as report, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        rows = _read_chunk(last_id, chunk_size)
+        while rows:
+            futures = [
+                pool.submit(_read_batch, limiter, [bytes(row[6]) for row in rows[i:i + batch_size]])
+                for i in range(0, len(rows), batch_size)
+            ]
+            next_rows = _read_chunk(rows[-1][0], chunk_size)
+            on_chain = [record for future in futures for record in future.result()]
+
+            counts = {}
+            for row, record in zip(rows, on_chain):
+                for discrepancy in compare(row, record):
+                    report.write(json.dumps(discrepancy) + '\n')
+                    counts[discrepancy['issue']] = counts.get(discrepancy['issue'], 0) + 1
+            report.flush()
+            SyncCheckpoint.objects.update_or_create(name=CHECKPOINT_NAME, defaults={'block_number': rows[-1][0]})
+            yield rows[0][0], rows[-1][0], len(rows), counts
+            rows = next_rows
+
+    # A finished run has nothing to resume; the next one starts over
+    SyncCheckpoint.objects.filter(name=CHECKPOINT_NAME).delete()
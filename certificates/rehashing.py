@@ -0,0 +1,97 @@
+# certificates/rehashing.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.db import transaction
+
+from .bloom import get_hash_shield, record_hash_change
+from .cache import get_verification_cache
+from .hashing import certificate_hashes
+from .models import Certificate, SyncCheckpoint
+from .revocations import record_revocation
+
+# SyncCheckpoint row holding the id of the last certificate re-hashed
+CHECKPOINT_NAME = 'rehash-certificates'
+
+def _read_chunk(after_id, chunk_size):
+    """The next ``chunk_size`` certificates after ``after_id``, in id order.
+
+    Keyset pagination: each chunk is an index range scan on the primary key,
+    however far into the table the run is.
+    """
+    return list(
+        Certificate.objects.filter(id__gt=after_id).order_by('id').values_list(
+            'id', 'student_name', 'course', 'institution', 'issue_date', 'cert_hash', 'batch_id', 'is_revoked'
+        )[:chunk_size]
+    )
+
+def _split(items, parts):
+    size = -(-len(items) // parts)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _executor(workers):
+    # A single worker still gets a thread, so hashing overlaps the next read
+    if workers <= 1:
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers)
+
+def rehash(chunk_size=1000, workers=None, restart=False, dry_run=False):
+    """Recompute every certificate's hash the way the contract does.
+
+    Rows are read in id order, ``chunk_size`` at a time, and hashed on
+    ``workers`` processes (default: one per CPU) while the next chunk is
+    read. Each chunk's changed hashes are written with one bulk update and
+    the checkpoint advanced in the same transaction, so an interrupted run
+    resumes after the last committed chunk; ``restart`` discards the
+    checkpoint. With ``dry_run`` nothing is written.
+
+    The bulk update sends no post_save, so the Bloom filter's and (for
+    revoked rows) the revocation set's version stamps are bumped instead,
+    and every process reloads them on its next refresh. Certificates
+    anchored in a Merkle batch are left alone: their stored proof and the
+    root on chain commit to the old hash. Yields (first id, last id, rows
+    scanned, rows changed, batched rows skipped) per chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint = SyncCheckpoint.objects.filter(name=CHECKPOINT_NAME).first()
+    if checkpoint is not None and restart and not dry_run:
+        checkpoint.delete()
+        checkpoint = None
+    last_id = checkpoint.block_number if checkpoint is not None and not restart else 0
+
+    cache = get_verification_cache()
+    with _executor(workers) as pool:
+        rows = _read_chunk(last_id, chunk_size)
+        while rows:
+            fields = [(name, course, institution, int(issue_date.timestamp()))
+                      for _, name, course, institution, issue_date, *_ in rows]
+            futures = [pool.submit(certificate_hashes, part) for part in _split(fields, workers)]
+            next_rows = _read_chunk(rows[-1][0], chunk_size)
+            digests = [digest for future in futures for digest in future.result()]
+
+            stale = [(row, digest) for row, digest in zip(rows, digests) if bytes(row[5]) != digest]
+            changed = [(row[0], bytes(row[5]), digest, row[7]) for row, digest in stale if row[6] is None]
+            skipped = len(stale) - len(changed)
+            if not dry_run:
+                with transaction.atomic():
+                    Certificate.objects.bulk_update(
+                        [Certificate(id=pk, cert_hash=digest) for pk, _, digest, _ in changed], ['cert_hash']
+                    )
+                    if changed:
+                        record_hash_change()
+                    if any(is_revoked for *_, is_revoked in changed):
+                        record_revocation()
+                    SyncCheckpoint.objects.update_or_create(
+                        name=CHECKPOINT_NAME, defaults={'block_number': rows[-1][0]}
+                    )
+                shield = get_hash_shield()
+                for _, old_hash, digest, _ in changed:
+                    cache.invalidate(old_hash)
+                    shield.add(digest)
+            yield rows[0][0], rows[-1][0], len(rows), len(changed), skipped
+            rows = next_rows
+
+    if not dry_run:
+        # A finished run has nothing to resume; the next one starts over
+        SyncCheckpoint.objects.filter(name=CHECKPOINT_NAME).delete()
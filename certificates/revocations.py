@@ -0,0 +1,115 @@
+# certificates/revocations.py
+
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .fields import hash_to_bytes
+from .models import Certificate, ChainCertificate, SyncCheckpoint
+
+# SyncCheckpoint row counting revocations; its value is the set's version stamp
+VERSION_NAME = 'revocations'
+
+
+def record_revocation():
+    """Bump the version stamp after storing a revocation.
+
+    Call it once the revoked row is saved (in the same transaction if there
+    is one), so a process that sees the new stamp also sees the row.
+    """
+    with transaction.atomic():
+        _, created = SyncCheckpoint.objects.get_or_create(name=VERSION_NAME, defaults={'block_number': 1})
+        if not created:
+            SyncCheckpoint.objects.filter(name=VERSION_NAME).update(block_number=F('block_number') + 1)
+
+
+class RevocationSet:
+    """In-process set of revoked certificate hashes.
+
+    Reads are a lookup in a frozenset of 32-byte digests and never touch the
+    database; updates replace the set, so readers need no lock. Every
+    revocation bumps a counter row (``record_revocation``), and every
+    ``refresh_interval`` seconds one primary-key lookup of that row tells
+    whether another process revoked something and the set needs reloading.
+    """
+
+    def __init__(self, refresh_interval=5):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._hashes = None
+        self._checked_at = None
+        self.version = 0
+
+    @staticmethod
+    def _revoked_querysets():
+        return (
+            Certificate.objects.filter(is_revoked=True),
+            ChainCertificate.objects.filter(is_revoked=True),
+        )
+
+    @staticmethod
+    def _stored_version():
+        return SyncCheckpoint.objects.filter(name=VERSION_NAME).values_list('block_number', flat=True).first() or 0
+
+    def load(self):
+        """(Re)load every revoked hash from the certificates table and the chain index"""
+        # Read the stamp first: rows are saved before the stamp is bumped, so
+        # every revocation it counts is in the hashes read after it
+        version = self._stored_version()
+        hashes = set()
+        for queryset in self._revoked_querysets():
+            hashes.update(bytes(h) for h in queryset.values_list('cert_hash', flat=True))
+        with self._lock:
+            # Readers don't take the lock; _hashes is what marks the set as
+            # loaded, so it is assigned last
+            self.version = version
+            self._checked_at = time.monotonic()
+            self._hashes = frozenset(hashes)
+
+    def refresh_due(self):
+        """Whether the next lookup queries the database before answering"""
+        return self._hashes is None or time.monotonic() - self._checked_at >= self.refresh_interval
+
+    def _refresh(self):
+        if self._hashes is None:
+            self.load()
+            return
+        if time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = time.monotonic()
+        if self._stored_version() != self.version:
+            self.load()
+
+    def __contains__(self, cert_hash):
+        self._refresh()
+        return hash_to_bytes(cert_hash) in self._hashes
+
+    def add(self, cert_hash):
+        """Record a revocation made by this process, without waiting for a
+        refresh; the stamp it bumped still reloads the set once"""
+        if self._hashes is None:
+            self.load()
+            return
+        cert_hash = hash_to_bytes(cert_hash)
+        with self._lock:
+            if cert_hash not in self._hashes:
+                self._hashes = self._hashes | {cert_hash}
+
+    def __len__(self):
+        self._refresh()
+        return len(self._hashes)
+
+
+_revocation_set = None
+
+def get_revocation_set():
+    """Return the process-wide revocation set, loading it on first use"""
+    global _revocation_set
+    if _revocation_set is None:
+        _revocation_set = RevocationSet(
+            refresh_interval=getattr(settings, 'CERTIFICATE_REVOCATION_REFRESH_INTERVAL', 5)
+        )
+    return _revocation_set
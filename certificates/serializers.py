@@ -1,9 +1,12 @@
 # certificates/serializers.py
 from rest_framework import serializers
 from .models import Certificate
+from .fields import HexHashField
 import time
 
 class CertificateSerializer(serializers.ModelSerializer):
+    # Stored as raw bytes, exposed as 0x hex
+    cert_hash = HexHashField(read_only=True)
     # Add a serialized timestamp field for issue_date
     issue_date_timestamp = serializers.SerializerMethodField()
     
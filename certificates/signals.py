@@ -0,0 +1,17 @@
+# certificates/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .bloom import get_hash_shield
+from .models import Certificate
+
+
+@receiver(post_save, sender=Certificate)
+def add_to_hash_shield(sender, instance, **kwargs):
+    """Make a stored certificate's hash visible to the Bloom filter at once.
+
+    Done on every save, not just the first: a hash changed in place must be
+    added too, and adding one already there is harmless.
+    """
+    get_hash_shield().add(instance.cert_hash)
@@ -0,0 +1,164 @@
+# certificates/signers.py
+
+import logging
+import threading
+import time
+
+from .nonces import NonceManager
+
+logger = logging.getLogger(__name__)
+
+
+class NoSignerAvailable(Exception):
+    """Raised when no signer account can take another transaction"""
+    pass
+
+
+class Signer:
+    """One sending account, its nonce sequence and its counters.
+
+    ``account`` is either the address of an account unlocked on the node,
+    or an eth_account LocalAccount whose transactions are signed here.
+    """
+
+    def __init__(self, web3_instance, account, factory=None):
+        if isinstance(account, str):
+            self.address = account
+            self.local_account = None
+        else:
+            self.address = account.address
+            self.local_account = account
+        self.factory = factory
+        self.nonces = NonceManager(web3_instance, self.address)
+        self.in_flight = 0
+        self.submitted = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.balance = None
+        self.balance_checked_at = None
+
+    def send(self, function_call):
+        """Submit a contract call from this account and return the transaction hash"""
+        if self.local_account is None:
+            return self.nonces.send(
+                lambda nonce: function_call.transact({'from': self.address, 'nonce': nonce})
+            )
+        return self.nonces.send(
+            lambda nonce: self.factory.send(function_call, self.local_account, nonce)
+        )
+
+    def stats(self, min_balance):
+        return {
+            'address': self.address,
+            'signing': 'node' if self.local_account is None else 'local',
+            'healthy': self.balance is None or self.balance >= min_balance,
+            'balance': self.balance,
+            'in_flight': self.in_flight,
+            'submitted': self.submitted,
+            'confirmed': self.confirmed,
+            'failed': self.failed,
+        }
+
+
+class SignerPool:
+    """Spreads transactions across several sending accounts.
+
+    Accounts are picked round-robin, skipping any that already have
+    ``max_in_flight`` unconfirmed transactions or whose balance is below
+    ``min_balance`` wei. Balances are re-read every
+    ``balance_check_interval`` seconds, and straight away after a send fails
+    for lack of funds. Each account keeps its own nonce sequence, so write
+    throughput grows with the number of accounts. Accounts given as
+    LocalAccounts are signed with ``factory`` (a TransactionFactory).
+    """
+
+    def __init__(self, web3_instance, accounts, max_in_flight=16, min_balance=0,
+                 balance_check_interval=60, factory=None):
+        if not accounts:
+            raise ValueError("At least one signer account is required")
+        self.web3 = web3_instance
+        self.signers = [Signer(web3_instance, account, factory=factory) for account in accounts]
+        self.max_in_flight = max_in_flight
+        self.min_balance = min_balance
+        self.balance_check_interval = balance_check_interval
+        self._condition = threading.Condition()
+        self._next = 0
+
+    def _refresh_balances(self):
+        now = time.monotonic()
+        for signer in self.signers:
+            checked_at = signer.balance_checked_at
+            if checked_at is not None and now - checked_at < self.balance_check_interval:
+                continue
+            try:
+                balance = self.web3.eth.get_balance(signer.address)
+            except Exception as e:
+                logger.warning("Could not read balance of signer %s: %s", signer.address, e)
+                continue
+            with self._condition:
+                signer.balance = balance
+                signer.balance_checked_at = now
+                self._condition.notify_all()
+
+    def _is_healthy(self, signer):
+        return signer.balance is None or signer.balance >= self.min_balance
+
+    def _pick(self):
+        # Called with the condition held
+        count = len(self.signers)
+        for offset in range(count):
+            index = (self._next + offset) % count
+            signer = self.signers[index]
+            if self._is_healthy(signer) and signer.in_flight < self.max_in_flight:
+                self._next = index + 1
+                return signer
+        return None
+
+    def acquire(self, timeout=30):
+        """Reserve an in-flight slot on the next available signer"""
+        self._refresh_balances()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                signer = self._pick()
+                if signer is not None:
+                    signer.in_flight += 1
+                    return signer
+                if not any(self._is_healthy(signer) for signer in self.signers):
+                    raise NoSignerAvailable("No signer account has enough balance")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise NoSignerAvailable("All signer accounts are at their in-flight limit")
+                self._condition.wait(remaining)
+
+    def release(self, signer, succeeded):
+        """Free a signer's slot once its transaction is mined or has failed"""
+        with self._condition:
+            signer.in_flight -= 1
+            if succeeded:
+                signer.confirmed += 1
+            else:
+                signer.failed += 1
+            self._condition.notify()
+
+    def send(self, function_call, timeout=30):
+        """Submit a contract call from the next available signer.
+
+        Returns (signer, tx_hash). The caller must call ``release`` for the
+        signer when the transaction is mined.
+        """
+        signer = self.acquire(timeout=timeout)
+        try:
+            tx_hash = signer.send(function_call)
+        except Exception as e:
+            if 'insufficient funds' in str(e).lower():
+                signer.balance_checked_at = None
+            self.release(signer, succeeded=False)
+            raise
+        with self._condition:
+            signer.submitted += 1
+        return signer, tx_hash
+
+    def stats(self):
+        with self._condition:
+            return [signer.stats(self.min_balance) for signer in self.signers]
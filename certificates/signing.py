@@ -0,0 +1,66 @@
+# certificates/signing.py
+
+import threading
+import time
+
+
+class TransactionFactory:
+    """Builds and signs contract transactions locally.
+
+    The chain id is read once and the gas price at most every
+    ``gas_price_ttl`` seconds, so with a nonce from the caller the only
+    round-trips are ``eth_estimateGas`` and ``eth_sendRawTransaction``.
+    Gas is estimated for every transaction rather than fixed per function:
+    the estimate runs the call, so one that would revert (a duplicate
+    issueCertificate, say) raises here instead of being mined and paying
+    for its gas.
+    """
+
+    def __init__(self, web3_instance, gas_price_ttl=30):
+        self.web3 = web3_instance
+        self.gas_price_ttl = gas_price_ttl
+        self._lock = threading.Lock()
+        self._chain_id = None
+        self._gas_price = None
+        self._gas_price_read_at = None
+
+    @property
+    def chain_id(self):
+        if self._chain_id is None:
+            self._chain_id = self.web3.eth.chain_id
+        return self._chain_id
+
+    def gas_price(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._gas_price is None or now - self._gas_price_read_at >= self.gas_price_ttl:
+                self._gas_price = self.web3.eth.gas_price
+                self._gas_price_read_at = now
+            return self._gas_price
+
+    def expire_gas_price(self):
+        """Re-read the gas price before the next transaction"""
+        with self._lock:
+            self._gas_price = None
+
+    def build(self, function_call, sender, nonce):
+        transaction = {
+            'from': sender,
+            'nonce': nonce,
+            'chainId': self.chain_id,
+            'gasPrice': self.gas_price(),
+        }
+        # Given the rest of the transaction web3 doesn't look up defaults
+        transaction['gas'] = function_call.estimate_gas(dict(transaction))
+        return function_call.build_transaction(transaction)
+
+    def send(self, function_call, account, nonce):
+        """Sign the call with ``account`` and submit it; returns the transaction hash"""
+        signed = account.sign_transaction(self.build(function_call, account.address, nonce))
+        try:
+            return self.web3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            message = str(e).lower()
+            if 'underpriced' in message or 'fee too low' in message:
+                self.expire_gas_price()
+            raise
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -7,6 +7,8 @@ from django.core.management import call_command
 from .blockchain import web3, contract, issue_certificate
 from web3 import Web3
 import json
+from types import SimpleNamespace
+from unittest import mock
 
 class BlockchainIntegrationTests(TestCase):
     def setUp(self):
@@ -131,8 +133,2177 @@ class CertificateTests(TestCase):
             course='Computer Science',
             institution='University of Blockchain',
             issue_date='2025-01-01T00:00:00Z',
-            cert_hash='0x123',
+            cert_hash='0x' + '12' * 32,
             ipfs_hash='QmTest'
         )
         self.assertEqual(str(certificate), "Certificate for Alice")
         self.assertEqual(certificate.course, "Computer Science")
+
+
+class PendingIssuanceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.certificate_data = {
+            'student_name': 'Alice',
+            'course': 'Computer Science',
+            'institution': 'University of Blockchain',
+            'issue_date': 1735689600
+        }
+        self.cert_hash = '0x' + 'ab' * 32
+        self.tx_hash = '0x' + 'cd' * 32
+
+    @mock.patch('certificates.views.schedule_confirmation')
+    @mock.patch('certificates.views.issue_certificate')
+    def test_issue_returns_pending_certificate(self, mock_issue, mock_schedule):
+        """Issuance returns immediately and confirms in the background"""
+        mock_issue.return_value = {
+            'cert_hash': self.cert_hash,
+            'ipfs_hash': None,
+            'transaction_hash': self.tx_hash
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('issue_certificate'), self.certificate_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], Certificate.STATUS_PENDING)
+        self.assertEqual(mock_issue.call_args.kwargs['wait'], False)
+        certificate = Certificate.objects.get(cert_hash=self.cert_hash)
+        self.assertEqual(certificate.transaction_hash, self.tx_hash)
+        mock_schedule.assert_called_once_with(certificate.pk, self.tx_hash)
+        # Stored in UTC, like bulk issuance
+        self.assertEqual(certificate.issue_date.timestamp(), 1735689600)
+        self.assertIsNotNone(certificate.issue_date.tzinfo)
+
+    def test_confirm_certificate_marks_confirmed(self):
+        """A mined transaction moves the certificate to confirmed"""
+        certificate = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=self.cert_hash,
+            transaction_hash=self.tx_hash
+        )
+        from .confirmations import confirm_certificate
+        receipt = SimpleNamespace(status=1, blockNumber=42)
+        with mock.patch('certificates.confirmations.wait_for_transaction', return_value=receipt):
+            self.assertEqual(confirm_certificate(certificate.pk, self.tx_hash), Certificate.STATUS_CONFIRMED)
+
+        certificate.refresh_from_db()
+        self.assertEqual(certificate.status, Certificate.STATUS_CONFIRMED)
+        self.assertEqual(certificate.block_number, 42)
+
+    def test_confirm_certificate_marks_failed(self):
+        """A reverted transaction moves the certificate to failed"""
+        certificate = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=self.cert_hash,
+            transaction_hash=self.tx_hash
+        )
+        from .blockchain import SmartContractError
+        from .confirmations import confirm_certificate
+        with mock.patch('certificates.confirmations.wait_for_transaction',
+                        side_effect=SmartContractError('Transaction failed. Receipt status: 0')):
+            confirm_certificate(certificate.pk, self.tx_hash)
+
+        response = self.client.get(reverse('certificate_status', args=[self.cert_hash[2:]]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], Certificate.STATUS_FAILED)
+        self.assertIn('Receipt status: 0', response.data['failure_reason'])
+
+    def create_pending(self):
+        from .models import CertificateBatch
+        pending = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=self.cert_hash, transaction_hash=self.tx_hash
+        )
+        Certificate.objects.create(
+            student_name='Bob', course='CS', institution='UoB', issue_date='2025-01-01T00:00:00Z',
+            cert_hash='0x' + '01' * 32, transaction_hash='0x' + '02' * 32, status=Certificate.STATUS_CONFIRMED
+        )
+        Certificate.objects.create(  # not submitted yet
+            student_name='Carol', course='CS', institution='UoB', issue_date='2025-01-01T00:00:00Z',
+            cert_hash='0x' + '03' * 32
+        )
+        batch = CertificateBatch.objects.create(
+            merkle_root='0x' + '04' * 32, size=1, anchored_at=1735689600, transaction_hash='0x' + '05' * 32
+        )
+        return pending, batch
+
+    def test_unmined_transaction_stays_pending(self):
+        """A receipt wait that times out leaves the certificate to be checked again"""
+        from web3.exceptions import TimeExhausted
+        from .confirmations import pending_transactions, record_confirmation
+        pending, _ = self.create_pending()
+
+        def get_receipt():
+            raise TimeExhausted("Transaction is not in the chain after waiting for its receipt")
+
+        self.assertEqual(record_confirmation(pending.pk, get_receipt), Certificate.STATUS_PENDING)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, Certificate.STATUS_PENDING)
+        self.assertIn((pending.pk, self.tx_hash), pending_transactions()[0])
+
+    def test_confirm_pending_command_records_outcomes(self):
+        """confirm_pending waits for every pending transaction and records it"""
+        from concurrent.futures import Future
+        from io import StringIO
+        pending, batch = self.create_pending()
+
+        def track(tx_hash, timeout):
+            future = Future()
+            future.set_result(SimpleNamespace(status=1, blockNumber=7))
+            return future
+
+        out = StringIO()
+        with mock.patch('certificates.management.commands.confirm_pending.get_watcher',
+                        return_value=SimpleNamespace(track=track)):
+            call_command('confirm_pending', stdout=out)
+        self.assertIn('2 confirmed', out.getvalue())
+        pending.refresh_from_db()
+        batch.refresh_from_db()
+        self.assertEqual((pending.status, pending.block_number), (Certificate.STATUS_CONFIRMED, 7))
+        self.assertEqual(batch.status, Certificate.STATUS_CONFIRMED)
+
+    def test_status_unknown_certificate(self):
+        """Status of an unknown hash is a 404"""
+        response = self.client.get(reverse('certificate_status', args=[self.cert_hash]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FakeChain:
+    """Minimal stand-in for ``web3.eth`` and its provider that counts RPC round trips"""
+
+    def __init__(self):
+        self.blocks = [[]]
+        self.calls = 0
+
+    def mine(self, *tx_hashes):
+        self.blocks.append([Web3.to_bytes(hexstr=h) for h in tx_hashes])
+
+    @property
+    def block_number(self):
+        self.calls += 1
+        return len(self.blocks) - 1
+
+    def get_block(self, number):
+        self.calls += 1
+        return SimpleNamespace(transactions=self.blocks[number])
+
+    def make_batch_request(self, requests_info):
+        self.calls += 1
+        return [{'result': self._receipt(params[0])} for _, params in requests_info]
+
+    def _receipt(self, tx_hash):
+        for number, transactions in enumerate(self.blocks):
+            if Web3.to_bytes(hexstr=tx_hash) in transactions:
+                return {'status': '0x1', 'blockNumber': hex(number)}
+        return None
+
+    def web3(self):
+        return SimpleNamespace(eth=self, provider=self)
+
+
+class ConfirmationWatcherTests(TestCase):
+    def test_resolves_all_tracked_transactions_from_block_scan(self):
+        """One watcher resolves every pending transaction as blocks arrive"""
+        from .watcher import ConfirmationWatcher
+        chain = FakeChain()
+        watcher = ConfirmationWatcher(chain.web3(), poll_interval=0.01)
+        tx_hashes = ['0x%064x' % i for i in range(1, 51)]
+
+        futures = [watcher.track(tx_hash, timeout=5) for tx_hash in tx_hashes]
+        chain.mine(*tx_hashes[:25])
+        chain.mine(*tx_hashes[25:])
+
+        receipts = [future.result(timeout=5) for future in futures]
+        self.assertEqual({receipt.blockNumber for receipt in receipts}, {1, 2})
+        self.assertEqual(watcher.pending_count(), 0)
+
+    def test_receipts_for_a_block_are_fetched_in_one_batch(self):
+        """A block holding many tracked transactions costs one receipt round trip"""
+        from .watcher import ConfirmationWatcher
+        chain = FakeChain()
+        watcher = ConfirmationWatcher(chain.web3(), poll_interval=0.01)
+        tx_hashes = ['0x%064x' % i for i in range(1, 51)]
+        with mock.patch.object(watcher, '_ensure_running'):
+            futures = [watcher.track(tx_hash) for tx_hash in tx_hashes]
+        watcher._poll()  # direct lookups: none mined yet
+
+        chain.mine(*tx_hashes)
+        chain.calls = 0
+        watcher._poll()
+        self.assertEqual(chain.calls, 3)  # head, the block, one receipt batch
+        self.assertEqual({future.result(timeout=0).blockNumber for future in futures}, {1})
+
+    def test_unmined_transaction_times_out(self):
+        """Transactions that never appear fail their future"""
+        from web3.exceptions import TimeExhausted
+        from .watcher import ConfirmationWatcher
+        watcher = ConfirmationWatcher(FakeChain().web3(), poll_interval=0.01)
+        with self.assertRaises(TimeExhausted):
+            watcher.wait('0x' + 'ef' * 32, timeout=0.05)
+
+
+class MerkleBatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+
+    def _queue(self, student_name):
+        from .blockchain import generate_certificate_hash
+        return Certificate.objects.create(
+            student_name=student_name, course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z',
+            cert_hash=generate_certificate_hash(student_name, 'CS', 'UoB', 1735689600)
+        )
+
+    def test_every_leaf_proves_against_root(self):
+        """Inclusion proofs verify for odd and even tree sizes"""
+        from . import merkle
+        for size in range(1, 10):
+            leaves = [Web3.keccak(text=str(i)) for i in range(size)]
+            levels = merkle.build_tree(leaves)
+            root = merkle.merkle_root(levels)
+            for index, leaf in enumerate(leaves):
+                self.assertTrue(merkle.verify_proof(leaf, merkle.merkle_proof(levels, index), root))
+            self.assertFalse(merkle.verify_proof(Web3.keccak(text='other'), merkle.merkle_proof(levels, 0), root))
+
+    @override_settings(CERTIFICATE_ISSUANCE_MODE='batch')
+    @mock.patch('certificates.views.issue_certificate')
+    def test_batch_mode_queues_without_transaction(self, mock_issue):
+        """In batch mode issuance only queues the certificate"""
+        data = {'student_name': 'Alice', 'course': 'CS', 'institution': 'UoB', 'issue_date': 1735689600}
+        response = self.client.post(reverse('issue_certificate'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['transaction_hash'])
+        mock_issue.assert_not_called()
+        from .batching import queued_certificates
+        self.assertEqual(queued_certificates().count(), 1)
+
+    def test_batched_certificates_verify_with_one_chain_call(self):
+        """Certificates in a batch are checked against the anchored root"""
+        from . import batching
+        from .blockchain import batch_anchor_fields
+        certificates = [self._queue(name) for name in ['Alice', 'Bob', 'Carol']]
+        batch = batching.create_batch()
+        self.assertEqual(batch.size, 3)
+
+        with mock.patch('certificates.batching.anchor_batch_root',
+                        return_value={'anchor_hash': '0x' + '11' * 32, 'transaction_hash': '0x' + '22' * 32}):
+            batching.anchor_batch(batch, schedule=False)
+
+        anchored = (True,) + batch_anchor_fields(batch.pk, batch.merkle_root, batch.anchored_at)
+        with mock.patch('certificates.batching.verify_certificate_on_chain', return_value=anchored) as mock_verify:
+            for cert in certificates:
+                response = self.client.get(reverse('verify_certificate', args=[cert.cert_hash.hex()]))
+                self.assertTrue(response.data['is_valid'])
+                self.assertTrue(response.data['blockchain_valid'])
+        mock_verify.assert_called_once_with('0x' + '11' * 32)
+        batching._anchored_roots.clear()
+
+    def test_unsubmitted_anchor_releases_the_certificates(self):
+        """A root that never reached the chain fails its batch and requeues the certificates"""
+        from . import batching
+        from .models import CertificateBatch
+        certificates = [self._queue(name) for name in ['Alice', 'Bob']]
+        batch = batching.create_batch()
+
+        with mock.patch('certificates.batching.anchor_batch_root',
+                        return_value={'anchor_hash': '0x' + '11' * 32, 'transaction_hash': None}):
+            with self.assertRaisesMessage(Exception, 'not submitted'):
+                batching.anchor_batch(batch)
+
+        self.assertEqual(CertificateBatch.objects.get(pk=batch.pk).status, Certificate.STATUS_FAILED)
+        self.assertEqual(set(batching.queued_certificates()), set(certificates))
+        self.assertFalse(Certificate.objects.filter(merkle_proof__isnull=False).exists())
+
+    def test_create_batch_locks_the_rows_it_takes(self):
+        """Concurrent batch runs skip rows another run has already locked"""
+        from django.db.models import QuerySet
+        from . import batching
+        self._queue('Alice')
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True,
+                               side_effect=QuerySet.select_for_update) as mock_lock:
+            batching.create_batch()
+        self.assertEqual(mock_lock.call_args.kwargs, {'skip_locked': True})
+
+    def test_anchored_roots_are_bounded(self):
+        """Only the most recently checked anchored roots are remembered"""
+        from . import batching
+        self.addCleanup(batching._anchored_roots.clear)
+        with mock.patch.object(batching._anchored_roots, 'max_size', 2):
+            for root in ('0x01', '0x02', '0x03'):
+                batching._anchored_roots.set(root, True)
+        self.assertEqual(len(batching._anchored_roots), 2)
+        self.assertIsNone(batching._anchored_roots.get('0x01'))
+
+    def test_tampered_proof_is_rejected(self):
+        """A certificate whose proof doesn't reach the root is invalid"""
+        from . import batching
+        certificates = [self._queue(name) for name in ['Alice', 'Bob']]
+        batching.create_batch()
+        cert = Certificate.objects.get(pk=certificates[0].pk)
+        cert.merkle_proof = ['0x' + '00' * 32]
+        cert.save()
+
+        valid, error = batching.verify_batch_membership(cert)
+        self.assertFalse(valid)
+        self.assertIn('Merkle proof', error)
+
+
+class BulkIssuanceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('issue_certificates_bulk')
+
+    def _results(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    @override_settings(CERTIFICATE_BULK_CHUNK_SIZE=2, CERTIFICATE_ISSUANCE_MODE='batch')
+    def test_csv_upload_reports_each_row(self):
+        """Valid rows are stored across chunks and invalid rows are reported"""
+        body = (
+            "student_name,course,institution,issue_date\n"
+            "Alice,CS,UoB,1735689600\n"
+            "Bob,CS,UoB,not-a-date\n"
+            "Carol,CS,UoB,1735689600\n"
+            "Alice,CS,UoB,1735689600\n"
+            "Dave,,UoB,1735689600\n"
+        )
+        response = self.client.post(self.url, body, content_type='text/csv')
+        results = self._results(response)
+
+        self.assertEqual([r['row'] for r in results], [1, 2, 3, 4, 5])
+        self.assertEqual(results[0]['status'], Certificate.STATUS_PENDING)
+        self.assertIn('integer timestamp', results[1]['error'])
+        self.assertEqual(results[2]['status'], Certificate.STATUS_PENDING)
+        self.assertEqual(results[3]['error'], 'Certificate already exists')
+        self.assertIn('course', results[4]['error'])
+        self.assertEqual(Certificate.objects.count(), 2)
+
+    @override_settings(CERTIFICATE_ISSUANCE_MODE='batch')
+    def test_ndjson_upload_matches_single_issuance_hash(self):
+        """Bulk rows get the same hash as single issuance"""
+        from .blockchain import generate_certificate_hash
+        body = (
+            '{"student_name": "Alice", "course": "CS", "institution": "UoB", "issue_date": 1735689600}\n'
+            '\n'
+            'not json\n'
+        )
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        results = self._results(response)
+
+        self.assertEqual(results[0]['cert_hash'], '0x' + generate_certificate_hash('Alice', 'CS', 'UoB', 1735689600).hex())
+        self.assertIn('Invalid JSON', results[1]['error'])
+        self.assertEqual(len(results), 2)
+
+    @override_settings(CERTIFICATE_ISSUANCE_MODE='batch')
+    def test_ndjson_row_with_non_string_field_is_reported(self):
+        """A row that can't be hashed gets an error; the rest of its chunk is still stored"""
+        body = (
+            '{"student_name": 5, "course": "CS", "institution": "UoB", "issue_date": 1735689600}\n'
+            '{"student_name": "Bob", "course": "CS", "institution": "UoB", "issue_date": 1735689600}\n'
+        )
+        results = self._results(self.client.post(self.url, body, content_type='application/x-ndjson'))
+
+        self.assertEqual(results[0], {'row': 1, 'error': 'student_name must be a string'})
+        self.assertEqual(results[1]['status'], Certificate.STATUS_PENDING)
+        self.assertEqual(Certificate.objects.get().student_name, 'Bob')
+
+    @mock.patch('certificates.bulk.schedule_confirmation')
+    @mock.patch('certificates.bulk.issue_certificate')
+    def test_single_mode_submits_a_transaction_per_row(self, mock_issue, mock_schedule):
+        """Outside batch mode every stored row has its own transaction, confirmed in the background"""
+        from datetime import datetime, timezone
+        from .blockchain import SmartContractError
+
+        def issue(student_name, course, institution, issue_date, wait):
+            if student_name == 'Bob':
+                raise SmartContractError("Certificate with this data already exists on the blockchain")
+            return {'cert_hash': None, 'ipfs_hash': None, 'transaction_hash': '0x' + student_name.encode().hex()}
+
+        mock_issue.side_effect = issue
+        body = "student_name,course,institution,issue_date\nAlice,CS,UoB,1735689600\nBob,CS,UoB,1735689600\n"
+        with self.captureOnCommitCallbacks(execute=True):
+            results = self._results(self.client.post(self.url, body, content_type='text/csv'))
+
+        self.assertEqual(results[0]['transaction_hash'], '0x' + b'Alice'.hex())
+        self.assertIn('already exists', results[1]['error'])
+        certificate = Certificate.objects.get()
+        self.assertEqual(certificate.issue_date, datetime(2025, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(mock_issue.call_args_list[0].args, ('Alice', 'CS', 'UoB', 1735689600))
+        mock_schedule.assert_called_once_with(certificate.pk, '0x' + b'Alice'.hex())
+
+    def test_unsupported_content_type(self):
+        response = self.client.post(self.url, {'student_name': 'Alice'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+
+def use_fresh_revocation_set(test_case):
+    """Give a test its own revocation set instead of the process-wide one"""
+    from .revocations import RevocationSet
+    revocations = RevocationSet()
+    patcher = mock.patch('certificates.revocations._revocation_set', revocations)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return revocations
+
+
+def use_fresh_hash_shield(test_case):
+    """Give a test its own Bloom filter, built from the test database"""
+    from .bloom import HashShield
+    shield = HashShield(refresh_interval=60)
+    patcher = mock.patch('certificates.bloom._shield', shield)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    shield.rebuild()
+    return shield
+
+
+class VerificationCacheTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        self.client = APIClient()
+        self.cache = get_verification_cache()
+        self.cache.clear()
+        self.certificate = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash='0x' + 'ab' * 32,
+            status=Certificate.STATUS_CONFIRMED
+        )
+        self.chain_result = [True, 'Alice', 'CS', 'UoB', 1735689600]
+        use_fresh_revocation_set(self).load()
+        use_fresh_hash_shield(self)
+
+    def test_lru_evicts_oldest_and_expires(self):
+        from .cache import LRUCache
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+        expired = LRUCache(max_size=2, ttl=0)
+        expired.set('a', 1)
+        self.assertIsNone(expired.get('a'))
+
+    def test_repeat_verification_is_served_from_cache(self):
+        """The chain is called once for repeated verifications of one hash"""
+        url = reverse('verify_certificate', args=[self.certificate.cert_hash[2:]])
+        with mock.patch('certificates.views.verify_certificate_on_chain', return_value=self.chain_result) as mock_verify:
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+
+        mock_verify.assert_called_once()
+        self.assertEqual(first.data, second.data)
+        stats = self.client.get(reverse('verification_cache_stats')).data
+        self.assertEqual(stats['chain']['hits'], 1)
+        self.assertEqual(stats['chain']['misses'], 1)
+
+    @mock.patch('certificates.views.revoke_certificate')
+    def test_revocation_invalidates_cached_result(self, mock_revoke):
+        """Revoking a certificate is visible on the next verification"""
+        url = reverse('verify_certificate', args=[self.certificate.cert_hash])
+        with mock.patch('certificates.views.verify_certificate_on_chain', return_value=self.chain_result):
+            self.assertTrue(self.client.get(url).data['is_valid'])
+            self.client.post(reverse('revoke_certificate', args=[self.certificate.cert_hash]))
+            response = self.client.get(url)
+
+        self.assertFalse(response.data['is_valid'])
+        self.assertTrue(response.data['certificate']['is_revoked'])
+
+
+class HashPrefixLookupTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+        self.client = APIClient()
+        for i in range(5):
+            Certificate.objects.create(
+                student_name=f'Student {i}', course='CS', institution='UoB',
+                issue_date='2025-01-01T00:00:00Z', cert_hash='0x%02x' % i + 'ab' * 31
+            )
+        use_fresh_revocation_set(self).load()
+        use_fresh_hash_shield(self)
+
+    def test_prefix_lookup_uses_index(self):
+        """The fallback lookup is a range search on the cert_hash index"""
+        plan = Certificate.objects.with_hash_prefix('03abababab').explain()
+        self.assertIn('SEARCH', plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_prefix_match_is_bounded(self):
+        """A mistyped hash costs one bounded prefix query"""
+        typo = '0x03' + 'ab' * 8 + 'ff' * 23
+        with mock.patch('certificates.views.verify_certificate_on_chain', return_value=None):
+            # The Bloom filter rules out an exact match, so the only query
+            # is the prefix lookup
+            with self.assertNumQueries(1):
+                response = self.client.get(reverse('verify_certificate', args=[typo]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['certificate']['student_name'], 'Student 3')
+
+    def test_malformed_hash_is_rejected(self):
+        """Anything but 32 bytes of hex is rejected before touching the database"""
+        for cert_hash in ['0x03', '0x03abzz' + 'ab' * 29, 'ab' * 33]:
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse('verify_certificate', args=[cert_hash]))
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BinaryHashStorageTests(TestCase):
+    def test_hash_stored_as_32_bytes(self):
+        """Hex input is stored and read back as the raw digest"""
+        cert_hash = '0x' + 'ab' * 32
+        Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=cert_hash
+        )
+        certificate = Certificate.objects.get(cert_hash=bytes.fromhex('ab' * 32))
+        self.assertEqual(certificate.cert_hash, b'\xab' * 32)
+        from .serializers import CertificateSerializer
+        self.assertEqual(CertificateSerializer(certificate).data['cert_hash'], cert_hash)
+
+    def test_parse_cert_hash(self):
+        from .fields import parse_cert_hash
+        self.assertEqual(parse_cert_hash('AB' * 32), b'\xab' * 32)
+        self.assertEqual(parse_cert_hash('0x' + 'ab' * 32), b'\xab' * 32)
+        for invalid in ['0x1234567890abcdef', 'zz' * 32, '0x' + 'ab' * 33]:
+            with self.assertRaises(ValueError):
+                parse_cert_hash(invalid)
+
+    def test_hash_of_wrong_length_is_rejected(self):
+        """Only MySQL enforces the column size, so the field checks it"""
+        from django.core.exceptions import ValidationError
+        certificate = Certificate(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash='0x123'
+        )
+        with self.assertRaises(ValidationError):
+            certificate.full_clean()
+        from django.db import transaction
+        with self.assertRaises(ValueError), transaction.atomic():
+            certificate.save()
+        with self.assertRaises(ValueError):
+            Certificate.objects.filter(cert_hash=b'\xab' * 31).exists()
+        self.assertFalse(Certificate.objects.exists())
+
+
+class LazyBlockchainClientTests(TestCase):
+    def setUp(self):
+        from . import blockchain
+        self.blockchain = blockchain
+        blockchain.reset_client()
+        self.addCleanup(blockchain.reset_client)
+
+    def test_import_does_not_connect(self):
+        """Importing the module creates no client until one is needed"""
+        import importlib
+        with mock.patch.object(self.blockchain, 'get_web3') as mock_get_web3:
+            importlib.reload(self.blockchain)
+            mock_get_web3.assert_not_called()
+            self.assertIsNone(self.blockchain._client)
+
+    def test_client_is_created_once_per_process(self):
+        fake_web3, fake_contract = mock.Mock(), mock.Mock()
+        with mock.patch.object(self.blockchain, 'get_web3', return_value=fake_web3) as mock_get_web3, \
+                mock.patch.object(self.blockchain, 'get_contract', return_value=fake_contract):
+            self.assertEqual(self.blockchain.get_client(), (fake_web3, fake_contract))
+            self.assertEqual(self.blockchain.get_client(), (fake_web3, fake_contract))
+            mock_get_web3.assert_called_once()
+
+            # A forked child sees a different pid and builds its own client
+            with mock.patch('certificates.blockchain.os.getpid', return_value=-1):
+                self.blockchain.get_client()
+            self.assertEqual(mock_get_web3.call_count, 2)
+
+    def test_failed_connection_is_retried_after_interval(self):
+        from .blockchain import BlockchainConnectionError
+        with mock.patch.object(self.blockchain, 'get_web3', side_effect=BlockchainConnectionError('down')) as mock_get_web3:
+            self.assertEqual(self.blockchain.get_client(), (None, None))
+            self.assertEqual(self.blockchain.get_client(), (None, None))
+            mock_get_web3.assert_called_once()
+            self.assertFalse(self.blockchain.warm_up())
+            self.assertEqual(mock_get_web3.call_count, 2)
+
+    def test_health_endpoint_reports_unavailable_chain(self):
+        with mock.patch.object(self.blockchain, 'get_client', return_value=(None, None)):
+            response = APIClient().get(reverse('blockchain_health'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(response.data['connected'])
+
+
+class StandInNode:
+    """Minimal JSON-RPC node on localhost that records who connected"""
+
+    def __init__(self, block_number=1, status_code=200, handler=None, drop=False):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        node = self
+        self.block_number = block_number
+        self.status_code = status_code
+        # handler(method, params) returns a result, or raises to send an RPC error
+        self.handler = handler or (lambda method, params: hex(node.block_number))
+        self.methods = []
+        self.http_requests = 0
+        self.client_ports = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                node.client_ports.add(self.client_address[1])
+                node.http_requests += 1
+                calls = body if isinstance(body, list) else [body]
+                node.methods.extend(item['method'] for item in calls)
+                if drop:
+                    # Hang up after reading the request, like a node that
+                    # crashes or a proxy that resets the connection
+                    self.close_connection = True
+                    return
+                responses = []
+                for item in calls:
+                    try:
+                        result = node.handler(item['method'], item['params'])
+                        responses.append({'jsonrpc': '2.0', 'id': item['id'], 'result': result})
+                    except Exception as e:
+                        responses.append({'jsonrpc': '2.0', 'id': item['id'],
+                                          'error': {'code': -32000, 'message': str(e)}})
+                payload = json.dumps(responses if isinstance(body, list) else responses[0]).encode()
+                self.send_response(node.status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def unused_url():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+
+class FailoverProviderTests(TestCase):
+    def start_node(self, **kwargs):
+        node = StandInNode(**kwargs)
+        self.addCleanup(node.close)
+        return node
+
+    def test_connections_are_reused(self):
+        from .transport import FailoverHTTPProvider
+        node = self.start_node(block_number=7)
+        w3 = Web3(FailoverHTTPProvider([node.url]))
+        for _ in range(5):
+            self.assertEqual(w3.eth.block_number, 7)
+        self.assertEqual(len(node.methods), 5)
+        self.assertEqual(len(node.client_ports), 1)
+
+    def test_fails_over_to_next_endpoint(self):
+        from .transport import FailoverHTTPProvider
+        node = self.start_node(block_number=3)
+        provider = FailoverHTTPProvider([unused_url(), node.url], timeout=2, cooldown=60)
+        w3 = Web3(provider)
+
+        self.assertEqual(w3.eth.block_number, 3)
+        down, up = provider.endpoint_status()
+        self.assertFalse(down['available'])
+        self.assertEqual(down['failures'], 1)
+        self.assertTrue(up['available'])
+
+        # The failed endpoint is skipped while it cools down
+        self.assertEqual(provider.endpoint_uri, node.url)
+        self.assertEqual(w3.eth.block_number, 3)
+        self.assertEqual(provider.endpoint_status()[0]['failures'], 1)
+
+    def test_server_errors_trigger_failover(self):
+        from .transport import FailoverHTTPProvider
+        broken = self.start_node(status_code=502)
+        node = self.start_node(block_number=9)
+        provider = FailoverHTTPProvider([broken.url, node.url])
+        self.assertEqual(Web3(provider).eth.block_number, 9)
+        self.assertEqual(provider.endpoint_status()[0]['failures'], 1)
+
+    def test_unavailable_endpoints_raise(self):
+        import requests
+        from .transport import FailoverHTTPProvider
+        provider = FailoverHTTPProvider([unused_url(), unused_url()], timeout=2)
+        self.assertFalse(Web3(provider).is_connected())
+        with self.assertRaises(requests.ConnectionError):
+            provider.make_request('eth_blockNumber', [])
+
+    def test_sends_are_not_replayed_after_reaching_a_node(self):
+        import requests
+        from .transport import FailoverHTTPProvider
+        dropping = self.start_node(drop=True)
+        node = self.start_node(block_number=2)
+        send = ('eth_sendRawTransaction', ['0x00'])
+
+        provider = FailoverHTTPProvider([dropping.url, node.url])
+        with self.assertRaises(requests.ConnectionError):
+            provider.make_request(*send)
+        provider = FailoverHTTPProvider([dropping.url, node.url])
+        with self.assertRaises(requests.ConnectionError):
+            provider.make_batch_request([('eth_blockNumber', []), send])
+        self.assertEqual(node.methods, [])
+
+        # Reads are still retried on the next endpoint
+        provider = FailoverHTTPProvider([dropping.url, node.url])
+        self.assertEqual(Web3(provider).eth.block_number, 2)
+
+        # A send that couldn't connect never reached anything, so it moves on
+        provider = FailoverHTTPProvider([unused_url(), node.url], timeout=2)
+        provider.make_request(*send)
+        self.assertEqual(node.methods, ['eth_blockNumber', 'eth_sendRawTransaction'])
+
+    def test_batch_requests(self):
+        from .transport import FailoverHTTPProvider
+        node = self.start_node(block_number=5)
+        w3 = Web3(FailoverHTTPProvider([node.url]))
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.get_block_number())
+            batch.add(w3.eth.get_block_number())
+            results = batch.execute()
+        self.assertEqual(results, [5, 5])
+        self.assertEqual(node.methods, ['eth_blockNumber', 'eth_blockNumber'])
+
+    def test_async_provider_fails_over_and_reuses_connections(self):
+        import asyncio
+        from web3 import AsyncWeb3
+        from .transport import AsyncFailoverHTTPProvider
+        node = self.start_node(block_number=4)
+        provider = AsyncFailoverHTTPProvider([unused_url(), node.url], timeout=2, cooldown=60)
+        w3 = AsyncWeb3(provider)
+
+        async def block_numbers():
+            try:
+                return [await w3.eth.block_number for _ in range(3)]
+            finally:
+                await provider.disconnect()
+
+        self.assertEqual(asyncio.run(block_numbers()), [4, 4, 4])
+        self.assertEqual(provider.endpoint_status()[0]['failures'], 1)
+        self.assertEqual(len(node.client_ports), 1)
+
+
+VERIFY_CERTIFICATE_ABI = [{
+    'type': 'function',
+    'name': 'verifyCertificate',
+    'stateMutability': 'view',
+    'inputs': [{'name': 'certHash', 'type': 'bytes32'}],
+    'outputs': [
+        {'name': '', 'type': 'bool'},
+        {'name': '', 'type': 'string'},
+        {'name': '', 'type': 'string'},
+        {'name': '', 'type': 'string'},
+        {'name': '', 'type': 'uint256'},
+    ],
+}]
+
+
+class BatchVerificationTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+        self.addCleanup(get_verification_cache().clear)
+        self.certificates = [
+            Certificate.objects.create(
+                student_name=f"Student {i}",
+                course="Computer Science",
+                institution="Test University",
+                issue_date="2024-01-01T00:00:00Z",
+                cert_hash=bytes([i + 1]) * 32,
+                status=Certificate.STATUS_CONFIRMED,
+            )
+            for i in range(3)
+        ]
+        use_fresh_revocation_set(self).load()
+        use_fresh_hash_shield(self)
+
+    def chain_result(self, certificate):
+        return [True, certificate.student_name, certificate.course, certificate.institution, 1704067200]
+
+    def test_rpc_helper_sends_one_batch(self):
+        from eth_abi import decode, encode
+        from .blockchain import SmartContractError, verify_certificates_on_chain
+
+        known = {cert.cert_hash: self.chain_result(cert) for cert in self.certificates[:2]}
+
+        def handler(method, params):
+            cert_hash = decode(['bytes32'], bytes.fromhex(params[0]['data'][10:]))[0]
+            if cert_hash not in known:
+                raise Exception("VM Exception while processing transaction: revert Certificate not found")
+            return '0x' + encode(['bool', 'string', 'string', 'string', 'uint256'], known[cert_hash]).hex()
+
+        node = StandInNode(handler=handler)
+        self.addCleanup(node.close)
+        from .transport import FailoverHTTPProvider
+        w3 = Web3(FailoverHTTPProvider([node.url]))
+        contract = w3.eth.contract(address='0x' + '11' * 20, abi=VERIFY_CERTIFICATE_ABI)
+
+        hashes = [cert.cert_hash for cert in reversed(self.certificates)]
+        with mock.patch('certificates.blockchain.get_client', return_value=(w3, contract)):
+            results = verify_certificates_on_chain(hashes)
+
+        self.assertEqual(node.http_requests, 1)
+        self.assertEqual(node.methods, ['eth_call'] * 3)
+        self.assertIsInstance(results[0], SmartContractError)
+        self.assertEqual(str(results[0]), "Certificate not found on blockchain")
+        self.assertEqual(results[1], self.chain_result(self.certificates[1]))
+        self.assertEqual(results[2], self.chain_result(self.certificates[0]))
+
+    def test_batch_endpoint_preserves_request_order(self):
+        first, second, third = self.certificates
+        unknown = '0x' + 'ab' * 32
+        cert_hashes = [third.cert_hash.hex(), 'not-a-hash', unknown, first.cert_hash.hex(), third.cert_hash.hex()]
+
+        with mock.patch('certificates.views.verify_certificates_on_chain',
+                        return_value=[self.chain_result(third), self.chain_result(first)]) as mock_verify, \
+                self.assertNumQueries(1):  # certificates
+            response = APIClient().post(reverse('verify_certificates_batch'), {'cert_hashes': cert_hashes}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_verify.assert_called_once()
+        self.assertEqual(sorted(mock_verify.call_args[0][0]), sorted([first.cert_hash, third.cert_hash]))
+
+        results = response.data['results']
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0]['certificate']['student_name'], third.student_name)
+        self.assertTrue(results[0]['is_valid'])
+        self.assertIn('error', results[1])
+        self.assertEqual(results[2], {'cert_hash': unknown, 'error': 'Certificate not found in database'})
+        self.assertEqual(results[3]['certificate']['student_name'], first.student_name)
+        self.assertEqual(results[4], results[0])
+
+    def test_batch_endpoint_uses_cache(self):
+        cert_hashes = [cert.cert_hash.hex() for cert in self.certificates]
+        chain_results = [self.chain_result(cert) for cert in self.certificates]
+        url = reverse('verify_certificates_batch')
+        with mock.patch('certificates.views.verify_certificates_on_chain', return_value=chain_results):
+            APIClient().post(url, {'cert_hashes': cert_hashes}, format='json')
+
+        with mock.patch('certificates.views.verify_certificates_on_chain') as mock_verify, \
+                self.assertNumQueries(0):
+            response = APIClient().post(url, {'cert_hashes': cert_hashes}, format='json')
+        mock_verify.assert_not_called()
+        self.assertTrue(all(result['is_valid'] for result in response.data['results']))
+
+    @override_settings(CERTIFICATE_VERIFY_BATCH_MAX_SIZE=2)
+    def test_batch_endpoint_rejects_bad_input(self):
+        url = reverse('verify_certificates_batch')
+        for payload in ({}, {'cert_hashes': []}, {'cert_hashes': 'abc'},
+                        {'cert_hashes': [cert.cert_hash.hex() for cert in self.certificates]}):
+            response = APIClient().post(url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FakeNonceChain:
+    """Stand-in for ``web3.eth`` that tracks the account's pending nonce"""
+
+    def __init__(self, pending=0):
+        self.eth = self
+        self.pending = pending
+        self.count_calls = 0
+
+    def get_transaction_count(self, address, block_identifier):
+        self.count_calls += 1
+        return self.pending
+
+
+class FakeFunctionCall:
+    def __init__(self, chain, errors=()):
+        self.chain = chain
+        self.errors = list(errors)
+        self.sent = []
+
+    def transact(self, transaction):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(transaction['nonce'])
+        return b'\x01' * 32
+
+
+class NonceManagerTests(TestCase):
+    def test_concurrent_allocations_are_unique(self):
+        import threading
+        from .nonces import NonceManager
+        chain = FakeNonceChain(pending=5)
+        manager = NonceManager(chain, '0xsender')
+        allocated = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                nonce = manager.allocate()
+                with lock:
+                    allocated.append(nonce)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(allocated), list(range(5, 405)))
+        self.assertEqual(chain.count_calls, 1)
+
+    def test_released_nonce_is_reused_first(self):
+        from .nonces import NonceManager
+        manager = NonceManager(FakeNonceChain(pending=0), '0xsender')
+        self.assertEqual([manager.allocate() for _ in range(3)], [0, 1, 2])
+        manager.release(1)
+        self.assertEqual(manager.allocate(), 1)
+        self.assertEqual(manager.allocate(), 3)
+        manager.release(3)
+        self.assertEqual(manager.allocate(), 3)
+
+    def test_taken_nonce_resyncs_and_retries(self):
+        from .nonces import NonceManager
+        chain = FakeNonceChain(pending=0)
+        manager = NonceManager(chain, '0xsender')
+        manager.allocate()
+
+        # Another sender used nonces 1 and 2 behind our back
+        chain.pending = 3
+        call = FakeFunctionCall(chain, errors=[ValueError({'message': 'nonce too low'})])
+        manager.send(lambda nonce: call.transact({'nonce': nonce}))
+        self.assertEqual(call.sent, [3])
+        self.assertEqual(manager.allocate(), 4)
+
+    def test_failed_send_releases_nonce(self):
+        from .nonces import NonceManager
+        manager = NonceManager(FakeNonceChain(pending=0), '0xsender')
+        call = FakeFunctionCall(None, errors=[ValueError('execution reverted')])
+        submit = lambda nonce: call.transact({'nonce': nonce})
+        with self.assertRaises(ValueError):
+            manager.send(submit)
+        manager.send(submit)
+        self.assertEqual(call.sent, [0])
+
+    def test_forked_process_resyncs(self):
+        from .nonces import NonceManager
+        chain = FakeNonceChain(pending=0)
+        manager = NonceManager(chain, '0xsender')
+        manager.allocate()
+        chain.pending = 10
+        with mock.patch('certificates.nonces.os.getpid', return_value=-1):
+            self.assertEqual(manager.allocate(), 10)
+        self.assertEqual(chain.count_calls, 2)
+
+
+class FakeSignerChain:
+    """Stand-in for ``web3.eth`` with per-account balances and nonces"""
+
+    def __init__(self, balances):
+        self.eth = self
+        self.balances = balances
+
+    def get_balance(self, address):
+        return self.balances[address]
+
+    def get_transaction_count(self, address, block_identifier):
+        return 0
+
+
+class SignerPoolTests(TestCase):
+    def make_pool(self, balances, **kwargs):
+        from .signers import SignerPool
+        return SignerPool(FakeSignerChain(balances), list(balances), **kwargs)
+
+    def test_transactions_rotate_across_signers(self):
+        pool = self.make_pool({'0xa': 100, '0xb': 100, '0xc': 100})
+        call = FakeFunctionCall(None)
+        senders = [pool.send(call)[0].address for _ in range(6)]
+        self.assertEqual(senders, ['0xa', '0xb', '0xc', '0xa', '0xb', '0xc'])
+        # Each account has its own nonce sequence
+        self.assertEqual(call.sent, [0, 0, 0, 1, 1, 1])
+        self.assertEqual([stats['submitted'] for stats in pool.stats()], [2, 2, 2])
+
+    def test_in_flight_limit(self):
+        from .signers import NoSignerAvailable
+        pool = self.make_pool({'0xa': 100, '0xb': 100}, max_in_flight=1)
+        first = pool.acquire(timeout=0)
+        second = pool.acquire(timeout=0)
+        self.assertNotEqual(first, second)
+        with self.assertRaises(NoSignerAvailable):
+            pool.acquire(timeout=0)
+
+        pool.release(first, succeeded=True)
+        self.assertIs(pool.acquire(timeout=0), first)
+        self.assertEqual(pool.stats()[0]['confirmed'], 1)
+
+    def test_low_balance_signer_is_skipped(self):
+        from .signers import NoSignerAvailable
+        pool = self.make_pool({'0xa': 5, '0xb': 100}, min_balance=10)
+        self.assertEqual({pool.acquire(timeout=0).address for _ in range(3)}, {'0xb'})
+        self.assertFalse(pool.stats()[0]['healthy'])
+
+        pool.web3.balances['0xb'] = 0
+        pool.balance_check_interval = 0
+        with self.assertRaises(NoSignerAvailable):
+            pool.acquire(timeout=0)
+
+    def test_slot_is_released_when_transaction_is_mined(self):
+        from concurrent.futures import Future
+        from .blockchain import send_transaction
+        pool = self.make_pool({'0xa': 100})
+        future = Future()
+        watcher = mock.Mock()
+        watcher.track.return_value = future
+
+        with mock.patch('certificates.blockchain.get_signer_pool', return_value=pool), \
+                mock.patch('certificates.blockchain.get_watcher', return_value=watcher):
+            send_transaction(FakeFunctionCall(None))
+        self.assertEqual(pool.stats()[0]['in_flight'], 1)
+
+        future.set_result(SimpleNamespace(status=1))
+        self.assertEqual(pool.stats()[0]['in_flight'], 0)
+        self.assertEqual(pool.stats()[0]['confirmed'], 1)
+
+
+class LocalSigningTests(TestCase):
+    def setUp(self):
+        from eth_account import Account
+        self.account = Account.create()
+        self.raw_transactions = []
+
+        def handler(method, params):
+            responses = {
+                'eth_chainId': '0x539',
+                'eth_gasPrice': hex(10 ** 9),
+                'eth_getTransactionCount': '0x4',
+                'eth_getBalance': hex(10 ** 18),
+                'eth_estimateGas': hex(30000),
+            }
+            if method == 'eth_sendRawTransaction':
+                self.raw_transactions.append(params[0])
+                return Web3.to_hex(Web3.keccak(hexstr=params[0]))
+            return responses[method]
+
+        self.node = StandInNode(handler=handler)
+        self.addCleanup(self.node.close)
+
+    def test_transactions_are_signed_locally(self):
+        from eth_account import Account
+        from .signers import SignerPool
+        from .signing import TransactionFactory
+        from .transport import FailoverHTTPProvider
+
+        w3 = Web3(FailoverHTTPProvider([self.node.url]))
+        contract = w3.eth.contract(address='0x' + '11' * 20, abi=[{
+            'type': 'function', 'name': 'revokeCertificate', 'stateMutability': 'nonpayable',
+            'inputs': [{'name': 'certHash', 'type': 'bytes32'}], 'outputs': [],
+        }])
+        factory = TransactionFactory(w3)
+        pool = SignerPool(w3, [self.account], factory=factory)
+
+        for i in range(3):
+            pool.send(contract.functions.revokeCertificate(bytes([i]) * 32))
+
+        # Chain id, gas price, balance and starting nonce are read once each
+        self.assertEqual(sorted(self.node.methods), sorted([
+            'eth_getBalance', 'eth_getTransactionCount', 'eth_chainId', 'eth_gasPrice',
+        ] + ['eth_estimateGas', 'eth_sendRawTransaction'] * 3))
+        self.assertEqual(len(set(self.raw_transactions)), 3)
+        for raw in self.raw_transactions:
+            self.assertEqual(Account.recover_transaction(raw), self.account.address)
+        self.assertEqual(pool.stats()[0]['signing'], 'local')
+
+    def test_underpriced_send_refreshes_gas_price(self):
+        from .signing import TransactionFactory
+        factory = TransactionFactory(mock.Mock(), gas_price_ttl=600)
+        factory.web3.eth.gas_price = 1
+        factory.web3.eth.send_raw_transaction.side_effect = ValueError('transaction underpriced')
+        function_call = mock.Mock(fn_name='revokeCertificate')
+        function_call.estimate_gas.return_value = 100000
+        function_call.build_transaction.side_effect = lambda tx: dict(tx, to='0x' + '11' * 20, data='0x', value=0)
+        factory.web3.eth.chain_id = 1337
+
+        with self.assertRaises(ValueError):
+            factory.send(function_call, self.account, 0)
+        factory.web3.eth.gas_price = 2
+        self.assertEqual(factory.gas_price(), 2)
+
+    def test_reverting_call_is_never_sent(self):
+        """A duplicate issuance fails its gas estimate instead of being mined"""
+        from web3.exceptions import ContractLogicError
+        from .signing import TransactionFactory
+        factory = TransactionFactory(mock.Mock())
+        function_call = mock.Mock(fn_name='issueCertificate')
+        function_call.estimate_gas.side_effect = ContractLogicError('execution reverted: Certificate already exists')
+
+        with self.assertRaises(ContractLogicError):
+            factory.send(function_call, self.account, 0)
+        factory.web3.eth.send_raw_transaction.assert_not_called()
+
+
+class FakeEventContract:
+    """Contract stand-in whose events return canned logs per block"""
+
+    def __init__(self, logs):
+        self.address = '0x' + '22' * 20
+        self.logs = logs  # event name -> list of logs
+        self.events = self
+
+    def __getitem__(self, name):
+        contract = self
+        return SimpleNamespace(get_logs=lambda from_block, to_block: [
+            log for log in contract.logs.get(name, []) if from_block <= log['blockNumber'] <= to_block
+        ])
+
+
+def fake_log(cert_hash, block):
+    return {'args': {'certHash': cert_hash}, 'blockNumber': block, 'transactionHash': bytes([block]) * 32}
+
+
+class ChainIndexTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+        self.addCleanup(get_verification_cache().clear)
+        self.issued_hash = b'\x0a' * 32
+        self.revoked_hash = b'\x0b' * 32
+        self.contract = FakeEventContract({
+            'CertificateIssued': [fake_log(self.issued_hash, 3), fake_log(self.revoked_hash, 4)],
+            'CertificateRevoked': [fake_log(self.revoked_hash, 8)],
+        })
+        self.web3 = SimpleNamespace(eth=SimpleNamespace(block_number=5))
+        self.revocations = use_fresh_revocation_set(self)
+
+    @staticmethod
+    def details(hashes):
+        return [[True, 'Alice', 'CS', 'UoB', 1735689600] for _ in hashes]
+
+    def sync(self, details=None, **kwargs):
+        from .indexer import sync
+        with mock.patch('certificates.indexer.get_client', return_value=(self.web3, self.contract)), \
+                mock.patch('certificates.indexer.verify_certificates_on_chain', side_effect=details or self.details):
+            return sync(**kwargs)
+
+    def test_sync_follows_events_from_checkpoint(self):
+        from .models import ChainCertificate, SyncCheckpoint
+        self.assertEqual(self.sync(), (0, 5, 2))
+        self.assertIsNone(self.sync())
+        self.assertEqual(SyncCheckpoint.objects.get().block_number, 5)
+
+        row = ChainCertificate.objects.get(cert_hash=self.issued_hash)
+        self.assertEqual(row.as_chain_result(), [True, 'Alice', 'CS', 'UoB', 1735689600])
+        self.assertEqual(row.issued_block, 3)
+
+        self.web3.eth.block_number = 10
+        self.assertEqual(self.sync(), (6, 10, 1))
+        revoked = ChainCertificate.objects.get(cert_hash=self.revoked_hash)
+        self.assertTrue(revoked.is_revoked)
+        self.assertEqual(revoked.revoked_block, 8)
+        self.assertFalse(revoked.as_chain_result()[0])
+
+    def test_range_is_retried_when_details_cant_be_read(self):
+        from .blockchain import BlockchainConnectionError
+        from .models import ChainCertificate, SyncCheckpoint
+
+        def one_fails(hashes):
+            return [BlockchainConnectionError("Batch verification request failed")] + self.details(hashes[1:])
+
+        with self.assertRaisesMessage(Exception, 'Could not read certificate'):
+            self.sync(details=one_fails)
+        # Nothing indexed, so no row can be served as issued with empty details
+        self.assertFalse(ChainCertificate.objects.exists())
+        self.assertFalse(SyncCheckpoint.objects.exists())
+
+        self.assertEqual(self.sync(), (0, 5, 2))
+        self.assertEqual(ChainCertificate.objects.get(cert_hash=self.issued_hash).student_name, 'Alice')
+
+    @override_settings(BLOCKCHAIN_INDEX_CONFIRMATIONS=2)
+    def test_recent_blocks_wait_for_confirmations(self):
+        self.assertEqual(self.sync(max_blocks=100), (0, 3, 1))
+
+    @override_settings(CERTIFICATE_VERIFICATION_SOURCE='index')
+    def test_verification_answered_from_index(self):
+        self.sync()
+        Certificate.objects.create(
+            student_name="Alice", course="CS", institution="UoB",
+            issue_date="2025-01-01T00:00:00Z", cert_hash=self.issued_hash,
+            status=Certificate.STATUS_CONFIRMED,
+        )
+        url = reverse('verify_certificate', args=[self.issued_hash.hex()])
+        with mock.patch('certificates.views.verify_certificate_on_chain') as mock_verify:
+            response = APIClient().get(url)
+        mock_verify.assert_not_called()
+        self.assertTrue(response.data['is_valid'])
+        self.assertEqual(response.data['verified_from'], 'index')
+        self.assertEqual(response.data['indexed_block'], 5)
+
+        with mock.patch('certificates.views.verify_certificate_on_chain',
+                        return_value=[True, 'Alice', 'CS', 'UoB', 1735689600]) as mock_verify:
+            response = APIClient().get(url, {'strict': 'true'})
+        mock_verify.assert_called_once()
+        self.assertEqual(response.data['verified_from'], 'chain')
+
+    def test_revoke_only_rows_are_left_to_the_contract(self):
+        """A hash seen only in a revoke event has no details to answer with"""
+        from .indexer import indexed_results
+        from .models import ChainCertificate
+        self.sync()
+        revoke_only = b'\x0c' * 32
+        ChainCertificate.objects.create(cert_hash=revoke_only, is_revoked=True, revoked_block=4)
+
+        results = indexed_results([self.issued_hash, revoke_only])
+        self.assertEqual(list(results), [self.issued_hash])
+        self.assertEqual(results[self.issued_hash], ([True, 'Alice', 'CS', 'UoB', 1735689600], 5))
+
+    def test_contract_is_asked_by_default(self):
+        self.sync()
+        Certificate.objects.create(
+            student_name="Alice", course="CS", institution="UoB",
+            issue_date="2025-01-01T00:00:00Z", cert_hash=self.issued_hash,
+            status=Certificate.STATUS_CONFIRMED,
+        )
+        url = reverse('verify_certificate', args=[self.issued_hash.hex()])
+        with mock.patch('certificates.views.verify_certificate_on_chain',
+                        return_value=[True, 'Alice', 'CS', 'UoB', 1735689600]) as mock_verify:
+            response = APIClient().get(url)
+        mock_verify.assert_called_once()
+        self.assertEqual(response.data['verified_from'], 'chain')
+
+    def test_index_command(self):
+        from io import StringIO
+        out = StringIO()
+        with mock.patch('certificates.indexer.get_client', return_value=(self.web3, self.contract)), \
+                mock.patch('certificates.indexer.verify_certificates_on_chain', side_effect=self.details):
+            call_command('index_chain', stdout=out)
+        self.assertIn('Blocks 0-5: 2 events', out.getvalue())
+
+
+class RevocationSetTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+        self.revocations = use_fresh_revocation_set(self)
+        self.certificate = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=b'\xcd' * 32,
+            status=Certificate.STATUS_CONFIRMED
+        )
+        self.url = reverse('verify_certificate', args=[self.certificate.cert_hash.hex()])
+        self.chain_result = [True, 'Alice', 'CS', 'UoB', 1735689600]
+
+    def test_loads_revoked_hashes_once(self):
+        from .models import ChainCertificate
+        from .revocations import record_revocation
+        Certificate.objects.filter(pk=self.certificate.pk).update(is_revoked=True)
+        record_revocation()
+        ChainCertificate.objects.create(cert_hash=b'\xee' * 32, is_revoked=True)
+        record_revocation()
+
+        self.assertIn(self.certificate.cert_hash, self.revocations)
+        with self.assertNumQueries(0):
+            self.assertIn('0x' + 'ee' * 32, self.revocations)
+            self.assertNotIn(b'\x01' * 32, self.revocations)
+        self.assertEqual(self.revocations.version, 2)
+
+    def test_revocations_by_other_processes_are_picked_up(self):
+        from .revocations import record_revocation
+        self.assertNotIn(self.certificate.cert_hash, self.revocations)
+        Certificate.objects.filter(pk=self.certificate.pk).update(is_revoked=True)
+        record_revocation()
+
+        # Until the refresh interval passes the set is not re-checked
+        self.assertNotIn(self.certificate.cert_hash, self.revocations)
+        self.revocations.refresh_interval = 0
+        self.assertIn(self.certificate.cert_hash, self.revocations)
+
+        # With nothing new, a check is one lookup of the stamp
+        with self.assertNumQueries(1):
+            self.assertIn(self.certificate.cert_hash, self.revocations)
+
+    @mock.patch('certificates.views.revoke_certificate')
+    def test_revoked_certificate_skips_cache_and_chain(self, mock_revoke):
+        client = APIClient()
+        with mock.patch('certificates.views.verify_certificate_on_chain', return_value=self.chain_result):
+            self.assertTrue(client.get(self.url).data['is_valid'])
+
+        # Revoked by another worker: only the database row changes, this
+        # worker's verification cache still holds the old answer
+        Certificate.objects.filter(pk=self.certificate.pk).update(is_revoked=True)
+        self.revocations.add(self.certificate.cert_hash)
+
+        with mock.patch('certificates.views.verify_certificate_on_chain') as mock_verify, \
+                self.assertNumQueries(0):
+            response = client.get(self.url)
+        mock_verify.assert_not_called()
+        self.assertFalse(response.data['is_valid'])
+        self.assertTrue(response.data['certificate']['is_revoked'])
+        self.assertEqual(response.data['verified_from'], 'revocations')
+
+    @mock.patch('certificates.views.revoke_certificate')
+    def test_revoke_view_updates_set(self, mock_revoke):
+        from .revocations import RevocationSet
+        self.revocations.load()
+        other_worker = RevocationSet(refresh_interval=0)
+        other_worker.load()
+        APIClient().post(reverse('revoke_certificate', args=[self.certificate.cert_hash.hex()]))
+        with self.assertNumQueries(0):
+            self.assertIn(self.certificate.cert_hash, self.revocations)
+        self.assertIn(self.certificate.cert_hash, other_worker)
+        self.assertEqual(other_worker.version, 1)
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        import os
+        from .bloom import BloomFilter
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        members = [os.urandom(32) for _ in range(2000)]
+        for member in members:
+            bloom.add(member)
+        self.assertTrue(all(member in bloom for member in members))
+        false_positives = sum(os.urandom(32) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_unknown_hash_is_rejected_without_queries(self):
+        Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=b'\x42' * 32,
+        )
+        shield = use_fresh_hash_shield(self)
+        use_fresh_revocation_set(self).load()
+
+        with mock.patch('certificates.views.verify_certificate_on_chain') as mock_verify, \
+                self.assertNumQueries(0):
+            response = APIClient().get(reverse('verify_certificate', args=['77' * 32]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        mock_verify.assert_not_called()
+
+        stats = APIClient().get(reverse('verification_cache_stats')).data['bloom_filter']
+        # One lookup covers the exact hash and the prefix fallback
+        self.assertEqual((stats['checks'], stats['rejections']), (1, 1))
+        self.assertTrue(shield.might_exist(b'\x42' * 32))
+
+    def test_new_certificates_are_added(self):
+        shield = use_fresh_hash_shield(self)
+        cert_hash = b'\x43' * 32
+        self.assertFalse(shield.might_exist(cert_hash))
+
+        # Saved in this process: added straight away by the post_save hook
+        Certificate.objects.create(
+            student_name='Bob', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=cert_hash,
+        )
+        self.assertTrue(shield.might_exist(cert_hash))
+
+        # Inserted elsewhere: picked up on the next refresh
+        other = b'\x44' * 32
+        Certificate.objects.bulk_create([Certificate(
+            student_name='Carol', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash=other,
+        )])
+        shield.refresh_interval = 0
+        self.assertTrue(shield.might_exist(other))
+
+        # Changed in place: added by the same hook
+        certificate = Certificate.objects.get(cert_hash=cert_hash)
+        certificate.cert_hash = b'\x45' * 32
+        certificate.save()
+        self.assertTrue(shield.might_exist(b'\x45' * 32))
+
+    def test_rows_committed_out_of_order_are_not_ruled_out(self):
+        """A lower id that becomes visible late still reaches the filter"""
+        def row(pk, cert_hash):
+            return Certificate(
+                id=pk, student_name='Dan', course='CS', institution='UoB',
+                issue_date='2025-01-01T00:00:00Z', cert_hash=cert_hash,
+            )
+
+        Certificate.objects.bulk_create([row(1, b'\x51' * 32)])
+        shield = use_fresh_hash_shield(self)
+        shield.refresh_interval = 0
+        unknown, late = b'\x77' * 32, b'\x52' * 32
+        self.assertFalse(shield.might_exist(unknown))
+
+        # Id 3 commits while id 2 is still in flight
+        Certificate.objects.bulk_create([row(3, b'\x53' * 32)])
+        self.assertTrue(shield.might_exist(b'\x53' * 32))
+        self.assertEqual(shield.stats()['pending_ids'], 1)
+        self.assertTrue(shield.might_exist(unknown))  # left to the database
+
+        Certificate.objects.bulk_create([row(2, late)])
+        self.assertTrue(shield.might_exist(late))
+        self.assertEqual(shield.stats()['pending_ids'], 0)
+        self.assertFalse(shield.might_exist(unknown))
+
+        # An id that never turns up was rolled back
+        Certificate.objects.bulk_create([row(5, b'\x55' * 32)])
+        self.assertTrue(shield.might_exist(unknown))
+        shield.pending_timeout = 0
+        self.assertFalse(shield.might_exist(unknown))
+
+
+class RequestLoggingTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+        self.certificate = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash='0x' + 'cd' * 32,
+            status=Certificate.STATUS_CONFIRMED
+        )
+        use_fresh_revocation_set(self).load()
+        use_fresh_hash_shield(self)
+
+    def test_verification_logs_one_summary_with_stage_timings(self):
+        url = reverse('verify_certificate', args=[self.certificate.cert_hash[2:]])
+        with mock.patch('certificates.views.verify_certificate_on_chain',
+                        return_value=[True, 'Alice', 'CS', 'UoB', 1735689600]), \
+                self.assertLogs('certificates.requests', 'INFO') as logs:
+            response = APIClient().get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual((record.endpoint, record.status_code, record.source), ('verify', 200, 'chain'))
+        self.assertFalse(record.cache_hit)
+        self.assertLessEqual({'hashing', 'db', 'serialization'}, set(record.stages_ms))
+        self.assertGreaterEqual(record.duration_ms, sum(record.stages_ms.values()))
+
+    def test_summary_is_skipped_below_info(self):
+        from .instrumentation import request_logger
+        url = reverse('verify_certificate', args=['ee' * 32])
+        with mock.patch.object(request_logger, 'isEnabledFor', return_value=False), \
+                mock.patch.object(request_logger, 'info') as mock_info:
+            APIClient().get(url)
+        mock_info.assert_not_called()
+
+    def test_nested_code_records_into_the_request_timer(self):
+        from .instrumentation import JsonFormatter, StageTimer, stage
+        with stage('rpc'):
+            pass  # no active timer: nothing to record into
+
+        timer = StageTimer('verify')
+        with timer.activate():
+            with stage('rpc'):
+                pass
+            with stage('rpc'):
+                pass
+        self.assertEqual(list(timer.stages), ['rpc'])
+
+        with self.assertLogs('certificates.requests', 'INFO') as logs:
+            timer.log(200, source='chain')
+        payload = json.loads(JsonFormatter().format(logs.records[0]))
+        self.assertEqual(payload['logger'], 'certificates.requests')
+        self.assertEqual(payload['status_code'], 200)
+        self.assertEqual(payload['source'], 'chain')
+        self.assertIn('rpc', payload['stages_ms'])
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        from .cache import get_verification_cache
+        get_verification_cache().clear()
+        self.certificate = Certificate.objects.create(
+            student_name='Alice', course='CS', institution='UoB',
+            issue_date='2025-01-01T00:00:00Z', cert_hash='0x' + 'ef' * 32,
+            status=Certificate.STATUS_CONFIRMED
+        )
+        use_fresh_revocation_set(self).load()
+        use_fresh_hash_shield(self)
+
+    def test_histogram_exposition(self):
+        from .metrics import Histogram, _registry
+        histogram = Histogram('test_latency_seconds', 'Test latency.', ('view',), buckets=(0.1, 1))
+        self.addCleanup(_registry.remove, histogram)
+        histogram.observe(0.05, view='a"b')
+        histogram.observe(0.5, view='a"b')
+
+        self.assertEqual(histogram.render().splitlines(), [
+            '# HELP test_latency_seconds Test latency.',
+            '# TYPE test_latency_seconds histogram',
+            'test_latency_seconds_bucket{view="a\\"b",le="0.1"} 1',
+            'test_latency_seconds_bucket{view="a\\"b",le="1"} 2',
+            'test_latency_seconds_bucket{view="a\\"b",le="+Inf"} 2',
+            'test_latency_seconds_sum{view="a\\"b"} 0.55',
+            'test_latency_seconds_count{view="a\\"b"} 2',
+        ])
+
+    def test_requests_queries_and_contract_calls_are_recorded(self):
+        from .metrics import CONTRACT_CALL_DURATION, DB_QUERY_DURATION, REQUEST_DURATION
+        web3 = SimpleNamespace()
+        contract = mock.Mock()
+        contract.functions.verifyCertificate.return_value.call.return_value = [True, 'Alice', 'CS', 'UoB', 1735689600]
+        before = (
+            REQUEST_DURATION.count(view='verify_certificate', method='GET'),
+            DB_QUERY_DURATION.count(view='verify_certificate'),
+            CONTRACT_CALL_DURATION.count(function='verifyCertificate', kind='call'),
+        )
+        with mock.patch('certificates.blockchain.get_client', return_value=(web3, contract)):
+            response = self.client.get(reverse('verify_certificate', args=[self.certificate.cert_hash[2:]]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        after = (
+            REQUEST_DURATION.count(view='verify_certificate', method='GET'),
+            DB_QUERY_DURATION.count(view='verify_certificate'),
+            CONTRACT_CALL_DURATION.count(function='verifyCertificate', kind='call'),
+        )
+        self.assertEqual(after[0] - before[0], 1)
+        self.assertGreater(after[1] - before[1], 0)
+        self.assertEqual(after[2] - before[2], 1)
+
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('certificate_http_requests_total{view="verify_certificate",method="GET",status="200"}', body)
+        self.assertIn('certificate_verification_cache_requests_total{namespace="certificate",result="misses"}', body)
+        self.assertIn('# TYPE certificate_contract_call_duration_seconds histogram', body)
+
+    def test_scraping_is_restricted(self):
+        from django.contrib.auth.models import User
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 403)
+        with override_settings(METRICS_ALLOWED_IPS=['203.0.113.0/24']):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 200)
+
+        staff = User.objects.create_user('ops', password='secret', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 200)
+
+    def test_signers_are_not_labelled_by_address(self):
+        from .blockchain import _signer_in_flight
+        pool = SimpleNamespace(stats=lambda: [{'address': '0x' + 'aa' * 20, 'in_flight': 2}])
+        with mock.patch('certificates.blockchain._signer_pool', pool):
+            self.assertEqual(_signer_in_flight(), [({'signer': 0}, 2)])
+
+    @override_settings(CERTIFICATE_ISSUANCE_MODE='batch')
+    def test_queries_made_while_streaming_are_recorded(self):
+        from .metrics import DB_QUERY_DURATION
+        before = DB_QUERY_DURATION.count(view='issue_certificates_bulk')
+        response = self.client.post(
+            reverse('issue_certificates_bulk'),
+            'student_name,course,institution,issue_date\nBob,CS,UoB,1735689600\n',
+            content_type='text/csv',
+        )
+        # The rows are only stored as the body is read
+        self.assertEqual(DB_QUERY_DURATION.count(view='issue_certificates_bulk'), before)
+        b''.join(response.streaming_content)
+        self.assertGreater(DB_QUERY_DURATION.count(view='issue_certificates_bulk'), before)
+        self.assertTrue(Certificate.objects.filter(student_name='Bob').exists())
+
+    def test_receipt_waits_are_observed(self):
+        from .metrics import RECEIPT_WAIT_DURATION
+        from .watcher import ConfirmationWatcher
+        chain = FakeChain()
+        chain.mine('0x' + '11' * 32)
+        watcher = ConfirmationWatcher(chain.web3(), poll_interval=0.01)
+
+        before = RECEIPT_WAIT_DURATION.count(outcome='mined')
+        watcher.wait('0x' + '11' * 32, timeout=5)
+        self.assertEqual(RECEIPT_WAIT_DURATION.count(outcome='mined') - before, 1)
+
+
+class LocalChainTests(TestCase):
+    def setUp(self):
+        from .blockchain import reset_client
+        from .localchain import ABI_PATH, LocalChain
+        self.chain = LocalChain()
+        self.addCleanup(self.chain.stop)
+        settings = override_settings(
+            BLOCKCHAIN_RPC_ENDPOINTS=[self.chain.start()],
+            BLOCKCHAIN_CONTRACT_ABI_PATH=ABI_PATH,
+            BLOCKCHAIN_CONTRACT_ADDRESS=self.chain.contract_address,
+            BLOCKCHAIN_SIGNER_KEYS=[],
+            BLOCKCHAIN_SIGNER_ACCOUNTS=[],
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        reset_client()
+        self.addCleanup(reset_client)
+
+    def test_issue_verify_and_revoke_round_trip(self):
+        from . import blockchain
+        seeded = self.chain.seed('Alice', 'CS', 'UoB', 1735689600)
+        self.assertEqual(blockchain.verify_certificate_on_chain(seeded), [True, 'Alice', 'CS', 'UoB', 1735689600])
+
+        with mock.patch('certificates.blockchain.is_test_mode', return_value=False):
+            issued = blockchain.issue_certificate('Bob', 'Maths', 'UoB', 1735689601)
+        self.assertEqual(
+            bytes.fromhex(issued['cert_hash'][2:]),
+            blockchain.generate_certificate_hash('Bob', 'Maths', 'UoB', 1735689601),
+        )
+        self.assertTrue(blockchain.revoke_certificate(issued['cert_hash']))
+
+        results = blockchain.verify_certificates_on_chain([seeded, issued['cert_hash'], b'\x01' * 32])
+        self.assertEqual(results[0][0], True)
+        self.assertEqual(results[1], [False, 'Bob', 'Maths', 'UoB', 1735689601])
+        self.assertEqual(str(results[2]), 'Certificate not found on blockchain')
+
+    def test_out_of_order_nonces_are_held_until_the_gap_fills(self):
+        account = self.chain.accounts[0]
+        contract = Web3().eth.contract(abi=self.chain.abi)
+
+        def send(nonce, name):
+            return self.chain.handle('eth_sendTransaction', [{
+                'from': account, 'to': self.chain.contract_address, 'nonce': hex(nonce),
+                'data': contract.encode_abi('issueCertificate', args=[name, 'CS', 'UoB', 1]),
+            }])
+
+        # Deploying the contract used the account's first nonce
+        next_nonce = int(self.chain.handle('eth_getTransactionCount', [account, 'pending']), 16)
+        later = send(next_nonce + 1, 'Second')
+        self.assertIsNone(self.chain.handle('eth_getTransactionReceipt', [later]))
+        self.assertEqual(self.chain.handle('eth_getTransactionCount', [account, 'pending']), hex(next_nonce))
+        send(next_nonce, 'First')
+        self.assertEqual(self.chain.handle('eth_getTransactionReceipt', [later])['status'], '0x1')
+        with self.assertRaisesMessage(Exception, 'nonce too low'):
+            send(next_nonce, 'Third')
+
+    def test_raw_transactions_and_estimates_follow_the_contract(self):
+        from eth_account import Account
+        signer = Account.create()
+        contract = Web3().eth.contract(address=self.chain.contract_address, abi=self.chain.abi)
+        call = {'to': self.chain.contract_address,
+                'data': contract.encode_abi('issueCertificate', args=['Dan', 'CS', 'UoB', 1])}
+
+        def sign(chain_id):
+            return Web3.to_hex(signer.sign_transaction(dict(
+                call, nonce=0, gas=100000, gasPrice=self.chain.gas_price, chainId=chain_id,
+            )).raw_transaction)
+
+        with self.assertRaisesMessage(Exception, 'invalid chain id'):
+            self.chain.handle('eth_sendRawTransaction', [sign(self.chain.chain_id + 1)])
+        self.chain.handle('eth_estimateGas', [call])
+        tx_hash = self.chain.handle('eth_sendRawTransaction', [sign(self.chain.chain_id)])
+        receipt = self.chain.handle('eth_getTransactionReceipt', [tx_hash])
+        self.assertEqual((receipt['from'], receipt['status']), (signer.address.lower(), '0x1'))
+        # The certificate exists now, so issuing it again reverts before it is sent
+        with self.assertRaisesMessage(Exception, 'Certificate already exists'):
+            self.chain.handle('eth_estimateGas', [call])
+
+
+@override_settings(BLOCKCHAIN_BACKEND='local', BLOCKCHAIN_SIGNER_KEYS=[], BLOCKCHAIN_SIGNER_ACCOUNTS=[])
+class BlockchainBackendTests(TestCase):
+    def setUp(self):
+        from .backends import reset_backend
+        from .blockchain import reset_client
+        for reset in (reset_backend, reset_client):
+            reset()
+            self.addCleanup(reset)
+        use_fresh_hash_shield(self)
+
+    def test_local_backend_issues_and_verifies_in_process(self):
+        from .backends import LocalChainBackend, get_backend
+        backend = get_backend()
+        self.assertIsInstance(backend, LocalChainBackend)
+        self.assertIsNone(backend.chain.server)
+
+        payload = {'student_name': 'Carol', 'course': 'Physics', 'institution': 'UoB', 'issue_date': '1735689600'}
+        with mock.patch('certificates.blockchain.is_test_mode', return_value=False):
+            response = APIClient().post(reverse('issue_certificate'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cert_hash = response.data['cert_hash']
+        self.assertEqual(backend.chain.certificates[bytes.fromhex(cert_hash[2:])][0], 'Carol')
+
+        response = APIClient().get(reverse('verify_certificate', args=[cert_hash]), {'strict': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['blockchain_valid'])
+
+    def test_local_backend_accepts_locally_signed_transactions(self):
+        from eth_account import Account
+        from . import blockchain
+        from .backends import get_backend
+        signer = Account.create()
+        with override_settings(BLOCKCHAIN_SIGNER_KEYS=[signer.key.hex()]), \
+                mock.patch('certificates.blockchain.is_test_mode', return_value=False):
+            issued = blockchain.issue_certificate('Dave', 'CS', 'UoB', 1735689600)
+            receipt = get_backend().receipt(Web3.to_bytes(hexstr=issued['transaction_hash']))
+            self.assertEqual((receipt['from'], receipt['status']), (signer.address, 1))
+            self.assertEqual(blockchain.verify_certificate_on_chain(issued['cert_hash'])[:2], [True, 'Dave'])
+            with self.assertRaisesMessage(blockchain.SmartContractError, 'already exists'):
+                blockchain.issue_certificate('Dave', 'CS', 'UoB', 1735689600)
+        self.assertEqual(get_backend().chain.nonces[signer.address.lower()], 1)
+
+    def test_health_reports_backend(self):
+        response = APIClient().get(reverse('blockchain_health'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['backend'], 'local')
+        self.assertTrue(response.data['contract_loaded'])
+
+    @override_settings(BLOCKCHAIN_BACKEND='ganache')
+    def test_unknown_backend_is_improperly_configured(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from .blockchain import get_client
+        with self.assertRaises(ImproperlyConfigured):
+            get_client()
+
+    def test_missing_abi_is_improperly_configured(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from .blockchain import get_client
+        from .localchain import LocalChain
+        chain = LocalChain()
+        self.addCleanup(chain.stop)
+        with override_settings(BLOCKCHAIN_BACKEND='rpc', BLOCKCHAIN_RPC_ENDPOINTS=[chain.start()],
+                               BLOCKCHAIN_CONTRACT_ABI_PATH='missing/CertificateVerification.json'):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'Contract ABI file not found'):
+                get_client()
+            response = APIClient().get(reverse('blockchain_health'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Contract ABI file not found', response.data['error'])
+
+
+class RehashCertificatesTests(TestCase):
+    def setUp(self):
+        from .blockchain import generate_certificate_hash
+        self.expected = {}
+        for i in range(5):
+            certificate = Certificate.objects.create(
+                student_name=f'Student {i}', course='CS', institution='UoB',
+                issue_date='2025-01-01T00:00:00Z', cert_hash=bytes([i + 1]) * 32,
+            )
+            self.expected[certificate.pk] = generate_certificate_hash(f'Student {i}', 'CS', 'UoB', 1735689600)
+
+    def stored_hashes(self):
+        return {pk: bytes(cert_hash) for pk, cert_hash in Certificate.objects.values_list('id', 'cert_hash')}
+
+    def test_stale_hashes_are_rewritten_in_chunks(self):
+        from io import StringIO
+        from .models import SyncCheckpoint
+        out = StringIO()
+        call_command('rehash_certificates', chunk_size=2, workers=2, stdout=out)
+        self.assertEqual(self.stored_hashes(), self.expected)
+        self.assertEqual(out.getvalue().count('scanned, 2 changed'), 2)
+        self.assertIn('5 certificates scanned, 5 hashes changed', out.getvalue())
+        self.assertFalse(SyncCheckpoint.objects.filter(name='rehash-certificates').exists())
+
+        out = StringIO()
+        call_command('rehash_certificates', dry_run=True, workers=1, stdout=out)
+        self.assertIn('0 hashes would change', out.getvalue())
+
+    def test_interrupted_run_resumes_after_last_committed_chunk(self):
+        from .hashing import certificate_hashes
+        from .rehashing import rehash
+        ids = sorted(self.expected)
+        chunks = rehash(chunk_size=2, workers=1)
+        self.assertEqual(next(chunks), (ids[0], ids[1], 2, 2, 0))
+        chunks.close()  # interrupted
+
+        stored = self.stored_hashes()
+        self.assertEqual([stored[pk] == self.expected[pk] for pk in ids], [True, True, False, False, False])
+        with mock.patch('certificates.rehashing.certificate_hashes', wraps=certificate_hashes) as mock_hash:
+            self.assertEqual([chunk[:2] for chunk in rehash(chunk_size=2, workers=1)],
+                             [(ids[2], ids[3]), (ids[4], ids[4])])
+        self.assertEqual(sum(len(call.args[0]) for call in mock_hash.call_args_list), 3)
+        self.assertEqual(self.stored_hashes(), self.expected)
+
+    def test_other_processes_see_rewritten_hashes(self):
+        from io import StringIO
+        from .bloom import HashShield
+        other_worker = HashShield(refresh_interval=0)
+        other_worker.rebuild()
+        new_hash = self.expected[min(self.expected)]
+        self.assertFalse(other_worker.might_exist(new_hash))
+
+        call_command('rehash_certificates', workers=1, stdout=StringIO())
+        # No post_save and no new ids: only the version stamp tells it to rebuild
+        self.assertTrue(other_worker.might_exist(new_hash))
+
+    def test_batched_certificates_are_left_alone(self):
+        from io import StringIO
+        from .models import CertificateBatch
+        batch = CertificateBatch.objects.create(merkle_root='0x' + '04' * 32, size=1, anchored_at=1735689600)
+        batched = min(self.expected)
+        Certificate.objects.filter(pk=batched).update(batch=batch, merkle_proof=[])
+        out = StringIO()
+        call_command('rehash_certificates', workers=1, stdout=out)
+        self.assertEqual(self.stored_hashes()[batched], bytes([1]) * 32)
+        self.assertIn('5 certificates scanned, 4 hashes changed', out.getvalue())
+        self.assertIn('1 certificates anchored in Merkle batches have stale hashes', out.getvalue())
+
+
+@override_settings(BLOCKCHAIN_BACKEND='local')
+class AsyncVerificationTests(TestCase):
+    def setUp(self):
+        from .backends import get_backend, reset_backend
+        from .blockchain import reset_client
+        from .cache import get_verification_cache
+        for reset in (reset_backend, reset_client, get_verification_cache().clear):
+            reset()
+            self.addCleanup(reset)
+        chain = get_backend().chain
+        self.hashes = []
+        for i, name in enumerate(['Alice', 'Bob', 'Carol']):
+            cert_hash = chain.seed(name, 'CS', 'UoB', 1735689600 + i)
+            Certificate.objects.create(
+                student_name=name, course='CS', institution='UoB',
+                issue_date='2025-01-01T00:00:00Z', cert_hash=cert_hash,
+                status=Certificate.STATUS_CONFIRMED
+            )
+            self.hashes.append('0x' + cert_hash.hex())
+        use_fresh_revocation_set(self).load()
+        use_fresh_hash_shield(self)
+
+    def test_async_endpoints_answer_like_sync_ones(self):
+        from .cache import get_verification_cache
+        from .metrics import DB_QUERY_DURATION
+        queries_before = DB_QUERY_DURATION.count(view='verify_certificate_async')
+        for query in ({'strict': 'true'}, {}):
+            get_verification_cache().clear()
+            expected = self.client.get(reverse('verify_certificate', args=[self.hashes[0]]), query)
+            get_verification_cache().clear()
+            response = self.client.get(reverse('verify_certificate_async', args=[self.hashes[0]]), query)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), expected.json())
+            self.assertTrue(response.json()['blockchain_valid'])
+        self.assertGreater(DB_QUERY_DURATION.count(view='verify_certificate_async'), queries_before)
+
+        self.assertEqual(self.client.get(reverse('verify_certificate_async', args=['0x' + '00' * 32])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+        payload = {'cert_hashes': self.hashes + ['not-a-hash', '0x' + '00' * 32], 'strict': True}
+        get_verification_cache().clear()
+        expected = self.client.post(reverse('verify_certificates_batch'), payload, content_type='application/json')
+        get_verification_cache().clear()
+        response = self.client.post(reverse('verify_certificates_batch_async'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual([result.get('is_valid') for result in response.json()['results']],
+                         [True, True, True, None, None])
+
+    @staticmethod
+    def slow_node():
+        """A make_request for AsyncLocalChainProvider that takes a while to
+        answer, and the record of how many calls were waiting at once"""
+        import asyncio
+        calls = {'in_flight': 0, 'peak': 0}
+
+        async def slow_make_request(provider, method, params):
+            calls['in_flight'] += 1
+            calls['peak'] = max(calls['peak'], calls['in_flight'])
+            try:
+                await asyncio.sleep(0.05)  # a slow node round trip
+                return provider._respond(method, params)
+            finally:
+                calls['in_flight'] -= 1
+
+        return slow_make_request, calls
+
+    async def test_verifications_wait_on_the_chain_concurrently(self):
+        import asyncio
+        from django.test import AsyncRequestFactory
+        from .localchain import AsyncLocalChainProvider
+        from .views import verify_certificate_async_view
+
+        slow_make_request, calls = self.slow_node()
+
+        factory = AsyncRequestFactory()
+        requests = [
+            factory.get(f'/api/certificates/verify/async/{cert_hash}/', {'strict': 'true'})
+            for cert_hash in self.hashes * 50
+        ]
+        with mock.patch.object(AsyncLocalChainProvider, 'make_request', slow_make_request):
+            responses = await asyncio.gather(*(
+                verify_certificate_async_view(request, request.path.split('/')[-2]) for request in requests
+            ))
+
+        self.assertEqual({response.status_code for response in responses}, {status.HTTP_200_OK})
+        self.assertTrue(all(json.loads(response.content)['is_valid'] for response in responses))
+        # The requests waited on the node together, not one after another
+        self.assertGreater(calls['peak'], 1)
+
+    async def test_lookups_stay_off_the_database_thread_under_asgi(self):
+        import asyncio
+        import threading
+        from django.core.handlers.asgi import ASGIHandler
+        from django.core.signals import request_started
+        from django.db import close_old_connections
+        from . import views
+        from .localchain import AsyncLocalChainProvider
+        from .revocations import get_revocation_set
+
+        # The handler would otherwise close the test's connection per request
+        request_started.disconnect(close_old_connections)
+        self.addCleanup(request_started.connect, close_old_connections)
+        get_revocation_set().refresh_interval = 60
+        handler = ASGIHandler()
+
+        async def get(cert_hash):
+            path = reverse('verify_certificate_async', args=[cert_hash])
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'strict=true',
+                'headers': [(b'host', b'testserver')], 'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+            }
+            disconnected = asyncio.Event()
+            body = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            sent = []
+
+            async def receive():
+                if body:
+                    return body.pop()
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+
+            await handler(scope, receive, send)
+            disconnected.set()
+            return sent[0]['status'], json.loads(b''.join(m.get('body', b'') for m in sent[1:]))
+
+        slow_make_request, calls = self.slow_node()
+        lookup_threads = set()
+
+        def cached_verification(*args):
+            lookup_threads.add(threading.current_thread())
+            return cached(*args)
+
+        cached = views._cached_verification
+        with mock.patch.object(AsyncLocalChainProvider, 'make_request', slow_make_request), \
+                mock.patch('certificates.views._cached_verification', cached_verification):
+            responses = await asyncio.gather(*(get(cert_hash) for cert_hash in self.hashes * 50))
+
+        self.assertEqual({code for code, _ in responses}, {status.HTTP_200_OK})
+        self.assertTrue(all(body['is_valid'] for _, body in responses))
+        self.assertGreater(calls['peak'], 1)
+        # The async ORM's thread sensitive calls run on the test's own thread
+        self.assertTrue(lookup_threads)
+        self.assertNotIn(threading.main_thread(), lookup_threads)
+
+
+class CertificateHashingTests(TestCase):
+    RECORDS = [
+        ('Alice', 'CS', 'UoB', 1735689600),
+        ('', '', '', 0),
+        ('Zoë Ñúñez', '计算机科学', 'Université de Genève 🎓', 946684800),
+        ('A' * 1000, 'Course', 'Institution', 2 ** 256 - 1),
+    ]
+
+    def test_matches_abi_encode_packed(self):
+        from .hashing import certificate_hash, certificate_hashes
+        expected = [
+            bytes(Web3.solidity_keccak(['string', 'string', 'string', 'uint256'], list(record)))
+            for record in self.RECORDS
+        ]
+        self.assertEqual([certificate_hash(*record) for record in self.RECORDS], expected)
+        self.assertEqual(certificate_hashes(self.RECORDS), expected)
+        self.assertEqual(certificate_hashes([]), [])
+
+    def test_issue_date_must_fit_uint256(self):
+        from .hashing import certificate_hash
+        for issue_date in (-1, 2 ** 256, '1735689600', 1735689600.0):
+            with self.assertRaises(ValueError):
+                certificate_hash('Alice', 'CS', 'UoB', issue_date)
+
+
+@override_settings(BLOCKCHAIN_BACKEND='local')
+class ReconciliationTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from .backends import get_backend, reset_backend
+        from .blockchain import reset_client
+        for reset in (reset_backend, reset_client):
+            reset()
+            self.addCleanup(reset)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.report = f'{temp_dir.name}/report.jsonl'
+
+        chain = get_backend().chain
+        self.ids = {}
+        for name, on_chain, revoked, status_ in [
+            ('Alice', True, False, Certificate.STATUS_CONFIRMED),
+            ('Bob', False, False, Certificate.STATUS_CONFIRMED),
+            ('Carol', True, True, Certificate.STATUS_CONFIRMED),
+            ('Dave', True, False, Certificate.STATUS_CONFIRMED),
+            ('Erin', False, False, Certificate.STATUS_PENDING),
+        ]:
+            cert_hash = chain.seed(name, 'CS', 'UoB', 1735689600) if on_chain else bytes([len(self.ids) + 1]) * 32
+            self.ids[name] = Certificate.objects.create(
+                student_name=name if name != 'Dave' else 'David', course='CS', institution='UoB',
+                issue_date='2025-01-01T00:00:00Z', cert_hash=cert_hash, is_revoked=revoked, status=status_,
+            ).pk
+
+    def read_report(self):
+        with open(self.report) as report:
+            return [json.loads(line) for line in report]
+
+    def test_reports_each_kind_of_discrepancy(self):
+        from io import StringIO
+        from .models import SyncCheckpoint
+        out = StringIO()
+        call_command('reconcile', report=self.report, chunk_size=2, batch_size=1, workers=2, rate=1000, stdout=out)
+        report = {entry['id']: entry for entry in self.read_report()}
+        self.assertEqual(set(report), {self.ids['Bob'], self.ids['Carol'], self.ids['Dave']})
+        self.assertEqual(report[self.ids['Bob']]['issue'], 'missing_on_chain')
+        self.assertEqual(report[self.ids['Carol']]['issue'], 'revoked_mismatch')
+        self.assertEqual(report[self.ids['Dave']]['fields'], {'student_name': ['David', 'Dave']})
+        self.assertIn('4 certificates checked', out.getvalue())
+        self.assertIn('1 missing on chain, 1 revoked mismatches, 1 field mismatches', out.getvalue())
+        self.assertFalse(SyncCheckpoint.objects.filter(name='reconcile-certificates').exists())
+
+    def test_compare_reports_every_discrepancy_of_a_row(self):
+        from datetime import datetime, timezone
+        from .reconciliation import compare
+        epoch = datetime.fromtimestamp(0, timezone.utc)
+        row = (1, 'Alice', 'CS', 'UoB', epoch, True, b'\x01' * 32)
+        self.assertEqual(compare(row, ('Alice', 'CS', 'UoB', 0, False)), [])
+        self.assertEqual([d['issue'] for d in compare(row, ('Alicia', 'CS', 'UoB', 0, True))],
+                         ['field_mismatch', 'revoked_mismatch'])
+        self.assertEqual([d['issue'] for d in compare(row, ('', '', '', 0, False))], ['missing_on_chain'])
+
+    def test_interrupted_run_resumes_and_appends_to_report(self):
+        from io import StringIO
+        from django.core.management import CommandError
+        from .blockchain import BlockchainConnectionError
+        from .reconciliation import reconcile
+        chunks = reconcile(self.report, chunk_size=2)
+        self.assertEqual(next(chunks)[2:], (2, {'missing_on_chain': 1}))
+        chunks.close()  # interrupted
+
+        with mock.patch('certificates.reconciliation.read_certificates_on_chain',
+                        side_effect=BlockchainConnectionError("Batch certificate read failed")):
+            with self.assertRaisesMessage(CommandError, 'Run the command again to resume'):
+                call_command('reconcile', report=self.report, chunk_size=2, stdout=StringIO())
+        self.assertEqual(len(self.read_report()), 1)
+
+        self.assertEqual([chunk[:3] for chunk in reconcile(self.report, chunk_size=2)],
+                         [(self.ids['Carol'], self.ids['Dave'], 2)])
+        self.assertEqual(len(self.read_report()), 3)
+        list(reconcile(self.report, chunk_size=2, restart=True))
+        self.assertEqual(len(self.read_report()), 3)
+
+    def test_rate_limiter_spaces_out_calls(self):
+        import time
+        from .reconciliation import RateLimiter
+        limiter = RateLimiter(100)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire(5)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+class CertificateListingTests(TestCase):
+    def setUp(self):
+        from datetime import datetime, timezone
+        self.ids = []
+        for i, (institution, course, day, revoked) in enumerate([
+            ('UoB', 'CS', 1, False), ('UoB', 'Maths', 2, False), ('MIT', 'CS', 2, True),
+            ('UoB', 'CS', 2, False), ('MIT', 'Physics', 3, False), ('UoB', 'CS', 4, True),
+            ('UoB', 'CS', 5, False),
+        ]):
+            self.ids.append(Certificate.objects.create(
+                student_name=f'Student {i}', course=course, institution=institution,
+                issue_date=datetime(2025, 1, day, tzinfo=timezone.utc), cert_hash=bytes([i + 1]) * 32,
+                is_revoked=revoked,
+            ).pk)
+
+    def list_ids(self, **params):
+        """Follow next links from the first page; returns the ids in order and the page count"""
+        response = APIClient().get(reverse('list_certificates'), params)
+        ids, pages = [], 0
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [certificate['id'] for certificate in response.data['results']]
+            pages += 1
+            if response.data['next'] is None:
+                return ids, pages
+            response = APIClient().get(response.data['next'])
+
+    def test_pages_walk_newest_first_without_gaps_or_repeats(self):
+        ids, pages = self.list_ids(page_size=3)
+        expected = [self.ids[i] for i in (6, 5, 4, 3, 2, 1, 0)]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+        with override_settings(CERTIFICATE_LIST_PAGE_SIZE=2):
+            self.assertEqual(self.list_ids(), (expected, 4))
+
+    def test_filters(self):
+        self.assertEqual(self.list_ids(institution='UoB', course='CS', page_size=2)[0],
+                         [self.ids[i] for i in (6, 5, 3, 0)])
+        self.assertEqual(self.list_ids(is_revoked='true')[0], [self.ids[5], self.ids[2]])
+        self.assertEqual(self.list_ids(issue_date_after=1735776000, issue_date_before=1735862400, page_size=1)[0],
+                         [self.ids[i] for i in (4, 3, 2, 1)])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'cursor': 'not-a-cursor'}, {'page_size': '0'}, {'page_size': '501'},
+                       {'issue_date_after': 'yesterday'}, {'is_revoked': 'maybe'}):
+            response = APIClient().get(reverse('list_certificates'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertIn('error', response.data)
+
+    def test_deep_pages_are_an_index_range_scan(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .pagination import encode_cursor, keyset_page
+        if connection.vendor != 'sqlite':
+            self.skipTest("Checks SQLite's query plan")
+        cursor = encode_cursor(Certificate.objects.get(pk=self.ids[3]))
+        with CaptureQueriesContext(connection) as queries:
+            certificates, _ = keyset_page(Certificate.objects.filter(institution='UoB'), cursor, page_size=10)
+        self.assertEqual([certificate.pk for certificate in certificates], [self.ids[1], self.ids[0]])
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+
+        with connection.cursor() as db_cursor:
+            db_cursor.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'])
+            plan = ' '.join(str(row[-1]) for row in db_cursor.fetchall())
+        self.assertIn('cert_institution_date_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+class BenchmarkTests(TestCase):
+    def test_percentiles_and_summary(self):
+        from .benchmark import percentile, summarize
+        values = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 0.5), 0.05)
+        self.assertEqual(percentile(values, 0.99), 0.099)
+        self.assertIsNone(percentile([], 0.5))
+
+        summary = summarize(values, {'200': 98, '500': 2}, 2.0)
+        self.assertEqual(summary['requests'], 100)
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(summary['requests_per_second'], 50.0)
+        self.assertEqual(summary['latency_ms']['p95'], 95.0)
+
+    def test_workloads_are_reproducible(self):
+        from .benchmark import workload_requests
+        hashes = ['0x' + f'{i:064x}' for i in range(20)]
+        self.assertEqual(
+            workload_requests('verify_batch', hashes, 5, batch_size=4, seed=7),
+            workload_requests('verify_batch', hashes, 5, batch_size=4, seed=7),
+        )
+        revokes = workload_requests('revoke', hashes, 3)
+        self.assertEqual([path.split('/')[-2] for _, path, _ in revokes], hashes[-3:])
+
+    def test_run_workload_times_requests_over_http(self):
+        from .benchmark import run_workload, serve
+
+        def app(environ, start_response):
+            code = '404 Not Found' if environ['PATH_INFO'] == '/missing' else '200 OK'
+            start_response(code, [('Content-Type', 'text/plain')])
+            return [b'ok']
+
+        server, base_url = serve(app)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        result = run_workload(base_url, [('GET', '/', None)] * 9 + [('GET', '/missing', None)], concurrency=3)
+        self.assertEqual(result['requests'], 10)
+        self.assertEqual(result['status_codes'], {'200': 9, '404': 1})
+        self.assertEqual(result['errors'], 1)
+
+    def test_hashing_benchmark_compares_against_solidity_keccak(self):
+        from .benchmark import hashing_benchmark
+        result = hashing_benchmark(200)
+        self.assertTrue(result['identical'])
+        self.assertEqual(set(result['hashes_per_second']),
+                         {'solidity_keccak', 'certificate_hash', 'certificate_hashes'})
+        # Timings depend on the machine, so only the report's shape is checked
+        self.assertEqual(set(result['speedup']), {'certificate_hash', 'certificate_hashes'})
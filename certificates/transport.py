@@ -0,0 +1,251 @@
+# certificates/transport.py
+
+import asyncio
+import threading
+import time
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from web3._utils.caching import async_handle_request_caching, handle_request_caching
+from web3.providers import JSONBaseProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+# Methods that change chain state. If one of these times out after the node
+# received it we can't tell whether it was applied, so it is only retried on
+# another endpoint when the connection itself failed. The same goes for a
+# batch containing any of them.
+NON_IDEMPOTENT_METHODS = {'eth_sendTransaction', 'eth_sendRawTransaction'}
+
+
+def is_idempotent(methods):
+    return not NON_IDEMPOTENT_METHODS.intersection(methods)
+
+
+def failed_to_connect(error):
+    """Whether a requests error happened before anything was sent.
+
+    requests raises ConnectionError for a reset or aborted connection too,
+    after the body may already have reached the node; only a connect
+    timeout or a refused/unresolvable connection is known not to have.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    # urllib3's MaxRetryError wraps the underlying cause
+    reason = getattr(error.args[0], 'reason', error.args[0])
+    return isinstance(reason, NewConnectionError)
+
+
+class RPCEndpoint:
+    """Health state for one JSON-RPC URL"""
+
+    def __init__(self, url):
+        self.url = url
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error = None
+        self.latency = None  # moving average, seconds
+
+    def is_available(self, now):
+        return self.down_until <= now
+
+    def record_success(self, elapsed):
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error = None
+        self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+
+    def record_failure(self, error, cooldown):
+        self.failures += 1
+        self.last_error = str(error)
+        # Back off longer the more consecutive failures, capped at 8x
+        self.down_until = time.monotonic() + cooldown * min(2 ** (self.failures - 1), 8)
+
+    def status(self):
+        now = time.monotonic()
+        return {
+            'url': self.url,
+            'available': self.is_available(now),
+            'failures': self.failures,
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'last_error': self.last_error,
+        }
+
+
+class EndpointSelection:
+    """Endpoint health and ordering shared by the sync and async providers"""
+
+    def __init__(self, endpoints, timeout=10, pool_size=20, cooldown=30, **kwargs):
+        # web3 checks the chain id before every call, gas estimate and send;
+        # every endpoint serves the same chain, so it is read once per thread
+        kwargs.setdefault('cache_allowed_requests', True)
+        kwargs.setdefault('cacheable_requests', {'eth_chainId'})
+        kwargs.setdefault('request_cache_validation_threshold', None)
+        super().__init__(**kwargs)
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+        if not endpoints:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints = [RPCEndpoint(url) for url in endpoints]
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return f"RPC connection {', '.join(endpoint.url for endpoint in self.endpoints)}"
+
+    @property
+    def endpoint_uri(self):
+        """URL of the endpoint the next request will use"""
+        return self._candidates()[0].url
+
+    def _candidates(self):
+        now = time.monotonic()
+        with self._lock:
+            available = [endpoint for endpoint in self.endpoints if endpoint.is_available(now)]
+            if available:
+                return available
+            return sorted(self.endpoints, key=lambda endpoint: endpoint.down_until)[:1]
+
+    def endpoint_status(self):
+        with self._lock:
+            return [endpoint.status() for endpoint in self.endpoints]
+
+
+class FailoverHTTPProvider(EndpointSelection, JSONBaseProvider):
+    """HTTP JSON-RPC provider with a pooled keep-alive session and failover.
+
+    Requests go to the first healthy endpoint in the configured order. An
+    endpoint that fails to connect, times out or returns a 5xx response is
+    skipped for ``cooldown`` seconds (longer after repeated failures) and the
+    request moves on to the next one, except that transaction sends only
+    move on if they never reached the node. If every endpoint is cooling down the
+    one that will recover soonest is tried anyway.
+    """
+
+    def __init__(self, endpoints, **kwargs):
+        super().__init__(endpoints, **kwargs)
+
+        # One session shared by every thread: requests' connection pool is
+        # thread-safe and keeps up to pool_size sockets open per endpoint
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.endpoints), pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+    def _post(self, request_data, idempotent):
+        last_error = None
+        for endpoint in self._candidates():
+            start = time.monotonic()
+            try:
+                response = self.session.post(endpoint.url, data=request_data, timeout=self.timeout)
+                if response.status_code >= 500:
+                    response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                with self._lock:
+                    endpoint.record_failure(e, self.cooldown)
+                last_error = e
+                if not idempotent and not failed_to_connect(e):
+                    raise
+                continue
+
+            with self._lock:
+                endpoint.record_success(time.monotonic() - start)
+            response.raise_for_status()
+            return response.content
+        raise last_error
+
+    @handle_request_caching
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        return self.decode_rpc_response(self._post(request_data, is_idempotent([method])))
+
+    def make_batch_request(self, requests_info):
+        request_data = self.encode_batch_rpc_request(requests_info)
+        idempotent = is_idempotent(method for method, _ in requests_info)
+        response = self.decode_rpc_response(self._post(request_data, idempotent))
+        if not isinstance(response, list):
+            # RPC errors come back as a single response object
+            return response
+        return sorted(response, key=lambda item: item.get('id', 0))
+
+
+class AsyncFailoverHTTPProvider(EndpointSelection, AsyncJSONBaseProvider):
+    """The asyncio counterpart of FailoverHTTPProvider, for AsyncWeb3.
+
+    Endpoints are chosen and skipped the same way. aiohttp sessions belong
+    to an event loop, so each loop gets its own, keeping up to
+    ``pool_size`` connections open per endpoint; sessions whose loop has
+    closed are closed the next time one is needed.
+    """
+
+    def __init__(self, endpoints, **kwargs):
+        super().__init__(endpoints, **kwargs)
+        self._sessions = {}  # event loop -> aiohttp.ClientSession
+
+    async def _session(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            stale = [self._sessions.pop(other) for other in list(self._sessions) if other.is_closed()]
+            session = self._sessions.get(loop)
+            if session is None:
+                session = self._sessions[loop] = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.pool_size * len(self.endpoints), limit_per_host=self.pool_size
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={'Content-Type': 'application/json'},
+                )
+        for old in stale:
+            await old.close()
+        return session
+
+    async def _post(self, request_data, idempotent):
+        session = await self._session()
+        last_error = None
+        for endpoint in self._candidates():
+            start = time.monotonic()
+            try:
+                async with session.post(endpoint.url, data=request_data) as response:
+                    if response.status >= 500:
+                        response.raise_for_status()
+                    content = await response.read()
+            except (aiohttp.ClientConnectionError, aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+                with self._lock:
+                    endpoint.record_failure(e, self.cooldown)
+                last_error = e
+                if not idempotent and not isinstance(e, aiohttp.ClientConnectorError):
+                    raise
+                continue
+
+            with self._lock:
+                endpoint.record_success(time.monotonic() - start)
+            response.raise_for_status()
+            return content
+        raise last_error
+
+    @async_handle_request_caching
+    async def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        return self.decode_rpc_response(await self._post(request_data, is_idempotent([method])))
+
+    async def make_batch_request(self, requests_info):
+        request_data = self.encode_batch_rpc_request(requests_info)
+        idempotent = is_idempotent(method for method, _ in requests_info)
+        response = self.decode_rpc_response(await self._post(request_data, idempotent))
+        if not isinstance(response, list):
+            # RPC errors come back as a single response object
+            return response
+        return sorted(response, key=lambda item: item.get('id', 0))
+
+    async def disconnect(self):
+        """Close the current event loop's session"""
+        with self._lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
@@ -4,8 +4,16 @@ from certificates import views
 from .views import IssueCertificateView
 
 urlpatterns = [
+    path('', views.list_certificates_view, name='list_certificates'),
     path('issue/', views.issue_certificate_view, name='issue_certificate'),
+    path('issue/bulk/', views.issue_certificates_bulk_view, name='issue_certificates_bulk'),
+    path('verify/batch/', views.verify_certificates_batch_view, name='verify_certificates_batch'),
+    path('verify/async/batch/', views.verify_certificates_batch_async_view, name='verify_certificates_batch_async'),
+    path('verify/async/<str:cert_hash>/', views.verify_certificate_async_view, name='verify_certificate_async'),
     path('verify/<str:cert_hash>/', views.verify_certificate_view, name='verify_certificate'),
+    path('status/<str:cert_hash>/', views.certificate_status_view, name='certificate_status'),
     path('revoke/<str:cert_hash>/', views.revoke_certificate_view, name='revoke_certificate'),
+    path('cache/stats/', views.verification_cache_stats_view, name='verification_cache_stats'),
+    path('health/', views.blockchain_health_view, name='blockchain_health'),
     path('admin/login/', views.admin_login, name='admin_login'),
 ]
@@ -1,14 +1,40 @@
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import models, transaction
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from django.contrib.auth import authenticate
-from django.http import JsonResponse
-from .models import Certificate
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from .models import FUZZY_MATCH_PREFIX_BYTES, Certificate
 from .serializers import CertificateSerializer
-from .blockchain import issue_certificate, revoke_certificate, verify_certificate_on_chain
+from django.conf import settings
+from .blockchain import (
+    generate_certificate_hash, health_check, issue_certificate, revoke_certificate,
+    validate_certificate_data, verify_certificate_on_chain, verify_certificate_on_chain_async,
+    verify_certificates_on_chain, verify_certificates_on_chain_async
+)
+from .batching import verify_batch_membership
+from .bloom import get_hash_shield
+from .bulk import issue_rows, parse_csv_rows, parse_ndjson_rows
+from .cache import get_verification_cache
+from .fields import hash_to_bytes, hash_to_hex, parse_cert_hash
+from .indexer import indexed_results, use_index
+from .instrumentation import annotate, stage, timed
+from .pagination import keyset_page
+from . import metrics
+from .revocations import get_revocation_set, record_revocation
+from .confirmations import schedule_confirmation
 from rest_framework.views import APIView
 from rest_framework import status
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
+import ipaddress
+import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class IssueCertificateView(APIView):
     def post(self, request):
@@ -21,6 +47,7 @@ class IssueCertificateView(APIView):
         return Response({'certHash': cert_hash}, status=status.HTTP_201_CREATED)
 
 @api_view(['POST'])
+@timed('issue')
 def issue_certificate_view(request):
     try:
         # Validate required fields
@@ -36,143 +63,827 @@ def issue_certificate_view(request):
         timestamp = request.data.get('issue_date')
         try:
             timestamp = int(timestamp)
-            issue_date = datetime.fromtimestamp(timestamp)
+            issue_date = datetime.fromtimestamp(timestamp, tz=timezone.utc)
         except (ValueError, TypeError):
             return Response(
                 {'error': 'issue_date must be a valid integer timestamp'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # First, attempt to issue on blockchain
+        if getattr(settings, 'CERTIFICATE_ISSUANCE_MODE', 'single') == 'batch':
+            return _queue_certificate_for_batch(request.data, timestamp, issue_date)
+
+        # Submit the issuance transaction; confirmation happens in the background
         result = issue_certificate(
             request.data.get('student_name'),
             request.data.get('course'),
             request.data.get('institution'),
-            timestamp
+            timestamp,
+            wait=False
         )
         
-        # Verify the blockchain transaction was successful
+        # Verify the blockchain transaction was submitted
         if not result.get('transaction_hash'):
             return Response(
                 {'error': 'Failed to issue certificate on blockchain'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-            
-        # No need to verify immediately - blockchain transaction success is enough
-        # This was causing an error because the block might not be mined yet
         
-        # Only create database record if blockchain transaction was successful
-        certificate = Certificate.objects.create(
-            student_name=request.data.get('student_name'),
-            course=request.data.get('course'),
-            institution=request.data.get('institution'),
-            issue_date=issue_date,
-            cert_hash=result['cert_hash'],
-            ipfs_hash=result.get('ipfs_hash', '')
+        # Record the certificate as pending until its transaction is mined
+        with stage('db'):
+            certificate = Certificate.objects.create(
+                student_name=request.data.get('student_name'),
+                course=request.data.get('course'),
+                institution=request.data.get('institution'),
+                issue_date=issue_date,
+                cert_hash=hash_to_bytes(result['cert_hash']),
+                ipfs_hash=result.get('ipfs_hash', ''),
+                status=Certificate.STATUS_PENDING,
+                transaction_hash=result['transaction_hash']
+            )
+        transaction.on_commit(
+            lambda: schedule_confirmation(certificate.pk, result['transaction_hash'])
         )
         
         return Response({
             'cert_hash': result['cert_hash'],
             'certificate': CertificateSerializer(certificate).data,
-            'transaction_hash': result['transaction_hash']
+            'transaction_hash': result['transaction_hash'],
+            'status': certificate.status
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+def issue_certificates_bulk_view(request):
+    """
+    Issue many certificates from a streamed CSV or NDJSON upload.
+
+    Rows are read, validated and stored chunk by chunk while the per-row
+    results are streamed back as NDJSON, so memory use does not depend on
+    the size of the upload. Certificates are issued according to
+    CERTIFICATE_ISSUANCE_MODE, as with the single endpoint.
+    """
+    content_type = request.content_type.split(';')[0].strip()
+    if content_type == 'text/csv':
+        parse_rows = parse_csv_rows
+    elif content_type in ('application/x-ndjson', 'application/jsonl'):
+        parse_rows = parse_ndjson_rows
+    else:
+        return Response(
+            {'error': 'Upload must be text/csv or application/x-ndjson'}, 
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+
+    # request.data is never touched, so the body is read line by line
+    if request.stream is None:
+        return Response(
+            {'error': 'Upload is empty'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    rows = parse_rows(request.stream)
+
+    chunk_size = getattr(settings, 'CERTIFICATE_BULK_CHUNK_SIZE', 500)
+    results = (json.dumps(result) + '\n' for result in issue_rows(rows, chunk_size=chunk_size))
+    return StreamingHttpResponse(results, content_type='application/x-ndjson')
+
+def _queue_certificate_for_batch(data, timestamp, issue_date):
+    """Store a certificate to be anchored with the next Merkle batch"""
+    timestamp = validate_certificate_data(
+        data.get('student_name'), data.get('course'), data.get('institution'), timestamp
+    )
+    cert_hash = generate_certificate_hash(
+        data.get('student_name'), data.get('course'), data.get('institution'), timestamp
+    )
+    certificate = Certificate.objects.create(
+        student_name=data.get('student_name'),
+        course=data.get('course'),
+        institution=data.get('institution'),
+        issue_date=issue_date,
+        cert_hash=cert_hash,
+        status=Certificate.STATUS_PENDING
+    )
+    return Response({
+        'cert_hash': hash_to_hex(cert_hash),
+        'certificate': CertificateSerializer(certificate).data,
+        'transaction_hash': None,
+        'status': certificate.status
+    }, status=status.HTTP_200_OK)
+
+def _is_strict(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def _parse_batch(cert_hashes):
+    """Parse each requested hash, keeping the ValueError for ones that don't parse"""
+    parsed = []
+    for value in cert_hashes:
+        try:
+            parsed.append(parse_cert_hash(value))
+        except ValueError as e:
+            parsed.append(e)
+    return parsed
+
+def _cached_batch_state(unique_hashes, strict):
+    """What the revocation set, the cache and the Bloom filter know about a batch.
+
+    Returns (revoked hashes, certificate data by hash, chain checks by hash,
+    hashes whose rows still have to be fetched); unknown entries are None.
+    """
+    cache = get_verification_cache()
+    revocations = get_revocation_set()
+    revoked = {h for h in unique_hashes if h in revocations}
+    certificate_data = {h: cache.get('certificate', h) for h in unique_hashes}
+    chain_checks = {
+        h: None if strict else (_revoked_check() if h in revoked else cache.get('chain', h))
+        for h in unique_hashes
+    }
+    shield = get_hash_shield()
+    needed = [
+        h for h in unique_hashes
+        if (certificate_data[h] is None or chain_checks[h] is None) and shield.might_exist(h)
+    ]
+    return revoked, certificate_data, chain_checks, needed
+
+def _apply_batch_rows(certificates, certificate_data, chain_checks, strict):
+    """Fill in serialized data and Merkle batch checks from the fetched rows.
+
+    Returns the hashes of individually issued certificates that still need
+    a chain check.
+    """
+    cache = get_verification_cache()
+    individual = []
+    for cert_hash, certificate in certificates.items():
+        cacheable = certificate.status != Certificate.STATUS_PENDING
+        if certificate_data[cert_hash] is None:
+            with stage('serialization'):
+                certificate_data[cert_hash] = dict(CertificateSerializer(certificate).data)
+            if cacheable:
+                cache.set('certificate', cert_hash, certificate_data[cert_hash])
+        if chain_checks[cert_hash] is None:
+            if certificate.batch_id:
+                chain_checks[cert_hash] = _check_on_chain(certificate, cert_hash, strict=strict)
+                if cacheable and not chain_checks[cert_hash]['error']:
+                    cache.set('chain', cert_hash, chain_checks[cert_hash])
+            else:
+                individual.append(cert_hash)
+    return individual
+
+def _cache_chain_checks(certificates, checked, chain_checks):
+    """Cache the definite chain answers for confirmed certificates"""
+    cache = get_verification_cache()
+    for cert_hash in checked:
+        if certificates[cert_hash].status != Certificate.STATUS_PENDING and not chain_checks[cert_hash]['error']:
+            cache.set('chain', cert_hash, chain_checks[cert_hash])
+
+def _batch_results(cert_hashes, parsed, certificate_data, chain_checks, revoked):
+    """Per-hash results in request order"""
+    results = []
+    with stage('serialization'):
+        for value, cert_hash in zip(cert_hashes, parsed):
+            if isinstance(cert_hash, Exception):
+                results.append({'cert_hash': value, 'error': str(cert_hash)})
+            elif certificate_data[cert_hash] is None or chain_checks[cert_hash] is None:
+                results.append({'cert_hash': hash_to_hex(cert_hash), 'error': 'Certificate not found in database'})
+            else:
+                result = {'cert_hash': hash_to_hex(cert_hash)}
+                result.update(_verification_response(
+                    certificate_data[cert_hash], chain_checks[cert_hash], cert_hash in revoked
+                ))
+                results.append(result)
+    return results
+
+@api_view(['POST'])
+@timed('verify_batch')
+def verify_certificates_batch_view(request):
+    """
+    Verify a list of certificate hashes in one request.
+
+    Database rows are fetched with one query and the on-chain checks for
+    certificates issued individually go out as one JSON-RPC batch. Results
+    come back in request order. Unlike the single endpoint there is no
+    prefix fallback: only exact hashes are matched. Pass "strict": true to
+    skip the event index and cached results and ask the contract directly.
+    """
+    cert_hashes = request.data.get('cert_hashes') if isinstance(request.data, dict) else None
+    if not isinstance(cert_hashes, list) or not cert_hashes:
+        return Response(
+            {'error': 'cert_hashes must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    max_size = getattr(settings, 'CERTIFICATE_VERIFY_BATCH_MAX_SIZE', 100)
+    if len(cert_hashes) > max_size:
+        return Response(
+            {'error': f'At most {max_size} certificates can be verified per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        annotate(batch_size=len(cert_hashes))
+        with stage('hashing'):
+            parsed = _parse_batch(cert_hashes)
+        unique_hashes = list(dict.fromkeys(h for h in parsed if isinstance(h, bytes)))
+
+        strict = _is_strict(request.data.get('strict'))
+        revoked, certificate_data, chain_checks, needed = _cached_batch_state(unique_hashes, strict)
+
+        # One query for every hash that isn't fully cached and that the
+        # Bloom filter doesn't rule out
+        certificates = {}
+        with stage('db'):
+            if needed:
+                certificates = {
+                    certificate.cert_hash: certificate
+                    for certificate in Certificate.objects.filter(cert_hash__in=needed).select_related('batch')
+                }
+        individual = _apply_batch_rows(certificates, certificate_data, chain_checks, strict)
+
+        # Certificates issued one by one are answered from the event index
+        # where possible, and the rest checked with a single batched RPC request
+        checked = list(individual)
+        if individual and not strict and use_index():
+            for cert_hash, indexed in indexed_results(individual).items():
+                chain_checks[cert_hash] = _indexed_check(*indexed)
+            individual = [h for h in individual if chain_checks[h] is None]
+        if individual:
+            try:
+                chain_results = verify_certificates_on_chain(individual)
+            except Exception as e:
+                chain_results = [e] * len(individual)
+            for cert_hash, result in zip(individual, chain_results):
+                chain_checks[cert_hash] = _chain_check_from_result(result)
+        _cache_chain_checks(certificates, checked, chain_checks)
+
+        results = _batch_results(cert_hashes, parsed, certificate_data, chain_checks, revoked)
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.exception("Unexpected error during batch verification")
+        return Response(
+            {'error': f'Unexpected error during verification: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+def _listing_filters(params):
+    """Queryset filters for the listing's query parameters; raises ValueError for bad values"""
+    filters = {}
+    for field in ('institution', 'course'):
+        if params.get(field):
+            filters[field] = params[field]
+    for param, lookup in (('issue_date_after', 'issue_date__gte'), ('issue_date_before', 'issue_date__lte')):
+        if params.get(param):
+            try:
+                filters[lookup] = datetime.fromtimestamp(int(params[param]), tz=timezone.utc)
+            except (ValueError, OverflowError, OSError):
+                raise ValueError(f"{param} must be an integer Unix timestamp")
+    if params.get('is_revoked'):
+        value = params['is_revoked'].lower()
+        if value not in ('true', 'false', '1', '0'):
+            raise ValueError("is_revoked must be true or false")
+        filters['is_revoked'] = value in ('true', '1')
+    return filters
+
+def _listing_page_size(value):
+    max_size = getattr(settings, 'CERTIFICATE_LIST_MAX_PAGE_SIZE', 500)
+    if not value:
+        return min(getattr(settings, 'CERTIFICATE_LIST_PAGE_SIZE', 50), max_size)
+    try:
+        page_size = int(value)
+    except ValueError:
+        page_size = 0
+    if not 1 <= page_size <= max_size:
+        raise ValueError(f"page_size must be an integer between 1 and {max_size}")
+    return page_size
+
+@api_view(['GET'])
+@timed('list')
+def list_certificates_view(request):
+    """
+    List certificates, newest first, one page at a time.
+
+    Filters: institution, course, issue_date_after and issue_date_before
+    (inclusive Unix timestamps) and is_revoked. Pages are keyset paginated:
+    follow the "next" link, which is null on the last page. Fetching a page
+    costs the same however deep into the listing it is.
+    """
+    try:
+        filters = _listing_filters(request.query_params)
+        page_size = _listing_page_size(request.query_params.get('page_size'))
+        with stage('db'):
+            certificates, next_cursor = keyset_page(
+                Certificate.objects.filter(**filters), request.query_params.get('cursor'), page_size
+            )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    with stage('serialization'):
+        results = CertificateSerializer(certificates, many=True).data
+    next_url = None
+    if next_cursor is not None:
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+    return Response({'next': next_url, 'results': results}, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def certificate_status_view(request, cert_hash):
+    """
+    Report the on-chain issuance status of a certificate.
+    """
+    try:
+        cert_hash = parse_cert_hash(cert_hash)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        certificate = Certificate.objects.get(cert_hash=cert_hash)
+    except Certificate.DoesNotExist:
+        return Response(
+            {'error': 'Certificate not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response({
+        'cert_hash': hash_to_hex(certificate.cert_hash),
+        'status': certificate.status,
+        'transaction_hash': certificate.transaction_hash,
+        'block_number': certificate.block_number,
+        'failure_reason': certificate.failure_reason
+    }, status=status.HTTP_200_OK)
+
+def _chain_check_from_result(blockchain_result):
+    """Summarize a verifyCertificate result (or the error it raised)"""
+    if isinstance(blockchain_result, Exception):
+        blockchain_error = str(blockchain_result)
+        return {'result': None, 'valid': False, 'error': blockchain_error}
+    if blockchain_result is None:
+        return {'result': None, 'valid': False, 'error': "Certificate does not exist on blockchain"}
+    return {'result': list(blockchain_result), 'valid': blockchain_result[0], 'error': None}
+
+def _indexed_check(blockchain_result, indexed_block):
+    """Summarize a result answered from the chain event index"""
+    check = _chain_check_from_result(blockchain_result)
+    check['source'] = 'index'
+    check['indexed_block'] = indexed_block
+    return check
+
+def _check_on_chain(certificate, cert_hash, strict=False):
+    """Check a certificate against the blockchain.
+
+    Unless ``strict`` is set, the local event index answers when it has
+    seen the certificate; otherwise the contract is called live.
+    """
+    if certificate.batch_id:
+        # Batched certificates are proven against their batch's anchored
+        # Merkle root rather than looked up one by one on chain
+        blockchain_valid, blockchain_error = verify_batch_membership(certificate, strict=strict)
+        blockchain_result = None
+        if blockchain_valid:
+            blockchain_result = (
+                True,
+                certificate.student_name,
+                certificate.course,
+                certificate.institution,
+                int(certificate.issue_date.timestamp())
+            )
+        return {
+            'result': list(blockchain_result) if blockchain_result else None,
+            'valid': blockchain_valid,
+            'error': blockchain_error
+        }
+
+    if not strict and use_index():
+        indexed = indexed_results([cert_hash]).get(cert_hash)
+        if indexed is not None:
+            return _indexed_check(*indexed)
+
+    try:
+        return _chain_check_from_result(verify_certificate_on_chain(cert_hash))
+    except Exception as e:
+        return _chain_check_from_result(e)
+
+def _revoked_check():
+    """Chain check for a certificate known to be revoked; the contract isn't asked"""
+    return {'result': None, 'valid': False, 'error': None, 'source': 'revocations'}
+
+def _verification_response(certificate_data, chain_check, revoked=False):
+    """Build the verification payload shared by the single and batch endpoints"""
+    if revoked and not certificate_data['is_revoked']:
+        # Revoked since this record was cached, possibly by another worker
+        certificate_data = dict(certificate_data, is_revoked=True)
+    blockchain_result = chain_check['result']
+    blockchain_valid = chain_check['valid']
+    blockchain_error = chain_check['error']
+
+    # Certificate is valid if it exists in the database and is not revoked
+    # If blockchain verification failed but database record exists, we still show the certificate
+    database_valid = not certificate_data['is_revoked']
+    overall_valid = database_valid and (blockchain_valid if blockchain_result else False)
+
+    response_data = {
+        'certificate': certificate_data,
+        'is_valid': overall_valid,
+        'blockchain_valid': blockchain_valid if blockchain_result else False,
+        'database_valid': database_valid,
+        'verified_from': chain_check.get('source', 'chain'),
+    }
+    if chain_check.get('source') == 'index':
+        response_data['indexed_block'] = chain_check['indexed_block']
+
+    if blockchain_result:
+        response_data['blockchain_details'] = {
+            'student_name': blockchain_result[1],
+            'course': blockchain_result[2],
+            'institution': blockchain_result[3],
+            'issue_date': blockchain_result[4]
+        }
+
+    if blockchain_error:
+        response_data['failure_reason'] = blockchain_error
+        response_data['note'] = "Certificate may have been issued with a different hash format. It exists in the database but couldn't be verified on the blockchain."
+
+    return response_data
+
 @api_view(['GET'])
+@timed('verify')
 def verify_certificate_view(request, cert_hash):
     """
     Verify a certificate by its hash.
+
+    Pass ?strict=true to skip the event index and cached results and ask
+    the contract directly.
     """
     try:
-        print(f"Attempting to verify certificate: {cert_hash}")
-        
-        # Normalize hash format - ensure it has 0x prefix
-        if not cert_hash.startswith('0x'):
-            cert_hash = '0x' + cert_hash
-            print(f"Normalized hash to: {cert_hash}")
-            
-        # First try to get the certificate from database
+        # Convert the hash to its stored 32-byte form once, here
         try:
-            certificate = Certificate.objects.get(cert_hash=cert_hash)
-            print(f"Certificate found in database: {certificate.student_name}")
-            found_in_db = True
-        except Certificate.DoesNotExist:
-            print(f"Certificate not found in database with direct hash match: {cert_hash}")
-            
-            # Try a fuzzy search by student name, course, and institution
-            # This helps find certificates that were re-hashed during the migration
-            certificates = Certificate.objects.all()
-            found_in_db = False
-            certificate = None
+            with stage('hashing'):
+                cert_hash = parse_cert_hash(cert_hash)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            for cert in certificates:
-                # Check if the first part of the hash matches (simple fuzzy match)
-                if cert_hash[:20] in cert.cert_hash or cert.cert_hash[:20] in cert_hash:
-                    print(f"Possible match found: {cert.cert_hash}")
-                    certificate = cert
-                    found_in_db = True
-                    break
-            
-            if not found_in_db:
+        cache = get_verification_cache()
+        certificate = None
+        cacheable = True
+
+        # First try the cache, then the database
+        certificate_data = cache.get('certificate', cert_hash)
+        annotate(cache_hit=certificate_data is not None)
+        if certificate_data is None:
+            # The Bloom filter rules out unknown hashes without a query
+            shield = get_hash_shield()
+            might_exist, might_match_prefix = shield.lookup(cert_hash)
+            if not might_exist and not might_match_prefix:
+                annotate(bloom_rejected=True)
                 return Response(
-                    {'error': 'Certificate not found in database'}, 
+                    {'error': 'Certificate not found in database'},
                     status=status.HTTP_404_NOT_FOUND
                 )
-        
-        # Then try to verify on blockchain
-        blockchain_valid = False
-        blockchain_result = None
-        blockchain_error = None
-        
-        try:
-            print(f"Attempting blockchain verification for: {cert_hash}")
-            blockchain_result = verify_certificate_on_chain(cert_hash)
-            
-            if blockchain_result is None:
-                print("Blockchain verification returned None")
-                blockchain_error = "Certificate does not exist on blockchain"
-            else:
-                print(f"Blockchain verification result: {blockchain_result}")
-                blockchain_valid = blockchain_result[0]
+            try:
+                if not might_exist:
+                    raise Certificate.DoesNotExist
+                with stage('db'):
+                    certificate = Certificate.objects.get(cert_hash=cert_hash)
+                found_in_db = True
+            except Certificate.DoesNotExist:
+                if might_exist:
+                    shield.record_false_positive()
                 
-        except Exception as e:
-            blockchain_error = str(e)
-            print(f"Blockchain verification error: {blockchain_error}")
-        
-        # Certificate is valid if it exists in the database and is not revoked
-        # If blockchain verification failed but database record exists, we still show the certificate
-        database_valid = not certificate.is_revoked
-        overall_valid = database_valid and (blockchain_valid if blockchain_result else False)
-        
-        response_data = {
-            'certificate': CertificateSerializer(certificate).data,
-            'is_valid': overall_valid,
-            'blockchain_valid': blockchain_valid if blockchain_result else False,
-            'database_valid': database_valid,
-        }
-        
-        if blockchain_result:
-            response_data['blockchain_details'] = {
-                'student_name': blockchain_result[1],
-                'course': blockchain_result[2],
-                'institution': blockchain_result[3],
-                'issue_date': blockchain_result[4]
-            }
-        
-        if blockchain_error:
-            response_data['failure_reason'] = blockchain_error
-            response_data['note'] = "Certificate may have been issued with a different hash format. It exists in the database but couldn't be verified on the blockchain."
+                # Fall back to a prefix match on the leading bytes
+                # This helps find certificates that were re-hashed during the migration
+                # The lookup is an indexed range query returning at most one row.
+                found_in_db = False
+                with stage('db'):
+                    certificate = Certificate.objects.with_hash_prefix(
+                        cert_hash[:FUZZY_MATCH_PREFIX_BYTES].hex()
+                    ).order_by('cert_hash').first()
+                if certificate is not None:
+                    logger.debug(
+                        "No exact match for %s; using prefix match %s",
+                        hash_to_hex(cert_hash), hash_to_hex(certificate.cert_hash)
+                    )
+                    found_in_db = True
+                
+                if not found_in_db:
+                    return Response(
+                        {'error': 'Certificate not found in database'}, 
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                # Only exact matches are cached, so revocation can invalidate them
+                cacheable = False
+
+            # Pending certificates change status on confirmation, so don't cache them yet
+            cacheable = cacheable and certificate.status != Certificate.STATUS_PENDING
+            with stage('serialization'):
+                certificate_data = dict(CertificateSerializer(certificate).data)
+            if cacheable:
+                cache.set('certificate', cert_hash, certificate_data)
         
+        # Revoked certificates are answered from the in-memory revocation set
+        revoked = hash_to_bytes(certificate_data['cert_hash']) in get_revocation_set()
+
+        # Then try to verify on blockchain; strict mode always asks the contract
+        strict = _is_strict(request.query_params.get('strict'))
+        chain_check = None if strict else (_revoked_check() if revoked else cache.get('chain', cert_hash))
+        if chain_check is None:
+            if certificate is None:
+                with stage('db'):
+                    certificate = Certificate.objects.get(cert_hash=cert_hash)
+            chain_check = _check_on_chain(certificate, cert_hash, strict=strict)
+            # Errors may be transient, so only definite answers are cached
+            if cacheable and not chain_check['error']:
+                cache.set('chain', cert_hash, chain_check)
+
+        annotate(source=chain_check.get('source', 'chain'))
+        with stage('serialization'):
+            response_data = _verification_response(certificate_data, chain_check, revoked)
         return Response(response_data, status=status.HTTP_200_OK)
     
     except Exception as e:
-        print(f"Unexpected error during verification: {str(e)}")
+        logger.exception("Unexpected error during verification")
         return Response(
             {'error': f'Unexpected error during verification: {str(e)}'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+# Native async counterparts of the verify endpoints, for ASGI. They are
+# plain Django views (DRF's are sync only) with the same request and
+# response formats.
+
+async def _contract_check(cert_hash):
+    """Chain check for one hash asked of the contract over AsyncWeb3"""
+    try:
+        return _chain_check_from_result(await verify_certificate_on_chain_async(cert_hash))
+    except Exception as e:
+        return _chain_check_from_result(e)
+
+async def _contract_checks(cert_hashes):
+    """Chain checks for several hashes from one batched contract call"""
+    try:
+        results = await verify_certificates_on_chain_async(cert_hashes)
+    except Exception as e:
+        results = [e] * len(cert_hashes)
+    return {cert_hash: _chain_check_from_result(result) for cert_hash, result in zip(cert_hashes, results)}
+
+def _cached_verification(cert_hash, strict):
+    """What the cache, the revocation set and the Bloom filter know about one hash"""
+    cache = get_verification_cache()
+    certificate_data = cache.get('certificate', cert_hash)
+    revoked = cert_hash in get_revocation_set()
+    if certificate_data is not None:
+        might_exist = might_match_prefix = True
+    else:
+        might_exist, might_match_prefix = get_hash_shield().lookup(cert_hash)
+    return {
+        'certificate_data': certificate_data,
+        'revoked': revoked,
+        'chain_check': None if strict else (_revoked_check() if revoked else cache.get('chain', cert_hash)),
+        'might_exist': might_exist,
+        'might_match_prefix': might_match_prefix,
+    }
+
+def _cache_verification(cert_hash, entries):
+    cache = get_verification_cache()
+    for namespace, value in entries:
+        cache.set(namespace, cert_hash, value)
+
+async def _lookup(function, *args, **kwargs):
+    """Run a read of the cache, the revocation set and the Bloom filter.
+
+    Those are in-memory and thread-safe, so normally any thread will do and
+    the read doesn't queue behind database work on the one thread the async
+    ORM uses. When it may touch the database (a refresh is due, or the cache
+    is a Django cache alias) it runs on that thread like any ORM call.
+    """
+    thread_sensitive = (
+        get_verification_cache().backend is not None
+        or get_revocation_set().refresh_due()
+        or get_hash_shield().refresh_due()
+    )
+    return await sync_to_async(function, thread_sensitive=thread_sensitive)(*args, **kwargs)
+
+@require_GET
+@timed('verify_async')
+async def verify_certificate_async_view(request, cert_hash):
+    """
+    Verify a certificate by its hash without holding a thread while waiting.
+
+    Answers like the verify endpoint, reading the database through the
+    async ORM and the contract through AsyncWeb3. When the contract has to
+    be asked anyway (strict mode, or CERTIFICATE_VERIFICATION_SOURCE =
+    'chain') the call goes out alongside the database lookup rather than
+    after it, and is dropped if the certificate turns out to be unknown or
+    anchored in a Merkle batch.
+    """
+    try:
+        with stage('hashing'):
+            cert_hash = parse_cert_hash(cert_hash)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    strict = _is_strict(request.GET.get('strict'))
+    contract_task = None
+    try:
+        known = await _lookup(_cached_verification, cert_hash, strict)
+        certificate_data = known['certificate_data']
+        chain_check = known['chain_check']
+        revoked = known['revoked']
+        annotate(cache_hit=certificate_data is not None)
+        if not known['might_exist'] and not known['might_match_prefix']:
+            annotate(bloom_rejected=True)
+            return JsonResponse(
+                {'error': 'Certificate not found in database'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        batched = certificate_data['batch'] if certificate_data is not None else None
+        if chain_check is None and not batched and (strict or not use_index()):
+            contract_task = asyncio.create_task(_contract_check(cert_hash))
+
+        certificate = None
+        cacheable = True
+        to_cache = []
+        if certificate_data is None or (chain_check is None and batched):
+            with stage('db'):
+                if known['might_exist']:
+                    certificate = await Certificate.objects.select_related('batch').filter(
+                        cert_hash=cert_hash
+                    ).afirst()
+                    if certificate is None:
+                        get_hash_shield().record_false_positive()
+                if certificate is None and certificate_data is None:
+                    # Same prefix fallback as the sync endpoint; never cached
+                    certificate = await Certificate.objects.with_hash_prefix(
+                        cert_hash[:FUZZY_MATCH_PREFIX_BYTES].hex()
+                    ).order_by('cert_hash').afirst()
+                    cacheable = False
+            if certificate is None:
+                return JsonResponse(
+                    {'error': 'Certificate not found in database'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            if bytes(certificate.cert_hash) != cert_hash:
+                revoked = await _lookup(get_revocation_set().__contains__, certificate.cert_hash)
+                if revoked and not strict:
+                    chain_check = _revoked_check()
+
+            cacheable = cacheable and certificate.status != Certificate.STATUS_PENDING
+            if certificate_data is None:
+                with stage('serialization'):
+                    certificate_data = dict(CertificateSerializer(certificate).data)
+                if cacheable:
+                    to_cache.append(('certificate', certificate_data))
+            batched = certificate.batch_id
+
+        if chain_check is None:
+            if batched:
+                chain_check = await sync_to_async(_check_on_chain)(certificate, cert_hash, strict=strict)
+            elif contract_task is not None:
+                chain_check = await contract_task
+            else:
+                indexed = (await sync_to_async(indexed_results)([cert_hash])).get(cert_hash)
+                chain_check = _indexed_check(*indexed) if indexed is not None else await _contract_check(cert_hash)
+            # Errors may be transient, so only definite answers are cached
+            if cacheable and not chain_check['error']:
+                to_cache.append(('chain', chain_check))
+        if to_cache:
+            await _lookup(_cache_verification, cert_hash, to_cache)
+
+        annotate(source=chain_check.get('source', 'chain'))
+        with stage('serialization'):
+            response_data = _verification_response(certificate_data, chain_check, revoked)
+        return JsonResponse(response_data, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.exception("Unexpected error during verification")
+        return JsonResponse(
+            {'error': f'Unexpected error during verification: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    finally:
+        if contract_task is not None:
+            contract_task.cancel()
+
+@csrf_exempt
+@require_POST
+@timed('verify_batch_async')
+async def verify_certificates_batch_async_view(request):
+    """
+    Verify a list of certificate hashes without holding a thread while waiting.
+
+    Takes and returns the same JSON as the batch endpoint. When the contract
+    has to be asked anyway (strict mode, or CERTIFICATE_VERIFICATION_SOURCE
+    = 'chain'), one batched call for every hash the Bloom filter lets
+    through goes out alongside the database query; answers for hashes that
+    turn out to be unknown or anchored in a Merkle batch are discarded.
+    """
+    try:
+        body = json.loads(request.body or b'null')
+    except ValueError:
+        body = None
+    cert_hashes = body.get('cert_hashes') if isinstance(body, dict) else None
+    if not isinstance(cert_hashes, list) or not cert_hashes:
+        return JsonResponse(
+            {'error': 'cert_hashes must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    max_size = getattr(settings, 'CERTIFICATE_VERIFY_BATCH_MAX_SIZE', 100)
+    if len(cert_hashes) > max_size:
+        return JsonResponse(
+            {'error': f'At most {max_size} certificates can be verified per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    contract_task = None
+    try:
+        annotate(batch_size=len(cert_hashes))
+        with stage('hashing'):
+            parsed = _parse_batch(cert_hashes)
+        unique_hashes = list(dict.fromkeys(h for h in parsed if isinstance(h, bytes)))
+
+        strict = _is_strict(body.get('strict'))
+        revoked, certificate_data, chain_checks, needed = await _lookup(_cached_batch_state, unique_hashes, strict)
+        ask_contract = strict or not use_index()
+        unchecked = [h for h in needed if chain_checks[h] is None]
+        if ask_contract and unchecked:
+            contract_task = asyncio.create_task(_contract_checks(unchecked))
+
+        certificates = {}
+        if needed:
+            with stage('db'):
+                certificates = {
+                    certificate.cert_hash: certificate
+                    async for certificate in Certificate.objects.filter(cert_hash__in=needed).select_related('batch')
+                }
+        individual = await sync_to_async(_apply_batch_rows)(certificates, certificate_data, chain_checks, strict)
+
+        checked = list(individual)
+        if individual and not ask_contract:
+            for cert_hash, indexed in (await sync_to_async(indexed_results)(individual)).items():
+                chain_checks[cert_hash] = _indexed_check(*indexed)
+            individual = [h for h in individual if chain_checks[h] is None]
+        if individual:
+            contract_checks = await contract_task if contract_task is not None else await _contract_checks(individual)
+            for cert_hash in individual:
+                chain_checks[cert_hash] = contract_checks[cert_hash]
+        if checked:
+            await _lookup(_cache_chain_checks, certificates, checked, chain_checks)
+
+        results = _batch_results(cert_hashes, parsed, certificate_data, chain_checks, revoked)
+        return JsonResponse({'results': results}, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.exception("Unexpected error during batch verification")
+        return JsonResponse(
+            {'error': f'Unexpected error during verification: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    finally:
+        if contract_task is not None:
+            contract_task.cancel()
+
+@api_view(['GET'])
+def verification_cache_stats_view(request):
+    """
+    Report verification cache hit and miss counters and how many lookups
+    the Bloom filter turned away.
+    """
+    stats = get_verification_cache().stats()
+    stats['bloom_filter'] = get_hash_shield().stats()
+    return Response(stats, status=status.HTTP_200_OK)
+
+def _metrics_allowed(request):
+    """Staff users, or a client address inside METRICS_ALLOWED_IPS"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    )
+
+def metrics_view(request):
+    """
+    Expose this process's request, database, contract call and cache
+    metrics in the Prometheus text format, to staff users and the
+    addresses in METRICS_ALLOWED_IPS only.
+    """
+    if not _metrics_allowed(request):
+        return HttpResponse('Forbidden', status=status.HTTP_403_FORBIDDEN, content_type='text/plain')
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api_view(['GET'])
+def blockchain_health_view(request):
+    """
+    Report whether this worker can reach the blockchain node and contract.
+    """
+    health = health_check()
+    healthy = health['connected'] and health['contract_loaded']
+    return Response(
+        health,
+        status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
 @api_view(['POST'])
 def admin_login(request):
     username = request.data.get('username')
@@ -188,16 +899,28 @@ def admin_login(request):
 
 @api_view(['POST'])
 def revoke_certificate_view(request, cert_hash):
+    try:
+        cert_hash = parse_cert_hash(cert_hash)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         # Check if certificate exists
         certificate = Certificate.objects.get(cert_hash=cert_hash)
         
-        # Attempt to revoke on blockchain
-        revoke_certificate(cert_hash)
+        # Attempt to revoke on blockchain. Certificates in a Merkle batch (or
+        # still queued for one) have no entry of their own in the contract,
+        # so their revocation is recorded in the database only.
+        queued = certificate.status == Certificate.STATUS_PENDING and not certificate.transaction_hash
+        if not certificate.batch_id and not queued:
+            revoke_certificate(cert_hash)
         
         # Update certificate status in database
         certificate.is_revoked = True
         certificate.save()
+        record_revocation()
+        get_verification_cache().invalidate(cert_hash)
+        get_revocation_set().add(cert_hash)
         
         return Response({
             'message': 'Certificate revoked successfully',
@@ -0,0 +1,174 @@
+# certificates/watcher.py
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+
+from .metrics import RECEIPT_WAIT_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+def _tx_key(tx_hash):
+    """Normalize a transaction hash (bytes or hex string) to lowercase 0x hex"""
+    if isinstance(tx_hash, str):
+        return Web3.to_hex(hexstr=tx_hash).lower()
+    return Web3.to_hex(tx_hash)
+
+
+def _receipt_wait_observer(started):
+    def observe(future):
+        if future.exception() is not None:
+            outcome = 'timeout'
+        else:
+            outcome = 'mined' if future.result().status == 1 else 'reverted'
+        RECEIPT_WAIT_DURATION.observe(time.monotonic() - started, outcome=outcome)
+    return observe
+
+
+class ConfirmationWatcher:
+    """Follow new blocks and resolve futures for every tracked transaction.
+
+    A single background thread polls the chain head. Each new block is
+    fetched once and its transaction hashes are matched against everything
+    being tracked, so RPC traffic grows with the block rate rather than with
+    the number of transactions waiting to be mined. Only transactions that
+    actually appear in a block have their receipts fetched, all of them in
+    one JSON-RPC batch per poll.
+    """
+
+    def __init__(self, web3_instance, poll_interval=1.0):
+        self.web3 = web3_instance
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {}   # tx hash (0x hex) -> (future, deadline)
+        self._unchecked = set()  # tracked but not yet looked up directly
+        self._last_block = None
+        self._thread = None
+
+    def track(self, tx_hash, timeout=120):
+        """Return a Future that resolves to the receipt of ``tx_hash``"""
+        key = _tx_key(tx_hash)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key][0]
+            future = Future()
+            future.add_done_callback(_receipt_wait_observer(time.monotonic()))
+            self._pending[key] = (future, time.monotonic() + timeout)
+            self._unchecked.add(key)
+            self._ensure_running()
+        self._wakeup.set()
+        return future
+
+    def wait(self, tx_hash, timeout=120):
+        """Block until ``tx_hash`` is mined and return its receipt"""
+        return self.track(tx_hash, timeout=timeout).result()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_running(self):
+        # Called with the lock held
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name='confirmation-watcher', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    # Nothing left to watch; let the thread exit until the
+                    # next transaction is tracked.
+                    self._thread = None
+                    self._last_block = None
+                    return
+            try:
+                self._poll()
+            except Exception as e:
+                logger.warning("Confirmation watcher poll failed: %s", e)
+            self._expire()
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _poll(self):
+        head = self.web3.eth.block_number
+        if self._last_block is None:
+            self._last_block = head
+
+        # Newly tracked transactions are looked up once directly, in case they
+        # were mined before the watcher reached their block. Reading the head
+        # first means anything mined later is caught by the block scan below.
+        with self._lock:
+            unchecked = list(self._unchecked)
+        receipts = self._fetch_receipts(unchecked)
+        for key in unchecked:
+            if key in receipts:
+                self._resolve(key, receipts[key])
+            else:
+                with self._lock:
+                    self._unchecked.discard(key)
+
+        matched = []
+        for number in range(self._last_block + 1, head + 1):
+            block = self.web3.eth.get_block(number)
+            with self._lock:
+                matched += [
+                    _tx_key(tx) for tx in block.transactions
+                    if _tx_key(tx) in self._pending
+                ]
+        receipts = self._fetch_receipts(matched)
+        for key in matched:
+            if key in receipts:
+                self._resolve(key, receipts[key])
+            else:
+                # The node listed it in a block but has no receipt yet; look
+                # it up again on the next poll
+                with self._lock:
+                    if key in self._pending:
+                        self._unchecked.add(key)
+        self._last_block = head
+
+    def _fetch_receipts(self, keys):
+        """Receipts for ``keys`` from one JSON-RPC batch; hashes without one are left out"""
+        if not keys:
+            return {}
+        responses = self.web3.provider.make_batch_request(
+            [('eth_getTransactionReceipt', [key]) for key in keys]
+        )
+        if not isinstance(responses, list):
+            raise ValueError(f"Receipt batch request failed: {responses.get('error')}")
+        receipts = {}
+        for key, response in zip(keys, responses):
+            if response.get('error'):
+                logger.warning("Receipt lookup for %s failed: %s", key, response['error'])
+            elif response.get('result') is not None:
+                receipts[key] = AttributeDict.recursive(receipt_formatter(response['result']))
+        return receipts
+
+    def _resolve(self, key, receipt):
+        with self._lock:
+            entry = self._pending.pop(key, None)
+            self._unchecked.discard(key)
+        if entry and not entry[0].done():
+            entry[0].set_result(receipt)
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, deadline) in self._pending.items() if deadline <= now]
+            entries = [self._pending.pop(key) for key in expired]
+            self._unchecked.difference_update(expired)
+        for key, (future, _) in zip(expired, entries):
+            future.set_exception(TimeExhausted(
+                f"Transaction {key} is not in the chain after waiting for its receipt"
+            ))
@@ -1,5 +1,7 @@
 """
 Script to verify an existing certificate.
+
+To audit every certificate against the chain, use `python manage.py reconcile`.
 """
 import os
 import django
@@ -9,6 +11,7 @@ from web3 import Web3
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'certificate_backend.settings')
 django.setup()
 
+from certificates.fields import hash_to_hex
 from certificates.models import Certificate
 from certificates.blockchain import verify_certificate_on_chain, contract
 
@@ -18,7 +21,7 @@ def list_certificates():
     print(f"Found {len(certificates)} certificates in the database:")
     
     for i, cert in enumerate(certificates, 1):
-        print(f"{i}. ID: {cert.id}, Name: {cert.student_name}, Hash: {cert.cert_hash}")
+        print(f"{i}. ID: {cert.id}, Name: {cert.student_name}, Hash: {hash_to_hex(cert.cert_hash)}")
 
 def verify_certificate(cert_id):
     """Verify a certificate by its database ID"""
@@ -27,7 +30,7 @@ def verify_certificate(cert_id):
         certificate = Certificate.objects.get(id=cert_id)
         print(f"\nFound certificate: {certificate.student_name} - {certificate.course}")
         
-        cert_hash = certificate.cert_hash
+        cert_hash = hash_to_hex(certificate.cert_hash)
         print(f"Certificate hash: {cert_hash}")
         
         # Try to verify on blockchain
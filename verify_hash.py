@@ -12,6 +12,7 @@ django.setup()
 
 from certificates.models import Certificate
 from certificates.blockchain import verify_certificate_on_chain, contract, web3, issue_certificate
+from certificates.hashing import certificate_hash
 
 def verify_by_hash(cert_hash):
     """Verify a certificate directly by its hash"""
@@ -69,10 +70,7 @@ def verify_by_hash(cert_hash):
         issue_date = result[3]
         
         # Generate the hash from the blockchain data
-        reconstructed_hash = '0x' + Web3.solidity_keccak(
-            ['string', 'string', 'string', 'uint256'],
-            [student_name, course, institution, issue_date]
-        ).hex()
+        reconstructed_hash = '0x' + certificate_hash(student_name, course, institution, issue_date).hex()
         
         print(f"\nReconstructed hash from blockchain data: {reconstructed_hash}")
         print(f"Does it match the provided hash? {reconstructed_hash == cert_hash}")